@@ -0,0 +1,2 @@
+"""Performance benchmarks; run each module with ``python -m benchmarks.<name>`` from the repo root,
+or the whole suite with ``python -m benchmarks run`` (see ``benchmarks/__main__.py``)."""
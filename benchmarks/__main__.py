@@ -0,0 +1,156 @@
+# Benchmark suite runner
+# Runs the benchmark modules in this package (all, or the ones named) and saves
+# their JSON results in one file per commit, with the environment they ran in,
+# so two commits can be compared:
+#
+#   python -m benchmarks run [app scoring ...] [--quick] [--out-dir benchmarks/results]
+#   python -m benchmarks compare benchmarks/results/1a2b3c4.json benchmarks/results/5d6e7f8.json
+#
+# compare lines up every timing / memory figure (keys, or their parent keys,
+# ending in _ms, _us, _ns, seconds, _mib or bytes; lower is better) and flags ratios above --threshold.
+# --quick uses small sizes so the whole suite finishes in a minute or two;
+# only compare quick runs with quick runs.
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+# name -> (full-size kwargs, --quick kwargs) for bench_<name>.run()
+SUITE = {
+    "startup": ({"repeat": 5}, {"repeat": 2}),
+    "app": ({"repeat": 5, "cold": 3}, {"repeat": 2, "cold": 1}),
+    "strobe_editor": ({"repeat": 5}, {"repeat": 2}),
+    "scoring": ({"sizes": [10_000, 100_000]}, {"sizes": [2_000], "repeat": 1}),
+    "vectorized": ({"sizes": [1_000, 100_000, 1_000_000]}, {"sizes": [1_000, 20_000], "repeat": 1}),
+    "whatif": ({"projects": 1_000_000}, {"projects": 50_000}),
+    "checklists": ({"calls": 100_000}, {"calls": 10_000}),
+    "statefile": ({"states": 5000}, {"states": 500}),
+    "session_memory": ({"sessions": 500}, {"sessions": 100}),
+    "store": ({"rows": 100_000, "repeat": 20}, {"rows": 5_000, "repeat": 5}),
+    "reports": ({"projects": [500, 1000, 3000]}, {"projects": [200], "sample": 50}),
+    "service": ({"requests": 3000}, {"requests": 500}),
+    "codelists": ({"vocab_size": 300_000, "entries": 5000}, {"vocab_size": 30_000, "entries": 500, "scan_entries": 50}),
+}
+
+LOWER_IS_BETTER = ("_ms", "_us", "_ns", "seconds", "_mib", "bytes")
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> Dict:
+    versions = {}
+    for mod in ("streamlit", "numpy", "pandas"):
+        try:
+            versions[mod] = importlib.import_module(mod).__version__
+        except ImportError:
+            versions[mod] = None
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        **versions,
+    }
+
+def run_suite(names: List[str], quick: bool = False) -> Dict:
+    env = environment()
+    results: Dict[str, Dict] = {}
+    for name in names:
+        full, small = SUITE[name]
+        module = importlib.import_module(f"benchmarks.bench_{name}")
+        print(f"{name} ...", end="", flush=True, file=sys.stderr)
+        t0 = time.perf_counter()
+        results[name] = module.run(**(small if quick else full))
+        print(f" {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+    return {**env, "quick": quick, "benchmarks": results}
+
+def result_path(out_dir: str, report: Dict) -> str:
+    suffix = "-dirty" if report["dirty"] else ""
+    quick = "-quick" if report["quick"] else ""
+    return os.path.join(out_dir, f"{report['commit']}{suffix}{quick}.json")
+
+# ----------------------------
+# Comparing runs
+# ----------------------------
+
+def _leaves(obj, path: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            yield from _leaves(v, f"{path}.{k}" if path else str(k))
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            yield from _leaves(v, f"{path}[{i}]")
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool) and _is_cost(path):
+        yield path, float(obj)
+
+def _is_cost(path: str) -> bool:
+    # The unit may sit on the leaf ("context_us") or on its parent ("rerun_ms.strobe_item")
+    return any(part.split("[")[0].endswith(LOWER_IS_BETTER) for part in path.split("."))
+
+def compare(old: Dict, new: Dict, threshold: float = 1.15) -> List[Dict]:
+    before = dict(_leaves(old["benchmarks"]))
+    rows = []
+    for path, value in _leaves(new["benchmarks"]):
+        if path in before and before[path] > 0:
+            ratio = value / before[path]
+            rows.append({"metric": path, "old": before[path], "new": value, "ratio": ratio, "regression": ratio > threshold})
+    return rows
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the benchmark suite or compare two saved runs.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    run = sub.add_parser("run", help="Run benchmarks and save one JSON file for the current commit.")
+    run.add_argument("names", nargs="*", metavar="name", help=f"Subset to run (default: all of {', '.join(SUITE)}).")
+    run.add_argument("--quick", action="store_true", help="Small sizes, for a fast smoke run.")
+    run.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    cmp = sub.add_parser("compare", help="Ratio new/old of every timing and memory figure.")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=1.15, help="Flag ratios above this (default 1.15).")
+    cmp.add_argument("--fail", action="store_true", help="Exit 1 if anything regressed.")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "run":
+        unknown = [n for n in args.names if n not in SUITE]
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+        report = run_suite(args.names or list(SUITE), args.quick)
+        os.makedirs(args.out_dir, exist_ok=True)
+        path = result_path(args.out_dir, report)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(path)
+        return 0
+
+    with open(args.old, encoding="utf-8") as fh:
+        old = json.load(fh)
+    with open(args.new, encoding="utf-8") as fh:
+        new = json.load(fh)
+    if old.get("quick") != new.get("quick"):
+        print("warning: comparing a --quick run with a full run", file=sys.stderr)
+    rows = compare(old, new, args.threshold)
+    print(f"{old['commit']} -> {new['commit']}  ({len(rows)} figures, threshold ×{args.threshold:g})")
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['ratio']:7.2f}×  {r['old']:>12.4g} -> {r['new']:<12.4g} {r['metric']}{flag}")
+    regressed = sum(r["regression"] for r in rows)
+    print(f"{regressed} regression(s)")
+    return 1 if args.fail and regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# End-to-end latency of the planner page, driven headlessly with Streamlit's
+# AppTest harness on the packaged page script (trinetx_triage/app.py):
+#   cold start      fresh interpreter: imports + first full run
+#   first render    first full run in a warm interpreter (new session)
+#   interactions    one rerun after a Gate A checkbox, a rubric radio, a STROBE
+#                   item, a design switch and uploading a saved JSON state
+#   reports         render_report() for every format from the state the page built
+# Medians over --repeat fresh sessions. Section times come from the app's own
+# instrumentation (trinetx_triage.metrics), which runs in this process too.
+#
+#   python -m benchmarks.bench_app [--repeat 5 --cold 3]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+# The page opens the project store; keep benchmark runs out of the working copy
+os.environ.setdefault("TRINETX_TRIAGE_DB", os.path.join(tempfile.gettempdir(), "trinetx_bench_app.db"))
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_store import synthetic_states
+from trinetx_triage.core import DESIGNS, GATE_A_ITEMS, PROJECT_FIELDS, TRIAGE_DOMAINS
+from trinetx_triage.metrics import METRICS
+from trinetx_triage.reports import REPORT_FORMATS, render_report
+from trinetx_triage.statefile import dump_state
+from trinetx_triage.launcher import APP_PATH
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_COLD_START = """
+import time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+from trinetx_triage.launcher import APP_PATH
+t1 = time.perf_counter()
+at = AppTest.from_file(APP_PATH, default_timeout=120)
+at.run()
+assert not at.exception, at.exception
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+def _ms(values: List[float]) -> float:
+    return round(statistics.median(values) * 1000, 1)
+
+def cold_start(repeat: int) -> Dict:
+    imports, first = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _COLD_START], cwd=REPO_ROOT, check=True,
+                             capture_output=True, text=True).stdout.split()
+        imports.append(float(out[0]))
+        first.append(float(out[1]))
+    return {"imports_ms": _ms(imports), "first_run_ms": _ms(first), "total_ms": _ms([a + b for a, b in zip(imports, first)])}
+
+def fresh_app() -> AppTest:
+    return AppTest.from_file(APP_PATH, default_timeout=120)
+
+def _timed(action: Callable[[], AppTest]) -> float:
+    t0 = time.perf_counter()
+    at = action()
+    elapsed = time.perf_counter() - t0
+    assert not at.exception, at.exception
+    return elapsed
+
+def interactions(repeat: int) -> Dict:
+    # One saved state to upload: a Case–control project with answers everywhere
+    _, saved = next(s for s in synthetic_states(10) if s[1]["design"] == "Case–control")
+    payload = dump_state(saved)
+    first_dom = TRIAGE_DOMAINS[0][0]
+    first_q = GATE_A_ITEMS[0][0]
+    times: Dict[str, List[float]] = {k: [] for k in ("first_render", "gate_a_checkbox", "rubric_radio", "strobe_item",
+                                                     "design_switch", "json_load")}
+    report_times: Dict[str, List[float]] = {fmt: [] for fmt in REPORT_FORMATS}
+    widgets = 0
+    for _ in range(repeat):
+        at = fresh_app()
+        times["first_render"].append(_timed(at.run))
+        # A fragment rerun leaves a partial element tree; an untimed full run restores it
+        times["gate_a_checkbox"].append(_timed(at.checkbox(key=f"gatea_{first_q}").check().run))
+        at.run()
+        times["rubric_radio"].append(_timed(at.radio(key=f"rubric_{first_dom}").set_value(2).run))
+        at.run()
+        times["strobe_item"].append(_timed(at.checkbox(key="strobe_ST5").check().run))
+        at.run()
+        times["design_switch"].append(_timed(at.sidebar.selectbox[0].select(DESIGNS[1]).run))
+        at.run()
+        times["json_load"].append(_timed(at.sidebar.get("file_uploader")[0].upload("state.json", payload, "application/json").run))
+        assert at.session_state.design == saved["design"]
+
+        state = {k: at.session_state[k] for k in (*PROJECT_FIELDS, "gate_a", "gate_b_mask", "gates_pass", "strobe_mask",
+                                                   "strobe_where", "checklists", "rubric", "rubric_total", "upgrades")}
+        for fmt in REPORT_FORMATS:
+            t0 = time.perf_counter()
+            render_report(state, fmt)
+            report_times[fmt].append(time.perf_counter() - t0)
+        widgets = at.session_state.perf_run["widgets"]
+    return {
+        "rerun_ms": {k: _ms(v) for k, v in times.items()},
+        "report_ms": {k: round(statistics.median(v) * 1000, 3) for k, v in report_times.items()},
+        "widgets": widgets,
+    }
+
+def section_breakdown() -> Dict:
+    return {r["label"]: round(r["p50"] * 1000, 2) for r in METRICS.snapshot() if r["metric"] == "section_seconds"}
+
+def run(repeat: int = 5, cold: int = 3) -> Dict:
+    METRICS.reset()
+    result = {"benchmark": "app", "repeat": repeat}
+    if cold:
+        result["cold_start"] = cold_start(cold)
+    result.update(interactions(repeat))
+    result["section_p50_ms"] = section_breakdown()
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the planner page headlessly with AppTest.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cold", type=int, default=3, help="Cold-start subprocess runs (0 to skip).")
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat, args.cold), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Checklist registry: precomputed per-design item tuples and bit masks versus the
+# old module-list helpers (copy the base list, concatenate the addendum, rebuild
+# the mask by id) on every call, plus the one-off cost of loading the registry.
+#
+#   python -m benchmarks.bench_checklists [--calls 100000]
+
+import argparse
+import json
+import time
+from typing import Dict, List, Tuple
+
+from trinetx_triage.checklists import load_registry
+from trinetx_triage.core import (
+    DESIGNS,
+    STROBE_BASE,
+    STROBE_BIT,
+    STROBE_CASECONTROL,
+    STROBE_COHORT,
+    STROBE_CROSSSECTIONAL,
+    checklist_items,
+    strobe_design_mask,
+    strobe_items_for_design,
+)
+
+def old_items_for_design(design: str) -> List[Tuple[str, str, str]]:
+    base = STROBE_BASE.copy()
+    if design == "Cohort":
+        return base + STROBE_COHORT
+    elif design == "Case–control":
+        return base + STROBE_CASECONTROL
+    elif design == "Cross-sectional":
+        return base + STROBE_CROSSSECTIONAL
+    else:
+        return base
+
+def old_design_mask(design: str) -> int:
+    mask = 0
+    for k, _, _ in old_items_for_design(design):
+        mask |= STROBE_BIT.get(k, 0)
+    return mask
+
+def _per_call_ns(fn, calls: int) -> float:
+    designs = [DESIGNS[i % len(DESIGNS)] for i in range(calls)]
+    t0 = time.perf_counter()
+    for d in designs:
+        fn(d)
+    return round((time.perf_counter() - t0) / calls * 1e9, 1)
+
+def run(calls: int = 100_000) -> Dict:
+    for d in DESIGNS:
+        assert [tuple(i) for i in strobe_items_for_design(d)] == old_items_for_design(d)
+        assert strobe_design_mask(d) == old_design_mask(d)
+    t0 = time.perf_counter()
+    registry = load_registry()
+    load_ms = (time.perf_counter() - t0) * 1000
+    return {
+        "benchmark": "checklists",
+        "checklists": {cid: len(c.items) for cid, c in registry.checklists.items()},
+        "load_registry_ms": round(load_ms, 2),
+        "items_for_design_ns": {"module_lists": _per_call_ns(old_items_for_design, calls),
+                                "registry": _per_call_ns(strobe_items_for_design, calls)},
+        "design_mask_ns": {"module_lists": _per_call_ns(old_design_mask, calls),
+                           "registry": _per_call_ns(strobe_design_mask, calls)},
+        "strobe_plus_record_pe_ns": _per_call_ns(lambda d: checklist_items(d, ("RECORD-PE",)), calls),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark checklist registry lookups.")
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.calls), indent=2))
+
+if __name__ == "__main__":
+    main()
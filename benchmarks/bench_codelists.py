@@ -0,0 +1,100 @@
+# Code-list validation: sorted-array index (trinetx_triage.codelists) versus a
+# linear scan of the vocabulary per entry, on a synthetic ICD-10-CM/CPT/RxNorm
+# vocabulary, with an agreement check on the number of distinct codes covered.
+#
+#   python -m benchmarks.bench_codelists [--vocab-size 300000 --entries 5000]
+
+import argparse
+import fnmatch
+import json
+import random
+import time
+from typing import Dict, List, Set, Tuple
+
+from trinetx_triage.codelists import Vocabulary, normalize_code, validate
+
+def synthetic_vocabulary(n: int, seed: int = 0) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    icd: Set[str] = set()
+    while len(icd) < n // 3:
+        code = f"{rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}{rng.randint(0, 99):02d}"
+        tail = rng.random()
+        code += "" if tail < 0.1 else f".{rng.randint(0, 9)}" if tail < 0.5 else f".{rng.randint(0, 99):02d}"
+        icd.add(code)
+    rows = [("ICD10CM", c) for c in sorted(icd)]
+    rows += [("CPT4", str(c)) for c in range(10000, 10000 + n // 6)]
+    rows += [("RxNorm", str(c)) for c in rng.sample(range(1, 10 * n), n - len(rows))]
+    return rows
+
+def synthetic_list(rows: List[Tuple[str, str]], n: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    icd = [c for s, c in rows if s == "ICD10CM"]
+    entries = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.8:
+            entries.append(rng.choice(rows)[1] if rng.random() < 0.97 else "Z99.999")
+        elif r < 0.9:
+            entries.append(rng.choice(icd)[:3] + ".*")
+        else:
+            lo = rng.choice(icd)[:3]
+            entries.append(f"{lo}-{lo[0]}{min(99, int(lo[1:]) + rng.randint(0, 3)):02d}")
+    return entries
+
+def linear_scan(rows: List[Tuple[str, str]], entries: List[str]) -> int:
+    # (system, code) pairs: the same number can be a CPT and an RxNorm code
+    codes = [(s, normalize_code(c)) for s, c in rows]
+    covered: Set[Tuple[str, str]] = set()
+    for e in entries:
+        if "-" in e:
+            lo, hi = (normalize_code(x) for x in e.split("-"))
+            covered.update((s, c) for s, c in codes if lo <= c and (c <= hi or c.startswith(hi)))
+        elif "*" in e:
+            pattern = normalize_code(e)
+            covered.update((s, c) for s, c in codes if fnmatch.fnmatchcase(c, pattern))
+        else:
+            code = normalize_code(e)
+            covered.update((s, c) for s, c in codes if c == code)
+    return len(covered)
+
+def run(vocab_size: int = 300_000, entries: int = 5000, scan_entries: int = 200) -> Dict:
+    rows = synthetic_vocabulary(vocab_size)
+    t0 = time.perf_counter()
+    vocab = Vocabulary.from_rows(rows)
+    build_ms = (time.perf_counter() - t0) * 1000
+    codes = synthetic_list(rows, entries)
+
+    t0 = time.perf_counter()
+    report = validate(codes, vocab)
+    validate_ms = (time.perf_counter() - t0) * 1000
+
+    # The linear scan is far slower, so it is timed (and cross-checked) on a prefix of the list
+    sample = codes[:scan_entries]
+    t0 = time.perf_counter()
+    expected = linear_scan(rows, sample)
+    scan_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    got = validate(sample, vocab).expanded
+    sample_ms = (time.perf_counter() - t0) * 1000
+    return {
+        "vocabulary_codes": len(vocab),
+        "build_ms": round(build_ms, 1),
+        "entries": entries,
+        "validate_ms": round(validate_ms, 2),
+        "expanded": report.expanded,
+        "unknown": len(report.unknown),
+        "scan_entries": scan_entries,
+        "linear_scan_ms": round(scan_ms, 1),
+        "index_ms": round(sample_ms, 2),
+        "expanded_agrees": got == expected,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark code-list validation.")
+    parser.add_argument("--vocab-size", type=int, default=300_000)
+    parser.add_argument("--entries", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.vocab_size, args.entries), indent=2))
+
+if __name__ == "__main__":
+    main()
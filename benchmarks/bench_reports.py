@@ -0,0 +1,91 @@
+# Report pipeline: per-format render time with templates parsed once at import versus
+# re-parsing the same template text on every call, and peak Python heap of a bulk
+# ZIP export (streamed into a spooled file) versus rendering every report first,
+# at growing portfolio sizes.
+#
+#   python -m benchmarks.bench_reports [--projects 500 1000 3000]
+
+import argparse
+import io
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.bench_store import synthetic_states
+from trinetx_triage import reports
+from trinetx_triage.store import ProjectStore
+
+BULK_FORMATS = ("md", "html", "xlsx")
+GENERATED = "2026-01-01T00:00:00"
+
+def _median_us(fn, items, repeat: int = 5) -> float:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for item in items:
+            fn(item)
+        runs.append((time.perf_counter() - t0) / len(items))
+    return round(statistics.median(runs) * 1e6, 1)
+
+def _naive_zip(store: ProjectStore) -> bytes:
+    # Every report rendered and held, then archived in memory
+    rendered = [(pid, reports.render_reports(state, BULK_FORMATS, GENERATED)) for pid, state in store.iter_states()]
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for pid, files in rendered:
+            for fmt, data in files.items():
+                zf.writestr(f"{pid:05d}.{reports.REPORT_FORMATS[fmt].extension}", data)
+    return buf.getvalue()
+
+def _peak(fn) -> Dict:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    size = fn()
+    seconds = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 2), "peak_mib": round(peak / 2**20, 2), "zip_mib": round(size / 2**20, 2)}
+
+def run(projects: List[int] = (500, 1000, 3000), sample: int = 200) -> Dict:
+    states = [s for _, s in synthetic_states(sample)]
+    contexts = [reports.report_context(s, GENERATED) for s in states]
+    page = reports._MD_PAGE.source
+    md_fields = lambda ctx: {**ctx, "gate_a_list": "", "gate_b_list": "", "strobe_rows": "", "rubric_rows": "", "upgrades_list": "", "extra_checklists": ""}
+    render = {
+        "context_us": _median_us(lambda s: reports.report_context(s, GENERATED), states),
+        "md_page_compiled_us": _median_us(lambda c: reports._MD_PAGE(**md_fields(c)), contexts),
+        "md_page_format_map_us": _median_us(lambda c: page.format_map(md_fields(c)), contexts),
+        **{f"{fmt}_us": _median_us(spec.render, contexts) for fmt, spec in reports.REPORT_FORMATS.items()},
+        "all_formats_shared_context_us": _median_us(lambda s: reports.render_reports(s, reports.REPORT_FORMATS, GENERATED), states),
+        "all_formats_separate_us": _median_us(lambda s: [reports.render_report(s, f, GENERATED) for f in reports.REPORT_FORMATS], states),
+    }
+
+    bulk = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in projects:
+            store = ProjectStore(str(Path(tmp) / f"bench_{n}.db"))
+            store.import_states(synthetic_states(n))
+
+            def streamed():
+                with tempfile.SpooledTemporaryFile(max_size=reports.SPOOL_MAX_BYTES) as out:
+                    reports.write_zip(store.iter_states(), out, BULK_FORMATS, GENERATED)
+                    return out.tell()
+
+            bulk.append({"projects": n, "streamed": _peak(streamed), "render_all_first": _peak(lambda: len(_naive_zip(store)))})
+            store.close()
+    return {"benchmark": "reports", "render_sample": sample, "render": render,
+            "bulk_formats": list(BULK_FORMATS), "spool_max_mib": reports.SPOOL_MAX_BYTES / 2**20, "bulk": bulk}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark report rendering and bulk ZIP export.")
+    parser.add_argument("--projects", type=int, nargs="+", default=[500, 1000, 3000])
+    args = parser.parse_args()
+    print(json.dumps(run(args.projects), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Pure scoring helpers at portfolio scale: per-call cost of each function the
+# page and the batch CLI use, over synthetic projects, plus the vectorized path
+# (frame_from_states + score_frame) on the same states for comparison.
+# make_report_md is timed on a sample since it dominates and scales linearly.
+#
+#   python -m benchmarks.bench_scoring [--sizes 10000 100000]
+
+import argparse
+import json
+import time
+from typing import Callable, Dict, List, Sequence
+
+from benchmarks.bench_store import synthetic_states
+from trinetx_triage.core import (
+    STROBE_BIT,
+    compute_strobe_score,
+    decision_gates_pass,
+    make_report_md,
+    normalize_state,
+    score_state,
+    strobe_items_for_design,
+    strobe_score,
+    triage_decision,
+)
+from trinetx_triage.vectorized import frame_from_states, score_frame
+
+REPORT_SAMPLE = 2000
+
+def legacy_checks(state: Dict) -> Dict[str, Dict]:
+    # The per-item dict form compute_strobe_score() takes
+    mask = state["strobe_mask"]
+    return {k: {"section": sec, "prompt": prompt, "addressed": bool(mask & STROBE_BIT[k])}
+            for k, sec, prompt in strobe_items_for_design(state["design"])}
+
+def _per_call_us(fn: Callable, items: Sequence, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - t0)
+    return round(best / len(items) * 1e6, 3)
+
+def run(sizes: List[int] = (10_000, 100_000), repeat: int = 3) -> Dict:
+    results = []
+    for n in sizes:
+        states = [s for _, s in synthetic_states(n)]
+        payloads = [dict(s, gate_a=dict(s["gate_a"])) for s in states]
+        checks = [legacy_checks(s) for s in states]
+        decision_args = [(s["rubric_total"], strobe_score(s)[2], decision_gates_pass(s)) for s in states]
+        per_call = {
+            "normalize_state_us": _per_call_us(normalize_state, payloads, repeat),
+            "compute_strobe_score_us": _per_call_us(compute_strobe_score, checks, repeat),
+            "strobe_score_us": _per_call_us(strobe_score, states, repeat),
+            "triage_decision_us": _per_call_us(lambda a: triage_decision(*a), decision_args, repeat),
+            "score_state_us": _per_call_us(score_state, states, repeat),
+            "make_report_md_us": _per_call_us(make_report_md, states[:REPORT_SAMPLE], 1),
+        }
+        t0 = time.perf_counter()
+        scored = score_frame(frame_from_states(states))
+        vectorized = time.perf_counter() - t0
+        scalar_tracks = [score_state(s)["decision"] for s in states]
+        results.append({
+            "projects": n,
+            **per_call,
+            "vectorized_seconds": round(vectorized, 4),
+            "vectorized_us_per_project": round(vectorized / n * 1e6, 3),
+            "mismatches": int(sum(a != b for a, b in zip(scalar_tracks, scored["decision"]))),
+        })
+    return {"benchmark": "scoring", "report_sample": REPORT_SAMPLE, "results": results}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the pure scoring helpers at scale.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.repeat), indent=2))
+
+if __name__ == "__main__":
+    main()
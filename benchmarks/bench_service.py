@@ -0,0 +1,120 @@
+# Local load test of the scoring service (trinetx_triage.service), started as a
+# subprocess on a free port and driven by client threads over keep-alive
+# connections. Per scenario: client-side p50/p99 latency, requests and states per
+# second, and the server's micro-batch / report-cache counters over the scenario.
+#   score_single     one state per request, 1 and --concurrency clients
+#   score_unbatched  the same load against a server started with --max-batch 1
+#   score_batch100   100 states per request
+#   report_cached    Markdown reports for a pool of 50 states (mostly cache hits)
+#   report_unique    Markdown reports for states never seen before (all misses)
+#
+#   python -m benchmarks.bench_service [--requests 2000] [--concurrency 16]
+
+import argparse
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from benchmarks.bench_store import synthetic_states
+from trinetx_triage.metrics import quantiles
+from trinetx_triage.statefile import to_record
+
+@contextmanager
+def server(*args: str) -> Iterator[Tuple[str, int]]:
+    proc = subprocess.Popen([sys.executable, "-m", "trinetx_triage.service", "--port", "0", *args],
+                            stdout=subprocess.PIPE, text=True)
+    try:
+        line = proc.stdout.readline()   # "listening on http://127.0.0.1:PORT"
+        host, port = line.strip().rsplit("/", 1)[-1].rsplit(":", 1)
+        yield host, int(port)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def _get(addr: Tuple[str, int], path: str) -> Dict:
+    conn = http.client.HTTPConnection(*addr)
+    conn.request("GET", path)
+    data = json.loads(conn.getresponse().read())
+    conn.close()
+    return data
+
+def load(addr: Tuple[str, int], path: str, bodies: Sequence[bytes], concurrency: int) -> Dict:
+    """Send every body once, spread over ``concurrency`` client threads."""
+    latencies: List[float] = []
+    failed: List[int] = []
+    lock = threading.Lock()
+
+    def client(chunk: Sequence[bytes]) -> None:
+        conn = http.client.HTTPConnection(*addr)
+        mine, errors = [], 0
+        for body in chunk:
+            t0 = time.perf_counter()
+            conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            mine.append(time.perf_counter() - t0)
+            errors += resp.status != 200
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            failed.append(errors)
+
+    before = _get(addr, "/v1/stats")
+    threads = [threading.Thread(target=client, args=(bodies[i::concurrency],)) for i in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    after = _get(addr, "/v1/stats")
+    p50, p90, p99 = quantiles(latencies)
+    batches = after["batcher"]["batches"] - before["batcher"]["batches"]
+    scored = after["batcher"]["states"] - before["batcher"]["states"]
+    hits = after["report_cache"]["hits"] - before["report_cache"]["hits"]
+    misses = after["report_cache"]["misses"] - before["report_cache"]["misses"]
+    return {
+        "requests": len(latencies), "concurrency": concurrency, "errors": sum(failed),
+        "p50_ms": round(p50 * 1000, 3), "p99_ms": round(p99 * 1000, 3), "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "mean_batch": round(scored / batches, 2) if batches else None,
+        "states_per_s": round(scored / elapsed, 1) if scored else None,
+        "cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+    }
+
+def run(requests: int = 2000, concurrency: int = 16) -> Dict:
+    states = [to_record(s) for _, s in synthetic_states(max(requests, 5000))]
+    singles = [json.dumps(states[i % len(states)]).encode() for i in range(requests)]
+    batches = [json.dumps({"states": states[(i * 100) % len(states):][:100]}).encode() for i in range(max(1, requests // 10))]
+    pool = singles[:50]
+    cached = [pool[i % len(pool)] for i in range(requests)]
+    unique = [json.dumps(dict(states[i % len(states)], title=f"Unique project {i}")).encode() for i in range(requests)]
+
+    results = {}
+    with server() as addr:
+        load(addr, "/v1/score", singles[:200], 4)   # warm-up
+        results["score_single_c1"] = load(addr, "/v1/score", singles[: max(1, requests // 4)], 1)
+        results["score_single"] = load(addr, "/v1/score", singles, concurrency)
+        results["score_batch100"] = load(addr, "/v1/score", batches, 4)
+        results["report_cached"] = load(addr, "/v1/report?format=md", cached, concurrency)
+        results["report_unique"] = load(addr, "/v1/report?format=md", unique, concurrency)
+    with server("--max-batch", "1") as addr:
+        load(addr, "/v1/score", singles[:200], 4)
+        results["score_unbatched"] = load(addr, "/v1/score", singles, concurrency)
+    return {"benchmark": "service", "scenarios": results}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the local scoring service.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.concurrency), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Bytes per reviewer session: the old per-item dict state (section/prompt copied
+# into every STROBE row, Gate B keyed by sentence) vs the compact bitset state.
+#
+#   python -m benchmarks.bench_session_memory
+#
+# "retained" counts objects a session keeps alive beyond the shared, read-only
+# module tables; "after JSON load" is the same state rebuilt from a saved file,
+# where every string is a private copy; "pickled" is what a serialised session
+# (e.g. runner.enforceSerializableSessionState) costs.
+
+import json
+import pickle
+import random
+import sys
+from typing import Dict, Set
+
+from trinetx_triage import core
+
+def shared_ids() -> Set[int]:
+    seen: Set[int] = set()
+    for table in (core.TRIAGE_DOMAINS, core.DEPTH_UPGRADES, core.STROBE_ITEMS, core.GATE_A_ITEMS, core.GATE_B_MIN,
+                  core.STROBE_BIT, core.PROJECT_FIELDS):
+        _walk(table, seen, set())
+    return seen
+
+def _walk(obj, seen: Set[int], skip: Set[int]) -> int:
+    if id(obj) in seen or id(obj) in skip:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict) or type(obj).__name__ == "mappingproxy":
+        for k, v in obj.items():
+            size += _walk(k, seen, skip) + _walk(v, seen, skip)
+    elif isinstance(obj, (list, tuple, set)):
+        for v in obj:
+            size += _walk(v, seen, skip)
+    return size
+
+def retained_bytes(state: Dict, shared: Set[int]) -> int:
+    return _walk(state, set(), shared)
+
+def legacy_state(design: str, rng: random.Random) -> Dict:
+    checks = {
+        k: {"section": sec, "prompt": prompt, "addressed": rng.random() < 0.7, "where": "Methods, Table 2" if rng.random() < 0.3 else ""}
+        for k, sec, prompt in core.strobe_items_for_design(design)
+    }
+    gate_b_items = core.GATE_B_MIN[design]
+    return {
+        "design": design, "title": "Metformin vs SU and dementia", "question": "", "index": "", "period": "", "sites": "", "irb": "",
+        "gate_a": {k: True for k, _ in core.GATE_A_ITEMS}, "gates_pass": True,
+        "gate_b": {item: rng.random() < 0.8 for item in gate_b_items}, "gate_b_items": gate_b_items,
+        "rubric": {dom: rng.randint(0, 2) for dom, _ in core.TRIAGE_DOMAINS}, "rubric_total": 0,
+        "strobe_checks": checks, "upgrades": list(core.DEPTH_UPGRADES[:3]),
+    }
+
+def compact_state(legacy: Dict) -> Dict:
+    state = core.normalize_state(legacy)
+    state["upgrades"] = legacy["upgrades"]  # same list object as the app keeps
+    return state
+
+def run(sessions: int = 500) -> Dict:
+    rng = random.Random(0)
+    shared = shared_ids()
+    rows = {"legacy": [0, 0, 0], "compact": [0, 0, 0]}
+    for i in range(sessions):
+        legacy = legacy_state(core.DESIGNS[i % len(core.DESIGNS)], rng)
+        for name, state in (("legacy", legacy), ("compact", compact_state(legacy))):
+            rows[name][0] += retained_bytes(state, shared)
+            rows[name][1] += retained_bytes(json.loads(json.dumps(state)), shared)
+            rows[name][2] += len(pickle.dumps(state))
+    results = []
+    for name, (retained, loaded, pickled) in rows.items():
+        results.append({
+            "state": name,
+            "retained_bytes_per_session": retained // sessions,
+            "after_json_load_bytes_per_session": loaded // sessions,
+            "pickled_bytes_per_session": pickled // sessions,
+        })
+    return {"benchmark": "session_memory", "sessions": sessions, "results": results}
+
+def main() -> None:
+    print(json.dumps(run(), indent=2))
+
+if __name__ == "__main__":
+    main()
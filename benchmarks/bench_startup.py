@@ -0,0 +1,132 @@
+# Startup budget for a new server process or scaled-out worker, each phase
+# measured in a fresh interpreter (median over --repeat runs):
+#   package      import trinetx_triage (what batch and job workers load)
+#   streamlit    import streamlit
+#   app_imports  every module the page script imports at the top, after streamlit
+#   first_run    first full run of the planner page (AppTest, imports already done)
+# plus which heavy optional modules (pandas, numpy, graphviz, pyarrow) are loaded
+# after that first run -- there should be none -- and an import-time report from
+# python -X importtime: self time summed per top-level package, and cumulative
+# time of each trinetx_triage module.
+#
+#   python -m benchmarks.bench_startup [--repeat 5] [--check]
+#
+# --check exits 1 when a phase is over BUDGET_MS or a heavy module was loaded.
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List
+
+from trinetx_triage.launcher import APP_PATH
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds, with headroom over a typical laptop; streamlit itself is most of it
+BUDGET_MS = {"package": 100, "streamlit": 800, "app_imports": 150, "first_run": 1500}
+HEAVY_MODULES = ("pandas", "numpy", "graphviz", "pyarrow")
+
+def app_imports() -> List[str]:
+    """Modules the page script imports at module level (not under TYPE_CHECKING or in functions)."""
+    with open(APP_PATH, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+def _import_lines() -> str:
+    # Plain import statements: -X importtime does not log importlib.import_module()
+    return "\n".join(f"import {name}" for name in app_imports())
+
+_PHASES = """
+import json, sys, time
+t0 = time.perf_counter()
+import trinetx_triage
+t1 = time.perf_counter()
+import streamlit
+t2 = time.perf_counter()
+{imports}
+t3 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+t4 = time.perf_counter()
+at.run()
+t5 = time.perf_counter()
+assert not at.exception, at.exception
+print(json.dumps({{"package": t1 - t0, "streamlit": t2 - t1, "app_imports": t3 - t2, "first_run": t5 - t4,
+                  "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def _env() -> Dict[str, str]:
+    # The page opens the project store; keep it out of the working copy
+    env = dict(os.environ)
+    env.setdefault("TRINETX_TRIAGE_DB", os.path.join(tempfile.gettempdir(), "trinetx_bench_startup.db"))
+    return env
+
+def phases(repeat: int) -> Dict:
+    code = _PHASES.format(imports=_import_lines(), app=APP_PATH, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=_env(), check=True,
+                             capture_output=True, text=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    ms = {k: round(statistics.median(r[k] for r in runs) * 1000, 1) for k in BUDGET_MS}
+    return {"phases_ms": ms, "total_ms": round(sum(ms.values()), 1),
+            "heavy_loaded": sorted({m for r in runs for m in r["heavy"]})}
+
+def import_report(top: int = 15) -> Dict:
+    """python -X importtime over the package, streamlit and the page's imports."""
+    code = "import trinetx_triage\nimport streamlit\n" + _import_lines()
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT, env=_env(), check=True,
+                         capture_output=True, text=True).stderr
+    per_package: Dict[str, int] = defaultdict(int)
+    ours: Dict[str, int] = {}
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue   # header line
+        module = name.strip()
+        per_package[module.split(".")[0]] += int(self_us)
+        if module.split(".")[0] == "trinetx_triage":
+            ours[module] = int(cumulative_us)
+    ranked = sorted(per_package.items(), key=lambda kv: -kv[1])
+    return {
+        "total_ms": round(sum(per_package.values()) / 1000, 1),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in ranked[:top]},
+        "trinetx_triage_ms": {name: round(us / 1000, 2) for name, us in sorted(ours.items(), key=lambda kv: -kv[1])},
+    }
+
+def over_budget(result: Dict) -> List[str]:
+    problems = [f"{phase}: {ms} ms > {BUDGET_MS[phase]} ms" for phase, ms in result["phases_ms"].items() if ms > BUDGET_MS[phase]]
+    problems += [f"{name} loaded by the first planner run" for name in result["heavy_loaded"]]
+    return problems
+
+def run(repeat: int = 5) -> Dict:
+    result = {"benchmark": "startup", "repeat": repeat, "budget_ms": BUDGET_MS, **phases(repeat)}
+    result["import_report"] = import_report()
+    result["over_budget"] = over_budget(result)
+    return result
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start phases against the startup budget.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Exit 1 if over budget.")
+    args = parser.parse_args()
+    result = run(args.repeat)
+    print(json.dumps(result, indent=2))
+    return 1 if args.check and result["over_budget"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
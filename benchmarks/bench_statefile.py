@@ -0,0 +1,101 @@
+# Disk size and load time of saved states: schema-1 sidebar dumps (every
+# session_state key, indent=2) vs schema-2 answer records, plain and gzipped,
+# decoded from memory and read back from disk (one file per state vs one
+# .jsonl.gz archive).
+#
+#   python -m benchmarks.bench_statefile [--states 5000]
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from trinetx_triage import core
+from trinetx_triage.statefile import dump_state, iter_archive, load_state, write_archive
+
+def legacy_dump(rng: random.Random, design: str) -> bytes:
+    """What the old "Download JSON state" button wrote: every session_state key."""
+    checks = {
+        k: {"section": sec, "prompt": prompt, "addressed": rng.random() < 0.7, "where": "Methods, Table 2" if rng.random() < 0.3 else ""}
+        for k, sec, prompt in core.strobe_items_for_design(design)
+    }
+    gate_b_items = core.GATE_B_MIN[design]
+    rubric = {dom: rng.randint(0, 2) for dom, _ in core.TRIAGE_DOMAINS}
+    payload = {
+        "gate_a": {k: rng.random() < 0.9 for k, _ in core.GATE_A_ITEMS}, "gate_b": {i: rng.random() < 0.8 for i in gate_b_items},
+        "rubric": rubric, "rubric_total": sum(rubric.values()), "strobe_checks": checks, "design": design,
+        "title": "Metformin vs sulfonylureas and incident dementia", "question": "Adults with T2D starting metformin vs SU; dementia at 5y.",
+        "index": "First prescription", "period": "2010–2024", "sites": "TriNetX US network", "irb": "Exempt",
+        "upgrades": core.DEPTH_UPGRADES[:3], "gates_pass": True, "gate_b_items": gate_b_items,
+    }
+    for k, v in checks.items():
+        payload[f"strobe_{k}"] = v["addressed"]
+        payload[f"strobe_where_{k}"] = v["where"]
+    payload.update({f"rubric_{dom}": s for dom, s in rubric.items()})
+    payload.update({f"gateb_{i}": v for i, v in payload["gate_b"].items()})
+    payload.update({f"up_{i}": i < 3 for i in range(len(core.DEPTH_UPGRADES))})
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+def timed_load(blobs: List[bytes]) -> float:
+    t0 = time.perf_counter()
+    for b in blobs:
+        load_state(b)
+    return time.perf_counter() - t0
+
+def disk_bytes(paths: List[Path]) -> int:
+    return sum(os.stat(p).st_blocks * 512 for p in paths)
+
+def disk_round_trip(blobs: List[bytes], tmp: Path, name: str) -> Dict:
+    paths = []
+    for i, b in enumerate(blobs):
+        p = tmp / f"{name}_{i}.json"
+        p.write_bytes(b)
+        paths.append(p)
+    t0 = time.perf_counter()
+    for p in paths:
+        load_state(p.read_bytes())
+    seconds = time.perf_counter() - t0
+    return {"layout": f"{name} files", "disk_bytes": disk_bytes(paths), "load_seconds": round(seconds, 4)}
+
+def run(states: int = 5000) -> Dict:
+    rng = random.Random(0)
+    legacy = [legacy_dump(rng, core.DESIGNS[i % len(core.DESIGNS)]) for i in range(states)]
+    v2 = [dump_state(load_state(b)) for b in legacy]
+    v2_gz = [dump_state(load_state(b), compress=True) for b in legacy]
+    assert all(load_state(a) == load_state(b) for a, b in zip(legacy[:200], v2_gz[:200]))
+
+    results = []
+    for name, blobs in (("schema1_json", legacy), ("schema2_json", v2), ("schema2_gzip", v2_gz)):
+        seconds = timed_load(blobs)
+        results.append({
+            "format": name,
+            "bytes_per_state": sum(map(len, blobs)) // states,
+            "load_us_per_state": round(seconds / states * 1e6, 1),
+        })
+
+    disk = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        disk.append(disk_round_trip(legacy, tmp, "schema1_json"))
+        disk.append(disk_round_trip(v2_gz, tmp, "schema2_gzip"))
+        archive = tmp / "archive.jsonl.gz"
+        write_archive((load_state(b) for b in v2), archive)
+        t0 = time.perf_counter()
+        n = sum(1 for _ in iter_archive(archive))
+        assert n == states
+        disk.append({"layout": "schema2 archive.jsonl.gz", "disk_bytes": disk_bytes([archive]),
+                     "load_seconds": round(time.perf_counter() - t0, 4)})
+    return {"benchmark": "statefile", "states": states, "results": results, "disk": disk}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark saved-state size and load time.")
+    parser.add_argument("--states", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.states), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Bulk import and indexed query latency of the SQLite project store at 100k rows.
+#
+#   python -m benchmarks.bench_store [--rows 100000]
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from trinetx_triage import core
+from trinetx_triage.store import ProjectStore
+
+def synthetic_states(n: int, seed: int = 0) -> Iterator[Tuple[str, Dict]]:
+    rng = random.Random(seed)
+    for i in range(n):
+        design = core.DESIGNS[i % len(core.DESIGNS)]
+        payload = {
+            "design": design, "title": f"Project {i}",
+            "gate_a": {k: rng.random() < 0.85 for k, _ in core.GATE_A_ITEMS},
+            "gate_b_mask": rng.getrandbits(4),
+            "rubric": {dom: rng.randint(0, 2) for dom, _ in core.TRIAGE_DOMAINS},
+            "strobe_mask": rng.getrandbits(len(core.STROBE_ITEMS)),
+        }
+        yield f"synthetic:{i}", core.normalize_state(payload)
+
+QUERIES = {
+    "cohort_rubric16_failing_gate_a": dict(design="Cohort", min_rubric=16, gate_a_pass=False),
+    "full_manuscript_track": dict(track="Full Manuscript"),
+    "strobe_ge_90": dict(min_strobe=90.0),
+    "case_control_rubric_le_8": dict(design="Case–control", max_rubric=8),
+}
+
+def run(rows: int = 100_000, repeat: int = 20) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProjectStore(str(Path(tmp) / "bench.db"))
+        t0 = time.perf_counter()
+        store.import_states(synthetic_states(rows))
+        import_s = time.perf_counter() - t0
+
+        queries = []
+        for name, filters in QUERIES.items():
+            count_t, rows_t = [], []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                n = store.count(**filters)
+                count_t.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                matches = store.query(**filters)
+                rows_t.append(time.perf_counter() - t0)
+            assert n == len(matches)
+            queries.append({"query": name, "matches": n,
+                            "count_median_ms": round(statistics.median(count_t) * 1000, 2),
+                            "rows_median_ms": round(statistics.median(rows_t) * 1000, 2)})
+        store.close()
+    return {"benchmark": "store", "rows": rows, "import_rows_per_second": round(rows / import_s), "queries": queries}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite project store.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows), indent=2))
+
+if __name__ == "__main__":
+    main()
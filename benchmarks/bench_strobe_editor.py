@@ -0,0 +1,68 @@
+# Before/after render cost of section "4) STROBE Checklist": per-item expanders
+# (two widgets per item) vs the single data_editor grid, driven headlessly with
+# Streamlit's AppTest harness.
+#
+#   python -m benchmarks.bench_strobe_editor [--repeat 5]
+
+import argparse
+import json
+import statistics
+import time
+from typing import Dict
+
+from streamlit.testing.v1 import AppTest
+
+from trinetx_triage.launcher import APP_PATH
+
+def walk(node):
+    yield node
+    for child in (getattr(node, "children", None) or {}).values():
+        yield from walk(child)
+
+def fresh_app(view: str) -> AppTest:
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.session_state["strobe_view"] = view
+    return at
+
+def measure(view: str, repeat: int) -> Dict:
+    first, rerun = [], []
+    for _ in range(repeat):
+        at = fresh_app(view)
+        t0 = time.perf_counter()
+        at.run()
+        first.append(time.perf_counter() - t0)
+        assert not at.exception, at.exception
+
+        # One "addressed" toggle in the mode's own idiom
+        if view == "Table":
+            at.selectbox(key="strobe_bulk_section").select("Methods").run()
+            at.run()  # the fragment rerun above leaves a partial element tree
+            action = next(b for b in at.button if b.label.startswith("Mark all Methods")).click
+        else:
+            action = at.checkbox(key="strobe_ST5").check
+        t0 = time.perf_counter()
+        action().run()
+        rerun.append(time.perf_counter() - t0)
+
+    at = fresh_app(view)
+    at.run()
+    nodes = list(walk(at._tree))
+    return {
+        "view": view,
+        "first_render_ms": round(statistics.median(first) * 1000, 1),
+        "toggle_rerun_ms": round(statistics.median(rerun) * 1000, 1),
+        "elements": len(nodes),
+        "strobe_widgets": sum(1 for n in nodes if str(getattr(n, "key", None) or "").startswith("strobe_")),
+    }
+
+def run(repeat: int = 5) -> Dict:
+    return {"benchmark": "strobe_editor", "results": [measure(view, repeat) for view in ("Expanders", "Table")]}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare STROBE expander vs table rendering cost.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
+
+if __name__ == "__main__":
+    main()
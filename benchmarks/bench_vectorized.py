@@ -0,0 +1,88 @@
+# Throughput of trinetx_triage.vectorized.score_frame at 1k / 100k / 1M projects,
+# plus an exact-agreement check against the scalar triage_decision().
+#
+#   python -m benchmarks.bench_vectorized [--sizes 1000 100000 1000000]
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from trinetx_triage.core import DESIGNS, GATE_B_MIN, strobe_items_for_design, triage_decision
+from trinetx_triage.vectorized import (
+    GATE_A_COLUMNS,
+    GATE_B_COLUMNS,
+    RUBRIC_COLUMNS,
+    STROBE_COLUMNS,
+    score_frame,
+)
+
+def synthetic_portfolio(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    design_idx = rng.integers(0, len(DESIGNS), n)
+    cols = {"design": np.asarray(DESIGNS, dtype=object)[design_idx]}
+    for c in RUBRIC_COLUMNS:
+        cols[c] = rng.integers(0, 3, n, dtype=np.int8)
+    for c in GATE_A_COLUMNS:
+        cols[c] = rng.random(n) < 0.95
+
+    strobe = (rng.random((n, len(STROBE_COLUMNS))) < 0.8).astype(np.float64)
+    gate_b = (rng.random((n, len(GATE_B_COLUMNS))) < 0.9).astype(np.float64)
+    for d, design in enumerate(DESIGNS):
+        rows = design_idx == d
+        in_design = {k for k, _, _ in strobe_items_for_design(design)}
+        off = [j for j, k in enumerate(STROBE_COLUMNS) if k not in in_design]
+        strobe[np.ix_(rows, off)] = np.nan
+        gate_b[rows, len(GATE_B_MIN[design]):] = np.nan
+    cols.update(zip(STROBE_COLUMNS, strobe.T))
+    cols.update(zip(GATE_B_COLUMNS, gate_b.T))
+    return pd.DataFrame(cols)
+
+def check_agreement(df: pd.DataFrame, scored: pd.DataFrame, sample: int = 20000) -> int:
+    """Rows (of a sample) where score_frame disagrees with triage_decision; must be 0."""
+    idx = df.index[:sample]
+    mismatches = 0
+    for i in idx:
+        row = df.loc[i]
+        answered = [row[c] for c in STROBE_COLUMNS if not np.isnan(row[c])]
+        yes, total = int(sum(answered)), len(answered)
+        pct = (yes / total * 100.0) if total else 0.0
+        gate_b = [bool(row[c]) for c in GATE_B_COLUMNS if not np.isnan(row[c])]
+        gates = all(bool(row[c]) for c in GATE_A_COLUMNS) and (all(gate_b) if gate_b else True)
+        rubric_total = int(sum(int(row[c]) for c in RUBRIC_COLUMNS))
+        decision, _ = triage_decision(rubric_total, pct, gates)
+        got = scored.loc[i]
+        if (decision != got["decision"] or pct != got["strobe_pct"] or rubric_total != got["rubric_total"]
+                or gates != bool(got["gates_pass"])):
+            mismatches += 1
+    return mismatches
+
+def run(sizes: List[int], repeat: int = 3) -> Dict:
+    results = []
+    for n in sizes:
+        df = synthetic_portfolio(n)
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            scored = score_frame(df)
+            best = min(best, time.perf_counter() - t0)
+        results.append({
+            "rows": n,
+            "seconds": round(best, 6),
+            "rows_per_second": round(n / best) if best else None,
+            "mismatches": check_agreement(df, scored, sample=min(n, 2000)),
+        })
+    return {"benchmark": "vectorized_score_frame", "results": results}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized portfolio scoring.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.repeat), indent=2))
+
+if __name__ == "__main__":
+    main()
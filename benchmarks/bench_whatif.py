@@ -0,0 +1,70 @@
+# Threshold what-if: precomputed decision table + NumPy gather versus one
+# triage_decision() call per cell, over the full rubric × STROBE grid and a
+# synthetic portfolio, with an exact-agreement check against the scalar rules.
+#
+#   python -m benchmarks.bench_whatif [--projects 1000000]
+
+import argparse
+import json
+import time
+from typing import Dict
+
+import numpy as np
+
+from trinetx_triage.core import DECISIONS, Thresholds, triage_decision
+from trinetx_triage.whatif import RUBRIC_MAX, PortfolioWhatIf, decision_table, region_map
+
+CODE = {track: i for i, (track, _) in enumerate(DECISIONS)}
+PROPOSED = Thresholds(manuscript_rubric=18, manuscript_strobe=75.0, brief_rubric=15, brief_strobe=60.0, abstract_rubric=10)
+
+def _timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+def run(projects: int = 1_000_000, step: float = 0.1, seed: int = 0) -> Dict:
+    grid = np.linspace(0.0, 100.0, int(round(100.0 / step)) + 1)
+    scalar = lambda: [[CODE[triage_decision(r, p, True, PROPOSED)[0]] for p in grid] for r in range(RUBRIC_MAX + 1)]
+    expected = np.array(scalar())
+
+    region_map.cache_clear()
+    decision_table.cache_clear()
+    cold_ms = _timed(lambda: (region_map.cache_clear(), decision_table.cache_clear(), region_map(PROPOSED, step)), repeat=3)
+    _, codes = region_map(PROPOSED, step)
+    warm_ms = _timed(lambda: region_map(PROPOSED, step))
+
+    rng = np.random.default_rng(seed)
+    totals = rng.integers(15, 26, projects)
+    pf = PortfolioWhatIf(rng.integers(0, RUBRIC_MAX + 1, projects), rng.integers(0, totals + 1) / totals * 100.0,
+                         rng.random(projects) < 0.8)
+    sample = rng.integers(0, projects, 10_000)
+    got = pf.codes(PROPOSED)
+    mismatches = sum(
+        int(got[i]) != CODE[triage_decision(int(pf.rubric_total[i]), float(pf.strobe_pct[i]), bool(pf.gates_pass[i]), PROPOSED)[0]]
+        for i in sample)
+    shift_ms = _timed(lambda: (pf.shift.cache_clear(), pf.shift(PROPOSED)), repeat=3)
+    return {
+        "grid_cells": int(expected.size),
+        "grid_scalar_ms": round(_timed(scalar, repeat=1), 2),
+        "grid_table_cold_ms": round(cold_ms, 3),
+        "grid_table_cached_ms": round(warm_ms, 4),
+        "grid_mismatches": int((codes != expected).sum()),
+        "portfolio_projects": projects,
+        "portfolio_shift_ms": round(shift_ms, 2),
+        "portfolio_shift_cached_ms": round(_timed(lambda: pf.shift(PROPOSED)), 4),
+        "portfolio_sample_mismatches": mismatches,
+        "changed": pf.shift(PROPOSED)["changed"],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=1_000_000)
+    parser.add_argument("--step", type=float, default=0.1, help="STROBE % resolution of the region map.")
+    args = parser.parse_args()
+    print(json.dumps(run(args.projects, args.step), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from trinetx_triage import core
+
+def make_states(n, seed=0):
+    """``n`` varied, normalized project states (all designs, random answers)."""
+    rng = random.Random(seed)
+    states = []
+    for i in range(n):
+        design = core.DESIGNS[i % len(core.DESIGNS)]
+        states.append(core.normalize_state({
+            "design": design,
+            "title": f"Project {i}",
+            "gate_a": {k: rng.random() < 0.85 for k, _ in core.GATE_A_ITEMS},
+            "gate_b_mask": rng.getrandbits(len(core.GATE_B_MIN.get(design, []))),
+            "rubric": {dom: rng.randint(0, 2) for dom, _ in core.TRIAGE_DOMAINS},
+            "strobe_mask": rng.getrandbits(len(core.STROBE_ITEMS)),
+            "strobe_where": {"ST1": "Title page"} if i % 3 == 0 else {},
+            "upgrades": core.DEPTH_UPGRADES[: i % 3],
+            "checklists": core.EXTRA_CHECKLISTS[:1] if i % 4 == 0 else [],
+        }))
+    return states
+
+@pytest.fixture
+def states():
+    return make_states(60)
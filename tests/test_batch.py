@@ -0,0 +1,43 @@
+import gzip
+import json
+
+from conftest import make_states
+from trinetx_triage import batch
+from trinetx_triage.statefile import dump_state
+
+def write_states(folder, names):
+    for name, state in zip(names, make_states(len(names))):
+        path = folder / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(dump_state(state, compress=name.endswith(".gz")))
+
+def test_tasks_from_folders_files_and_archives(tmp_path):
+    write_states(tmp_path / "states", ["a.json", "sub/b.json.gz"])
+    archive = tmp_path / "more.jsonl.gz"
+    with gzip.open(archive, "wt", encoding="utf-8") as fh:
+        fh.write(json.dumps(make_states(1)[0]) + "\n\n" + "{broken\n")
+    tasks = list(batch.iter_tasks([str(tmp_path / "states"), str(archive)]))
+    assert [t[0].rsplit("/", 1)[-1] for t in tasks] == ["a.json", "b.json.gz", "more.jsonl.gz:1", "more.jsonl.gz:3"]
+    assert batch.count_tasks([str(tmp_path / "states")]) == 2
+
+def test_run_batch_scores_and_reports_errors(tmp_path):
+    write_states(tmp_path, ["a.json", "b.json"])
+    (tmp_path / "c.json").write_text("{broken", encoding="utf-8")
+    results = {r["source"].rsplit("/", 1)[-1]: r for r in batch.run_batch([str(tmp_path)], jobs=1)}
+    assert set(results) == {"a.json", "b.json", "c.json"}
+    assert "decision" in results["a.json"] and results["c.json"]["error"].startswith("StateFileError")
+
+def test_report_names_stay_unique(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    write_states(src, ["a/b_c.json", "a_b/c.json", "a_b_c.json.gz"])
+    monkeypatch.chdir(src)
+    reports = tmp_path / "reports"
+    results = list(batch.run_batch(["."], jobs=1, reports_dir=str(reports)))
+    names = sorted(p.name for p in reports.iterdir())
+    assert names == ["a_b_c-2.md", "a_b_c-3.md", "a_b_c.md"]
+    assert sorted(r["report"].rsplit("/", 1)[-1] for r in results) == names
+
+def test_report_names_loop_past_taken_suffixes():
+    labels = ["x.json", "x-2.json", "x.json", "stdin:1", "stdin-1.json"]
+    names = [name for _, name in batch._report_names((label, None, None) for label in labels)]
+    assert names == ["x.md", "x-2.md", "x-3.md", "stdin-1.md", "stdin-1-2.md"]
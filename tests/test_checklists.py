@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from trinetx_triage import core
+from trinetx_triage.checklists import (
+    GUIDELINES_DIR, REGISTRY, ChecklistError, Registry, load_checklist, load_registry, make_checklist, main,
+)
+
+CUSTOM = {
+    "id": "CUSTOM",
+    "title": "Local checklist",
+    "order": 50,
+    "items": [["CU1", "Methods", "Describe it."], ["CU2", "Results", "Report it."]],
+    "design_items": {"Cohort": [["CUC1", "Methods", "Follow-up."]]},
+}
+
+def write(path, data):
+    path.write_text(json.dumps(data) if not isinstance(data, str) else data, encoding="utf-8")
+    return path
+
+def test_packaged_registry_keeps_strobe_first():
+    assert list(REGISTRY)[0] == "STROBE"
+    assert {"STROBE", "RECORD-PE", "TRIPOD", "CONSORT"} <= set(REGISTRY)
+    strobe = REGISTRY["STROBE"]
+    assert core.STROBE_BASE == list(strobe.base)
+    # STROBE items keep the low bits, in order
+    assert [REGISTRY.bit[item.id] for item in strobe.items] == [1 << i for i in range(len(strobe.items))]
+
+def test_items_for_design_and_masks():
+    c = make_checklist(CUSTOM, "custom.json")
+    assert [i.id for i in c.items_for_design("Cohort")] == ["CU1", "CU2", "CUC1"]
+    assert c.items_for_design("Case–control") == c.base
+    assert [i.id for i in c.by_section["Methods"]] == ["CU1", "CUC1"]
+    registry = Registry([c])
+    assert registry.design_mask("CUSTOM", "Cohort") == 0b111
+    assert registry.design_mask("CUSTOM", "Other") == 0b011
+    assert registry.mask["CUSTOM"] == 0b111
+    assert registry.checklist_of["CUC1"] == "CUSTOM"
+
+@pytest.mark.parametrize("data, match", [
+    ({"items": []}, "non-empty string id"),
+    ({"id": "X", "items": {"a": 1}}, "must be a list"),
+    ({"id": "X", "items": [["X1", "Methods"]]}, "bad item"),
+    ({"id": "X", "items": [["X1", "M", "p"], ["X1", "M", "q"]]}, "duplicate item id"),
+    ({"id": "X", "design_items": []}, "design_items must map"),
+    ({"id": "X", "order": "1"}, "order must be an integer"),
+])
+def test_make_checklist_rejects_bad_data(data, match):
+    with pytest.raises(ChecklistError, match=match):
+        make_checklist(data)
+
+def test_load_checklist_reports_unreadable_files(tmp_path):
+    with pytest.raises(ChecklistError, match="bad.json"):
+        load_checklist(write(tmp_path / "bad.json", "{not json"))
+    with pytest.raises(ChecklistError):
+        load_checklist(tmp_path / "missing.json")
+
+def test_extra_directory_adds_and_replaces(tmp_path):
+    write(tmp_path / "custom.json", CUSTOM)
+    registry = load_registry([tmp_path])
+    assert list(registry) == ["CUSTOM"]
+    replaced = dict(CUSTOM, title="Replaced")
+    other = tmp_path / "other"
+    other.mkdir()
+    write(other / "custom.json", replaced)
+    assert load_registry([tmp_path, other])["CUSTOM"].title == "Replaced"
+
+def test_registry_rejects_clashing_item_ids(tmp_path):
+    write(tmp_path / "clash.json", {"id": "CLASH", "items": [["ST1", "Title", "Again."]]})
+    with pytest.raises(ChecklistError, match="'ST1' is used by both"):
+        load_registry([GUIDELINES_DIR, tmp_path])
+    with pytest.raises(ChecklistError, match="not found"):
+        load_registry([tmp_path / "missing"])
+
+def test_cli_lists_checklists(tmp_path, capsys):
+    write(tmp_path / "custom.json", CUSTOM)
+    assert main([str(tmp_path), "--design", "Cohort"]) == 0
+    out = capsys.readouterr().out
+    assert "CUSTOM" in out and "  3 items" in out
+    write(tmp_path / "broken.json", "[]")
+    assert main([str(tmp_path)]) == 1
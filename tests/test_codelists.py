@@ -0,0 +1,74 @@
+import pytest
+
+from trinetx_triage.codelists import VOCAB_ERRORS, Vocabulary, get_vocabulary, parse_entries, validate
+
+ICD = ["E11", "E11.0", "E11.9", "I10", "I20", "I20.9", "I21", "I21.0", "I21.9", "I25", "I25.9"]
+RXNORM = ["68", "680", "6800", "6809", "6810", "7000", "100", "69"]
+
+@pytest.fixture(scope="module")
+def vocab():
+    return Vocabulary.from_rows([("ICD10CM", c) for c in ICD] + [("RxNorm", c) for c in RXNORM])
+
+@pytest.mark.parametrize("entry", ["I25-I20", "ICD10CM:I21.9-I21.0", "RxNorm:300-100"])
+def test_reversed_range_is_malformed(vocab, entry):
+    report = validate([entry], vocab)
+    assert report.malformed == [entry]
+    assert report.resolved == 0
+    assert not report.all_resolved()
+    assert report.suggest_fidelity_score() == 0
+    assert report.expanded == 0
+
+def test_reversed_range_does_not_hide_other_entries(vocab):
+    report = validate(["I10", "I25-I20"], vocab)
+    assert report.resolved == 1 and report.expanded == 1
+    assert report.to_dict()["malformed"] == ["I25-I20"]
+
+def test_empty_range_and_wildcard(vocab):
+    report = validate(["ICD10CM:J00-J99", "ICD10CM:K*", "RxNorm:200-300"], vocab)
+    assert report.empty == ["ICD10CM:J00-J99", "ICD10CM:K*", "RxNorm:200-300"]
+    assert report.expanded == 0
+    assert not report.all_resolved()
+
+def test_range_includes_descendants(vocab):
+    report = validate(["I20-I25"], vocab, "ICD10CM")
+    assert report.all_resolved()
+    assert report.expanded == 7   # I20, I20.9, I21, I21.0, I21.9, I25, I25.9
+
+def test_numeric_range_compares_as_integers(vocab):
+    # As strings "680" < "6800" < "69" < "7000"; numerically 69 falls outside 100-6809
+    report = validate(["RxNorm:100-6809"], vocab)
+    assert report.expanded == 4   # 100, 680, 6800, 6809; not 68, 69, 6810, 7000
+    assert validate(["RxNorm:69-100"], vocab).expanded == 2
+
+@pytest.mark.parametrize("entries, expanded", [
+    (["RxNorm:6809", "RxNorm:68*"], 5),
+    (["RxNorm:6800-6810", "RxNorm:68*"], 5),
+    (["RxNorm:68*", "RxNorm:6809", "RxNorm:6809"], 5),
+    (["RxNorm:6?0*", "RxNorm:600-700"], 3),
+    (["E11*", "E11.9", "ICD10CM:E1?9"], 3),
+])
+def test_overlapping_entries_count_once(vocab, entries, expanded):
+    assert validate(entries, vocab).expanded == expanded
+
+def test_unknown_code_and_system(vocab):
+    report = validate(["E11.5", "SNOMED:123"], vocab)
+    assert report.unknown == ["E11.5"]
+    assert report.unknown_systems == ["SNOMED:123"]
+
+def test_parse_entries():
+    text = "E11.* diabetes\nI20 – I25, CPT:99201-99215; # comment\n\nRxNorm:6809"
+    assert parse_entries(text) == ["E11.*", "I20-I25", "CPT:99201-99215", "RxNorm:6809"]
+
+def test_vocabulary_file_with_header(tmp_path):
+    path = tmp_path / "CONCEPT.csv"
+    path.write_text("concept_id,concept_code,vocabulary_id\n1,E11.9,ICD10CM\n2,99213,CPT4\n", encoding="utf-8")
+    vocab = get_vocabulary(str(path))
+    assert sorted(vocab.systems) == ["CPT", "ICD10CM"]
+    assert validate(["E11.9", "CPT:99213"], vocab).all_resolved()
+
+@pytest.mark.parametrize("name, data", [("latin1.csv", b"code\n\xe9\xff11\n"), ("broken.csv.gz", b"\x1f\x8b\x08\x00trunc")])
+def test_unreadable_vocabulary_raises_a_vocab_error(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    with pytest.raises(VOCAB_ERRORS):
+        get_vocabulary(str(path))
@@ -0,0 +1,69 @@
+import pytest
+
+from conftest import make_states
+from trinetx_triage import core
+
+def passing_state(design="Cohort", rubric=2, strobe_mask=None):
+    return core.normalize_state({
+        "design": design,
+        "gate_a": {k: True for k, _ in core.GATE_A_ITEMS},
+        "gate_b_mask": core.gate_b_full_mask(design),
+        "rubric": {dom: rubric for dom, _ in core.TRIAGE_DOMAINS},
+        "strobe_mask": core.strobe_design_mask(design) if strobe_mask is None else strobe_mask,
+    })
+
+@pytest.mark.parametrize("rubric, pct, gates, track", [
+    (24, 100.0, False, "Refactor or Poster"),
+    (20, 80.0, True, "Full Manuscript"),
+    (20, 79.9, True, "Brief Report / Short Communication"),
+    (16, 70.0, True, "Brief Report / Short Communication"),
+    (16, 69.9, True, "Abstract / Poster"),
+    (12, 0.0, True, "Abstract / Poster"),
+    (11, 100.0, True, "Refactor or Educational Poster"),
+])
+def test_triage_decision_thresholds(rubric, pct, gates, track):
+    assert core.triage_decision(rubric, pct, gates)[0] == track
+
+def test_gates_need_gate_a_and_every_gate_b_item():
+    state = passing_state()
+    assert core.decision_gates_pass(state)
+    assert not core.decision_gates_pass(dict(state, gate_b_mask=state["gate_b_mask"] >> 1))
+    assert not core.decision_gates_pass(dict(state, gates_pass=False))
+
+def test_normalize_legacy_and_compact_payloads_agree():
+    legacy = {
+        "design": "Cohort",
+        "gate_b": {k: True for k in core.GATE_B_MIN["Cohort"]},
+        "strobe_checks": {"ST1": {"addressed": True, "where": "Title page"}, "ST2": {"addressed": False, "where": ""},
+                          "NOT-AN-ITEM": {"addressed": True, "where": "x"}},
+        "upgrades": [core.DEPTH_UPGRADES[0], "unknown"],
+    }
+    state = core.normalize_state(legacy)
+    assert state["gate_b_mask"] == core.gate_b_full_mask("Cohort")
+    assert state["strobe_mask"] == core.STROBE_BIT["ST1"]
+    assert state["strobe_where"] == {"ST1": "Title page"}
+    assert state["upgrades"] == [core.DEPTH_UPGRADES[0]]
+    compact = core.normalize_state({**state, "gate_b": None, "strobe_checks": None})
+    assert compact == state
+
+def test_strobe_score_counts_design_items_only():
+    state = passing_state()
+    yes, total, pct = core.strobe_score(state)
+    assert yes == total == len(core.strobe_items_for_design("Cohort")) and pct == 100.0
+    other_design = core.strobe_design_mask("Case–control") & ~core.strobe_design_mask("Cohort")
+    assert core.strobe_score(dict(state, strobe_mask=other_design)) == (0, total, 0.0)
+
+def test_score_state_headline():
+    result = core.score_state(passing_state(rubric=4))
+    assert result["gates_pass"] is True
+    assert result["rubric_total"] == 4 * len(core.TRIAGE_DOMAINS)
+    assert (result["decision"], result["rationale"]) == core.DECISIONS[1]
+    failed = core.score_state(passing_state(strobe_mask=0) | {"gates_pass": False})
+    assert failed["gates_pass"] is False and failed["decision"] == core.DECISIONS[0][0]
+
+def test_score_state_matches_its_parts(states):
+    for state in states:
+        result = core.score_state(state)
+        gates = core.decision_gates_pass(state)
+        assert result["gates_pass"] is gates
+        assert result["decision"] == core.triage_decision(state["rubric_total"], result["strobe_pct"], gates)[0]
@@ -0,0 +1,71 @@
+import io
+
+import pytest
+
+from trinetx_triage.exports import ExportSummary, scan_export, scan_exports
+
+BALANCE = """Before propensity score matching
+Characteristic Name,Cohort 1,Cohort 2,Std diff.
+Age,61.2,58.9,0.210
+Female,0.52,0.49,0.060
+
+After propensity score matching
+Characteristic Name,Cohort 1,Cohort 2,Std diff.
+Age,60.1,60.0,0.012
+Female,0.51,0.50,-0.031
+Diabetes,0.30,0.28,0.085
+"""
+
+def scan(text: str, name: str = "export.csv") -> ExportSummary:
+    return scan_export(io.BytesIO(text.encode("utf-8")), name)
+
+def test_balance_phases_from_section_titles():
+    summary = scan(BALANCE)
+    assert summary.balance["before"].covariates == 2
+    assert summary.balance["before"].imbalanced == 1
+    after = summary.balance["after"]
+    assert after.covariates == 3 and after.max_smd == pytest.approx(0.085)
+    assert summary.smd_gate_pass() is True
+    assert summary.suggest_confounding_score() == 2
+
+def test_phase_from_file_name_and_unlabelled_note():
+    table = "Covariate,Std diff.\nAge,0.15\n"
+    assert scan(table, "baseline_after_psm.csv").balance["after"].covariates == 1
+    summary = scan(table, "baseline.csv")
+    assert summary.balance["unlabelled"].covariates == 1
+    assert summary.smd_gate_pass() is None
+    assert summary.notes and "not labelled" in summary.notes[0]
+
+def test_imbalance_after_matching_fails_gate():
+    summary = scan("After matching\nVariable,SMD\nAge,0.15\nBMI,0.25\n")
+    assert summary.smd_gate_pass() is False
+    assert summary.suggest_confounding_score() == 0
+    assert [w["covariate"] for w in summary.balance["after"].to_dict()["worst"]] == ["BMI", "Age"]
+
+def test_measure_title_row_does_not_capture_the_next_table():
+    summary = scan("Risk Difference\nCohort,Patients,Outcome,Risk\n1,1000,50,0.05\n2,1000,40,0.04\n")
+    assert summary.outcomes == []
+
+@pytest.mark.parametrize("text", [
+    "Measure,Risk Difference,95% CI Lower,95% CI Upper\n,0.02,0.01,0.03\n",
+    "Risk Difference,95% CI Lower,95% CI Upper\n0.02,0.01,0.03\n",
+    "Risk Difference,0.02,0.01,0.03\n",
+])
+def test_measure_with_confidence_interval(text):
+    outcome, = scan(text).outcomes
+    assert (outcome["measure"], outcome["value"], outcome["ci_low"], outcome["ci_high"]) == ("Risk Difference", 0.02, 0.01, 0.03)
+
+@pytest.mark.parametrize("row", ["Risk Ratio,1.2,1.5,1.1", "Hazard Ratio,1.9,0.7,0.9"])
+def test_estimate_outside_its_interval_is_skipped(row):
+    summary = scan(row + "\nOdds Ratio,2.0\n")
+    assert [o["measure"] for o in summary.outcomes] == ["Odds Ratio"]
+    assert "not within" in summary.notes[0]
+
+def test_paths_and_streams_share_one_summary(tmp_path):
+    path = tmp_path / "outcomes.csv"
+    path.write_text("Hazard Ratio,0.8,0.7,0.9\n", encoding="utf-8")
+    stream = io.BytesIO(BALANCE.encode("utf-8"))
+    summary = scan_exports([str(path), (stream, "balance.csv")])
+    assert summary.files == ["outcomes.csv", "balance.csv"]
+    assert len(summary.outcomes) == 1 and summary.balance["after"].covariates == 3
+    assert not stream.closed   # the caller's upload stays usable
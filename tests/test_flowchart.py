@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from trinetx_triage import flowchart
+from trinetx_triage.core import GATE_A_ITEMS, gate_b_full_mask, normalize_state
+from trinetx_triage.flowchart import FlowchartCache, FlowKey, Rendered, flow_dot, flow_key
+
+def test_flow_key_stops_at_the_first_failed_gate():
+    all_a = {k: True for k, _ in GATE_A_ITEMS}
+    assert flow_key(normalize_state({"design": "Cohort"})).stop == "gate_a"
+    assert flow_key(normalize_state({"design": "Cohort", "gate_a": all_a})).stop == "gate_b"
+    passed = normalize_state({"design": "Cohort", "gate_a": all_a, "gate_b_mask": gate_b_full_mask("Cohort")})
+    assert flow_key(passed).stop == "decision"
+
+def test_flow_dot_marks_the_stop():
+    dot = flow_dot(FlowKey("Cohort", "gate_b", "Refactor or Poster"))
+    assert dot.startswith("digraph flow {") and dot.endswith("}")
+    assert 'gate_b -> decision [color="#b2182b" penwidth=2 label="stop"];' in dot
+    assert "Decision: Refactor or Poster" in dot
+
+@pytest.fixture
+def slow_render(monkeypatch):
+    calls = []
+
+    def render(source):
+        calls.append(source)
+        time.sleep(0.2)
+        return Rendered("<svg/>", None, 200.0)
+    monkeypatch.setattr(flowchart, "_render", render)
+    return calls
+
+def _get_all(cache, keys):
+    results = [None] * len(keys)
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, cache.get(keys[i]))) for i in range(len(keys))]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - t0
+
+def test_different_keys_render_concurrently(slow_render):
+    keys = [FlowKey("Cohort", stop, "Track") for stop in flowchart.STOPS]
+    _, elapsed = _get_all(FlowchartCache(), keys)
+    assert len(slow_render) == 3
+    assert elapsed < 0.5   # not 3 x 0.2 s behind one lock
+
+def test_same_key_renders_once(slow_render):
+    cache = FlowchartCache()
+    results, _ = _get_all(cache, [FlowKey("Cohort", "decision", "Track")] * 4)
+    assert len(slow_render) == 1
+    assert sorted(hit for _, hit in results) == [False, True, True, True]
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 3
+
+def test_failed_render_is_retried_after_the_ttl(monkeypatch):
+    outcomes = [Rendered(None, "ExecutableNotFound: no dot", 0.1), Rendered("<svg/>", None, 5.0)]
+    monkeypatch.setattr(flowchart, "_render", lambda source: outcomes.pop(0))
+    key = FlowKey("Cohort", "gate_a", "Track")
+    cache = FlowchartCache(error_ttl=60)
+    assert cache.get(key)[0].error and cache.get(key) == (Rendered(None, "ExecutableNotFound: no dot", 0.1), True)
+    assert cache.stats()["errors"] == 1
+    cache.error_ttl = 0
+    rendered, hit = cache.get(key)
+    assert rendered.svg == "<svg/>" and not hit
+    assert cache.stats()["errors"] == 0
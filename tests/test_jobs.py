@@ -0,0 +1,132 @@
+import json
+import threading
+import zipfile
+
+import pytest
+
+from conftest import make_states
+from trinetx_triage import jobs
+from trinetx_triage.batch import run_batch
+from trinetx_triage.jobs import CANCELLED, DONE, FAILED, FINISHED, JobScheduler, QueueFull
+from trinetx_triage.statefile import dump_state
+from trinetx_triage.store import get_store
+
+def wait(job, timeout=10.0):
+    job._future.result(timeout=timeout)
+    assert job.status in FINISHED
+    return job
+
+@pytest.fixture
+def scheduler():
+    sched = JobScheduler(max_workers=1, max_per_owner=2, max_pending=3)
+    yield sched
+    sched.shutdown(wait=True)
+
+def blocker(ctx, started, release):
+    started.set()
+    while not release.wait(0.01):
+        ctx.check()
+    return "released"
+
+def test_result_progress_and_failure(scheduler):
+    def work(ctx, n):
+        for _ in ctx.track(range(n), total=n, every=2):
+            pass
+        return n * 2
+
+    job = wait(scheduler.submit("a", "work", work, 5))
+    assert (job.status, job.result, job.done, job.fraction) == (DONE, 10, 5, 1.0)
+    assert scheduler.get(job.id) is job
+
+    def boom(ctx):
+        ctx.output_path(".txt")
+        raise ValueError("bad")
+
+    failed = wait(scheduler.submit("a", "boom", boom))
+    assert failed.status == FAILED and failed.error == "ValueError: bad"
+    assert failed.result is None and failed.files == []
+
+def test_owner_and_global_limits(scheduler):
+    started, release = threading.Event(), threading.Event()
+    scheduler.submit("a", "block", blocker, started, release)
+    scheduler.submit("a", "queued", blocker, threading.Event(), release)
+    with pytest.raises(QueueFull, match="per session"):
+        scheduler.submit("a", "third", blocker, threading.Event(), release)
+    scheduler.submit("b", "queued", blocker, threading.Event(), release)
+    with pytest.raises(QueueFull, match="queue is full"):
+        scheduler.submit("c", "fourth", blocker, threading.Event(), release)
+    release.set()
+
+def test_cancel_running_and_queued(scheduler):
+    started, release = threading.Event(), threading.Event()
+    running = scheduler.submit("a", "running", blocker, started, release)
+    queued = scheduler.submit("a", "queued", blocker, threading.Event(), release)
+    assert started.wait(5)
+    assert scheduler.cancel(running.id, owner="b") is False
+    assert scheduler.cancel(queued.id) is True
+    assert queued.status == CANCELLED
+    assert scheduler.cancel(running.id, owner="a") is True
+    assert wait(running).status == CANCELLED
+    assert scheduler.cancel(running.id) is False
+    assert scheduler.discard(running.id, owner="a") is True
+    assert scheduler.get(running.id) is None
+
+def test_cancel_and_get_race_with_discard(scheduler):
+    job = wait(scheduler.submit("a", "quick", lambda ctx: None))
+    errors = []
+
+    def poll():
+        try:
+            for _ in range(2000):
+                scheduler.get(job.id)
+                scheduler.cancel(job.id)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=poll) for _ in range(4)]
+    for t in threads:
+        t.start()
+    scheduler.discard(job.id)
+    for t in threads:
+        t.join()
+    assert errors == [] and scheduler.get(job.id) is None
+
+def test_retention_per_owner():
+    sched = JobScheduler(max_workers=1, retain=2)
+    try:
+        done = [wait(sched.submit("a", str(i), lambda ctx: None)) for i in range(4)]
+        assert [j.id for j in sched.jobs("a")] == [done[3].id, done[2].id]
+    finally:
+        sched.shutdown()
+
+def test_rescore_job_on_folder(tmp_path, scheduler, monkeypatch):
+    states = make_states(4)
+    folder = tmp_path / "states"
+    folder.mkdir()
+    for i, state in enumerate(states):
+        (folder / f"p{i}.json").write_bytes(dump_state(state))
+    (folder / "broken.json").write_text("{not json", encoding="utf-8")
+    assert jobs.count_tasks([str(folder)]) == 5
+    assert jobs.count_tasks([str(folder), "more.jsonl.gz"]) is None
+
+    # In-process workers keep the test independent of the spawn start method
+    monkeypatch.setattr(jobs, "run_batch", lambda sources, jobs, start_method: run_batch(sources, jobs=1))
+
+    job = wait(scheduler.submit("a", "rescore", jobs.rescore_job, [str(folder)]))
+    assert job.status == DONE, job.error
+    result = job.result
+    assert (result["projects"], result["errors"]) == (4, 1)
+    with open(result["path"], encoding="utf-8") as fh:
+        lines = [json.loads(line) for line in fh]
+    assert len(lines) == 5 and sum("error" in r for r in lines) == 1
+
+def test_export_job_writes_zip(tmp_path, scheduler):
+    db = str(tmp_path / "projects.db")
+    store = get_store(db)
+    for state in make_states(3):
+        store.save(state)
+    job = wait(scheduler.submit("a", "export", jobs.export_job, db, ["md"]))
+    assert job.status == DONE, job.error
+    assert job.result["projects"] == 3
+    with zipfile.ZipFile(job.result["path"]) as zf:
+        assert sum(name.endswith(".md") for name in zf.namelist()) >= 3
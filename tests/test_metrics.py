@@ -0,0 +1,36 @@
+import pytest
+
+from trinetx_triage.metrics import Metrics, quantiles
+
+def test_quantiles_nearest_rank():
+    assert quantiles(range(1, 101), (0.5, 0.9, 0.99)) == [51, 91, 100]
+    assert all(q != q for q in quantiles([], (0.5,)))   # NaN
+
+def test_observe_rejects_unknown_metric():
+    with pytest.raises(KeyError):
+        Metrics().observe("no_such_metric", 1.0)
+
+def test_prometheus_text():
+    m = Metrics()
+    for v in (0.1, 0.2, 0.3):
+        m.observe("section_seconds", v, 'gate "a"')
+    text = m.prometheus_text()
+    assert "# TYPE trinetx_triage_section_seconds summary" in text
+    assert 'trinetx_triage_section_seconds{section="gate \\"a\\"",quantile="0.5"} 0.2' in text
+    assert 'trinetx_triage_section_seconds_count{section="gate \\"a\\""} 3' in text
+
+def test_maybe_write_survives_a_bad_path_and_retries(tmp_path, caplog):
+    m = Metrics()
+    m.observe("widgets", 12)
+    path = tmp_path / "missing" / "metrics.prom"
+    assert m.maybe_write(str(path), interval=60) is False
+    assert m.maybe_write(str(path), interval=60) is False
+    assert len([r for r in caplog.records if "cannot write metrics file" in r.getMessage()]) == 1
+    # A failed write does not start the interval: the next call writes once the directory exists
+    path.parent.mkdir()
+    assert m.maybe_write(str(path), interval=60) is True
+    assert "trinetx_triage_widgets_count 1" in path.read_text()
+    assert m.maybe_write(str(path), interval=60) is False   # throttled after a success
+
+def test_maybe_write_without_path():
+    assert Metrics().maybe_write("") is False
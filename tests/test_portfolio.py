@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from conftest import make_states
+from trinetx_triage import core
+from trinetx_triage.portfolio import TRACKS, Aggregate, PortfolioIndex, contribution, main
+from trinetx_triage.statefile import dump_state
+from trinetx_triage.store import ProjectStore
+
+def fresh_summary(states):
+    agg = Aggregate()
+    for state in states:
+        agg.apply(contribution(state))
+    return agg.summary()
+
+def write(folder, name, state):
+    path = folder / name
+    path.write_bytes(dump_state(state, compress=name.endswith(".gz")))
+    return path
+
+@pytest.fixture
+def folder(tmp_path):
+    d = tmp_path / "states"
+    d.mkdir()
+    return d
+
+def test_aggregate_counts(states):
+    summary = fresh_summary(states)
+    assert summary["projects"] == len(states)
+    decisions = [core.score_state(s)["decision"] for s in states]
+    assert summary["tracks"] == {t: decisions.count(t) for t in TRACKS}
+    dom = core.TRIAGE_DOMAINS[0][0]
+    assert summary["domain_means"][dom] == pytest.approx(sum(s["rubric"][dom] for s in states) / len(states))
+    missed = summary["most_missed_strobe"]
+    assert [m["missed_pct"] for m in missed] == sorted((m["missed_pct"] for m in missed), reverse=True)
+    upgrades = {u["upgrade"]: u["selected"] for u in summary["most_selected_upgrades"]}
+    assert upgrades[core.DEPTH_UPGRADES[0]] == sum(core.DEPTH_UPGRADES[0] in s["upgrades"] for s in states)
+
+def test_apply_and_remove_cancel_out(states):
+    agg = Aggregate()
+    for state in states:
+        agg.apply(contribution(state))
+    for state in states:
+        agg.apply(contribution(state), sign=-1)
+    assert agg.summary() == Aggregate().summary()
+
+def test_refresh_only_decodes_changed_files(folder):
+    states = make_states(6)
+    for i, state in enumerate(states[:4]):
+        write(folder, f"p{i}.json", state)
+    index = PortfolioIndex(str(folder), min_interval=0)
+    assert index.refresh()["decoded"] == 4
+    stats = index.refresh()
+    assert (stats["scanned"], stats["reread"], stats["decoded"], stats["removed"]) == (4, 0, 0, 0)
+
+    # Touched but unchanged: re-read, not decoded
+    p0 = folder / "p0.json"
+    st = p0.stat()
+    os.utime(p0, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    stats = index.refresh()
+    assert (stats["reread"], stats["decoded"]) == (1, 0)
+
+    write(folder, "p1.json", states[4])
+    (folder / "p2.json").unlink()
+    write(folder, "p5.json.gz", states[5])
+    stats = index.refresh()
+    assert (stats["decoded"], stats["removed"]) == (2, 1)
+    assert index.summary() == {**fresh_summary([states[0], states[4], states[3], states[5]]), "unreadable": {}}
+
+def test_unreadable_files_are_reported_and_recover(folder):
+    state = make_states(1)[0]
+    bad = folder / "bad.json"
+    bad.write_text("{", encoding="utf-8")
+    index = PortfolioIndex(str(folder), min_interval=0)
+    index.refresh()
+    summary = index.summary()
+    assert summary["projects"] == 0 and list(summary["unreadable"]) == [f"file:{bad}"]
+    write(folder, "bad.json", state)
+    index.refresh()
+    assert index.summary() == {**fresh_summary([state]), "unreadable": {}}
+
+def test_store_rows_follow_saves_and_deletes(tmp_path, folder):
+    states = make_states(5)
+    store = ProjectStore(str(tmp_path / "p.db"))
+    ids = [store.save(s) for s in states[:3]]
+    write(folder, "extra.json", states[3])
+    index = PortfolioIndex(str(folder), store, min_interval=0)
+    assert index.refresh()["decoded"] == 4
+    store.save(states[4], project_id=ids[0])
+    store.delete(ids[1])
+    stats = index.refresh()
+    assert (stats["decoded"], stats["removed"]) == (1, 1)
+    assert index.summary() == {**fresh_summary([states[4], states[2], states[3]]), "unreadable": {}}
+    store.close()
+
+def test_refresh_is_throttled(folder):
+    index = PortfolioIndex(str(folder), min_interval=60)
+    first = index.refresh()
+    write(folder, "late.json", make_states(1)[0])
+    assert index.refresh() is first
+    assert index.refresh(force=True)["decoded"] == 1
+
+def test_cli(folder, capsys):
+    write(folder, "a.json", make_states(1)[0])
+    assert main([str(folder), "--top", "3"]) == 0
+    assert '"projects": 1' in capsys.readouterr().out
+    (folder / "b.json").write_text("{", encoding="utf-8")
+    assert main([str(folder)]) == 1
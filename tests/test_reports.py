@@ -0,0 +1,66 @@
+import io
+import zipfile
+
+import pytest
+
+from trinetx_triage.core import normalize_state
+from trinetx_triage.reports import STROBE_COLUMNS, Template, render_html, render_report, report_context, write_zip
+
+GENERATED = "2026-01-01T00:00:00"
+
+def test_template_keyword_call_ignores_unknown_fields():
+    t = Template("{name}: {pct:.1f}% {{literal}} {name!r}")
+    assert t.fields == ("name", "pct")
+    assert t(name="STROBE", pct=87.25, unused=object()) == "STROBE: 87.2% {literal} 'STROBE'"
+
+def test_template_positional_and_rows():
+    row = Template("| {item} | {addressed} | 100% |", ("item", "addressed"))
+    assert row("ST1", "Yes") == "| ST1 | Yes | 100% |"
+    assert row.rows([("ST1", "Yes"), ["ST2", "No"]]) == "| ST1 | Yes | 100% |\n| ST2 | No | 100% |"
+    spec = Template("{b:>3}|{a}", ("a", "b"))
+    assert spec.rows([(1, 2)]) == "  2|1"
+    assert spec("x", b=7) == "  7|x"
+
+@pytest.mark.parametrize("source, fields", [
+    ("{ctx.__class__}", None),
+    ("{rows[0]}", None),
+    ("{a} {b}", ("a",)),
+])
+def test_template_rejects_lookups_and_undeclared_fields(source, fields):
+    with pytest.raises(ValueError):
+        Template(source, fields)
+
+def _state(**changes):
+    state = normalize_state({"design": "Cohort", "title": "Statins & <falls>", "strobe_mask": 0b101})
+    state.update(changes)
+    return state
+
+def test_html_escapes_every_strobe_cell():
+    ctx = report_context(_state(), GENERATED)
+    ctx["strobe"] = [("<img src=x>", "<i>Methods</i>", "a < b", True, "<script>x</script>")]
+    page = render_html(ctx)
+    assert "<img" not in page and "<i>" not in page and "<script>" not in page
+    assert "<td>&lt;img src=x&gt;</td><td>&lt;i&gt;Methods&lt;/i&gt;</td><td>a &lt; b</td>" in page
+    assert "Statins &amp; &lt;falls&gt;" in page
+
+@pytest.mark.parametrize("fmt", ["md", "html", "csv", "xlsx"])
+def test_every_format_renders(fmt):
+    out = render_report(_state(), fmt, GENERATED)
+    assert out
+    if fmt == "xlsx":
+        with zipfile.ZipFile(io.BytesIO(out)) as zf:
+            assert "xl/worksheets/sheet1.xml" in zf.namelist()
+    elif fmt == "csv":
+        assert out.splitlines()[0] == ",".join(STROBE_COLUMNS)
+    else:
+        assert "Statins" in out
+
+def test_write_zip_member_names_are_unique():
+    titles = ["x", "x", "x-2", "index", "x"]
+    buf = io.BytesIO()
+    assert write_zip(((None, _state(title=t)) for t in titles), buf, ("md", "csv"), GENERATED) == len(titles)
+    with zipfile.ZipFile(buf) as zf:
+        names = zf.namelist()
+        index = zf.read("index.csv").decode("utf-8").splitlines()
+    assert len(names) == len(set(names)) == 2 * len(titles) + 1
+    assert [row.split(",")[0] for row in index[1:]] == ["x", "x-2", "x-2-2", "index-2", "x-3"]
@@ -0,0 +1,105 @@
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import make_states
+from trinetx_triage.core import score_state
+from trinetx_triage.service import MAX_BODY_BYTES, MicroBatcher, ReportCache, ScoringService, make_server
+from trinetx_triage.statefile import to_record
+
+@pytest.fixture
+def batcher():
+    b = MicroBatcher(max_batch=1024, max_wait=0.2)
+    yield b
+    b.close()
+
+def test_batcher_merges_concurrent_requests(batcher):
+    states = make_states(8)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda s: batcher.score([s]), states))
+    assert results == [[score_state(s)] for s in states]
+    assert batcher.stats()["batches"] < len(states)
+
+def test_bad_request_fails_alone(batcher):
+    good = make_states(6)
+    broken = {"design": "Cohort"}   # not a normalized state: score_state raises
+    requests = [[s] for s in good[:3]] + [[broken]] + [[s] for s in good[3:]]
+    with ThreadPoolExecutor(len(requests)) as pool:
+        futures = [pool.submit(batcher.score, r) for r in requests]
+        outcomes = [f.exception() or f.result() for f in futures]
+    assert isinstance(outcomes[3], KeyError)
+    assert [o for i, o in enumerate(outcomes) if i != 3] == [[score_state(s)] for s in good]
+
+def test_report_cache_is_an_lru():
+    cache = ReportCache(max_entries=2)
+    assert cache.get(("a", "md"), lambda: "A") == ("A", False)
+    assert cache.get(("b", "md"), lambda: "B") == ("B", False)
+    assert cache.get(("a", "md"), lambda: "x") == ("A", True)
+    cache.get(("c", "md"), lambda: "C")   # evicts b, the least recently used
+    assert cache.get(("b", "md"), lambda: "B2") == ("B2", False)
+    assert cache.stats()["hits"] == 1 and cache.stats()["entries"] == 2
+
+@pytest.fixture
+def server():
+    srv = make_server(port=0, service=ScoringService(max_wait=0.0005))
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield srv.server_address[:2]
+    srv.shutdown()
+    srv.server_close()
+    srv.service.close()
+
+def _post(conn, path, body, headers=None):
+    conn.request("POST", path, body=body, headers=headers or {"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    return resp, resp.read()
+
+def test_score_and_report_endpoints(server):
+    state = make_states(1)[0]
+    conn = http.client.HTTPConnection(*server)
+    resp, body = _post(conn, "/v1/score", json.dumps(to_record(state)))
+    assert resp.status == 200 and json.loads(body)["result"] == score_state(state)
+    records = [to_record(s) for s in make_states(3)]
+    resp, body = _post(conn, "/v1/score", json.dumps({"states": records}))
+    assert len(json.loads(body)["results"]) == 3
+    first, _ = _post(conn, "/v1/report?format=md", json.dumps(records[0]))
+    again, body = _post(conn, "/v1/report?format=md", json.dumps(records[0]))
+    assert (first.getheader("X-Cache"), again.getheader("X-Cache")) == ("miss", "hit")
+    assert first.getheader("ETag") == again.getheader("ETag")
+    assert body.startswith(b"# TriNetX Triage + STROBE Report")
+    conn.close()
+
+@pytest.mark.parametrize("payload, status", [
+    (b"{not json", 400),
+    (b'{"design": ["x"], "schema": 2}', 400),
+    (b'{"states": [1]}', 400),
+])
+def test_invalid_requests_keep_the_connection(server, payload, status):
+    conn = http.client.HTTPConnection(*server)
+    resp, body = _post(conn, "/v1/score", payload)
+    assert resp.status == status and "error" in json.loads(body)
+    resp, _ = _post(conn, "/v1/score", json.dumps(to_record(make_states(1)[0])))
+    assert resp.status == 200
+    conn.close()
+
+@pytest.mark.parametrize("length, status", [(str(MAX_BODY_BYTES + 1), 413), ("-3", 411)])
+def test_unread_body_closes_the_connection(server, length, status):
+    conn = http.client.HTTPConnection(*server)
+    conn.putrequest("POST", "/v1/score")
+    conn.putheader("Content-Length", length)
+    conn.endheaders()
+    resp = conn.getresponse()
+    resp.read()
+    assert resp.status == status and resp.getheader("Connection") == "close"
+    conn.close()
+
+def test_unknown_endpoint_and_health(server):
+    conn = http.client.HTTPConnection(*server)
+    conn.request("GET", "/healthz")
+    assert json.loads(conn.getresponse().read()) == {"status": "ok"}
+    resp, _ = _post(conn, "/v1/nope", b"{}")
+    assert resp.status == 404
+    conn.close()
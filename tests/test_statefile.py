@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from trinetx_triage.core import CHECKLIST_BIT, GATE_B_MIN, TRIAGE_DOMAINS
+from trinetx_triage.statefile import StateFileError, dump_state, iter_archive, load_state, write_archive
+
+# Malformed payloads must fail validation, not leak a TypeError/ValueError/AttributeError
+MALFORMED = {
+    "gate_a_nested_list": {"schema": 2, "gate_a": [[1]]},
+    "design_list": {"schema": 2, "design": ["x"]},
+    "gate_b_mask_text": {"design": "Cohort", "gate_b_mask": "abc"},
+    "strobe_check_text": {"design": "Cohort", "strobe_checks": {"ST1": "yes"}},
+}
+
+@pytest.mark.parametrize("payload", MALFORMED.values(), ids=MALFORMED.keys())
+def test_malformed_state_raises_statefileerror(payload):
+    with pytest.raises(StateFileError):
+        load_state(json.dumps(payload))
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(states, compress):
+    for state in states:
+        loaded = load_state(dump_state(state, compress=compress))
+        for key in ("design", "title", "gate_a", "gate_b_mask", "rubric", "strobe_where", "upgrades", "checklists"):
+            assert loaded[key] == state[key], key
+
+def test_schema_1_payload_migrates():
+    legacy = {"design": "Cohort", "title": "Old", "gate_b": {GATE_B_MIN["Cohort"][1]: True},
+              "strobe_checks": {"ST1": {"addressed": True, "where": "Methods"}}, "rubric": {TRIAGE_DOMAINS[0][0]: 2}}
+    state = load_state(json.dumps(legacy))
+    assert state["gate_b_mask"] == 0b10
+    assert state["strobe_mask"] == CHECKLIST_BIT["ST1"] and state["strobe_where"] == {"ST1": "Methods"}
+    assert state["rubric_total"] == 2
+
+@pytest.mark.parametrize("data", [b"\x1f\x8bnot gzip", b"{not json", b"[1, 2]", b'{"schema": 99}'])
+def test_unreadable_or_unsupported_data(data):
+    with pytest.raises(StateFileError):
+        load_state(data)
+
+def test_archive_round_trip(tmp_path, states):
+    path = tmp_path / "states.jsonl.gz"
+    assert write_archive(states, path) == len(states)
+    loaded = list(iter_archive(path))
+    assert [n for n, _ in loaded] == list(range(1, len(states) + 1))
+    assert [s["title"] for _, s in loaded] == [s["title"] for s in states]
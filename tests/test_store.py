@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from conftest import make_states
+from trinetx_triage import core, store as store_mod
+from trinetx_triage.statefile import dump_state, write_archive
+from trinetx_triage.store import ProjectStore, get_store
+
+@pytest.fixture
+def store(tmp_path):
+    s = ProjectStore(str(tmp_path / "projects.db"))
+    yield s
+    s.close()
+
+def test_save_get_and_headline_columns(store, states):
+    state = states[0]
+    pid = store.save(state)
+    assert store.get(pid) == state
+    row = store.query()[0]
+    scored = core.score_state(state)
+    assert (row["id"], row["title"], row["track"], row["rubric_total"]) == (pid, state["title"], scored["decision"], state["rubric_total"])
+    assert row["strobe_pct"] == pytest.approx(scored["strobe_pct"])
+    assert row["gate_a_pass"] == int(state["gates_pass"]) and row["gates_pass"] == int(scored["gates_pass"])
+    with pytest.raises(KeyError):
+        store.get(pid + 1)
+
+def test_save_by_id_keeps_source_and_upserts_by_source(store, states):
+    pid = store.save(states[0], source="a.json")
+    assert store.save(states[1], project_id=pid) == pid
+    assert store.query()[0]["source"] == "a.json" and store.get(pid) == states[1]
+    # The same source replaces its row; a stale id falls through to a new row
+    assert store.save(states[2], source="a.json") == pid
+    assert store.get(pid) == states[2]
+    other = store.save(states[3], project_id=999)
+    assert other != pid and store.count() == 2
+    store.delete(other)
+    assert store.count() == 1
+
+def test_filters_match_python(store, states):
+    store.import_states((f"s{i}", s) for i, s in enumerate(states))
+    scored = [core.score_state(s) for s in states]
+    cases = [
+        ({"design": "Cohort"}, lambda s, r: s["design"] == "Cohort"),
+        ({"min_rubric": 12, "max_rubric": 16}, lambda s, r: 12 <= s["rubric_total"] <= 16),
+        ({"min_strobe": 50.0}, lambda s, r: r["strobe_pct"] >= 50.0),
+        ({"gate_a_pass": False}, lambda s, r: not s["gates_pass"]),
+        ({"gates_pass": True, "design": "Cross-sectional"}, lambda s, r: r["gates_pass"] and s["design"] == "Cross-sectional"),
+        ({"track": scored[0]["decision"]}, lambda s, r: r["decision"] == scored[0]["decision"]),
+        ({"title_like": "ject 1"}, lambda s, r: "ject 1" in s["title"]),
+    ]
+    for filters, keep in cases:
+        expected = sorted(s["title"] for s, r in zip(states, scored) if keep(s, r))
+        assert sorted(row["title"] for row in store.query(**filters)) == expected, filters
+        assert store.count(**filters) == len(expected)
+        assert len(store.decision_inputs(**filters)) == len(expected)
+
+def test_query_order_limit_and_bad_order(store, states):
+    store.import_states((f"s{i}", s) for i, s in enumerate(states[:10]))
+    rows = store.query(order_by="rubric_total DESC", limit=3, offset=1)
+    totals = sorted((s["rubric_total"] for s in states[:10]), reverse=True)
+    assert [r["rubric_total"] for r in rows] == totals[1:4]
+    for bad in ("state", "id; DROP TABLE projects", "id SIDEWAYS"):
+        with pytest.raises(ValueError):
+            store.query(order_by=bad)
+
+def test_iter_states_batches_and_versions(store, states):
+    store.import_states(((f"s{i}", s) for i, s in enumerate(states)), batch_size=7)
+    streamed = list(store.iter_states(batch_size=8))
+    assert [s for _, s in streamed] == states
+    cohort = [s for _, s in store.iter_states(batch_size=3, design="Cohort")]
+    assert cohort == [s for s in states if s["design"] == "Cohort"]
+    ids = [pid for pid, _ in streamed]
+    assert set(store.versions()) == set(ids)
+    assert dict(store.raw_states(ids[:5], batch_size=2)).keys() == set(ids[:5])
+    before = store.revision()
+    store.save(states[0], project_id=ids[0])
+    assert store.revision() != before
+
+def test_import_files_collects_errors(tmp_path, store):
+    states = make_states(5)
+    folder = tmp_path / "states"
+    folder.mkdir()
+    for i, state in enumerate(states[:3]):
+        (folder / f"p{i}.json").write_bytes(dump_state(state))
+    (folder / "broken.json").write_text("{", encoding="utf-8")
+    archive = tmp_path / "more.jsonl.gz"
+    write_archive(states[3:], archive)
+    errors = []
+    assert store.import_files([str(folder), str(archive)], errors) == 5
+    assert len(errors) == 1 and "broken.json" in errors[0]
+    # Re-importing the same sources updates rows instead of duplicating them
+    assert store.import_files([str(folder), str(archive)]) == 5
+    assert store.count() == 5
+
+def test_get_store_is_shared_per_path(tmp_path):
+    path = str(tmp_path / "shared.db")
+    assert get_store(path) is get_store(path)
+
+def test_cli_import_and_query(tmp_path, capsys):
+    db = str(tmp_path / "cli.db")
+    archive = tmp_path / "states.jsonl.gz"
+    write_archive(make_states(6), archive)
+    assert store_mod.main(["--db", db, "import", str(archive)]) == 0
+    assert "imported 6" in capsys.readouterr().out
+    assert store_mod.main(["--db", db, "query", "--design", "Cohort", "--count"]) == 0
+    assert capsys.readouterr().out.strip() == "2"
+    assert store_mod.main(["--db", db, "query", "--limit", "2"]) == 0
+    assert len([json.loads(line) for line in capsys.readouterr().out.splitlines()]) == 2
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_states
+from trinetx_triage import core
+from trinetx_triage.vectorized import (
+    GATE_B_COLUMNS, RUBRIC_COLUMNS, TRACKS, decision_codes, frame_from_states, portfolio_columns,
+    score_frame, score_states,
+)
+
+SCORE_KEYS = ["rubric_total", "strobe_yes", "strobe_total", "strobe_pct", "gates_pass", "decision", "rationale"]
+
+def test_score_frame_matches_score_state(states):
+    scored = score_frame(frame_from_states(states))
+    for state, (_, row) in zip(states, scored.iterrows()):
+        expected = core.score_state(state)
+        assert {k: row[k] for k in SCORE_KEYS} == pytest.approx({k: expected[k] for k in SCORE_KEYS})
+
+def test_score_states_matches_score_state(states):
+    assert score_states(states) == [core.score_state(s) for s in states]
+    assert score_states([]) == []
+
+def test_frame_layout_marks_inapplicable_cells_nan():
+    df = frame_from_states(make_states(3))
+    assert list(df.columns) == ["title", "design"] + portfolio_columns()
+    cohort = df.iloc[0]
+    n_gate_b = len(core.GATE_B_MIN["Cohort"])
+    assert cohort[GATE_B_COLUMNS[:n_gate_b]].notna().all()
+    assert cohort[GATE_B_COLUMNS[n_gate_b:]].isna().all()
+    outside = [k for k, _, _ in core.STROBE_ITEMS if k not in {i.id for i in core.strobe_items_for_design("Cohort")}]
+    assert cohort[outside].isna().all()
+
+def test_missing_columns_count_as_unanswered():
+    df = pd.DataFrame({dom: [2] for dom in RUBRIC_COLUMNS}, index=["p"])
+    row = score_frame(df).loc["p"]
+    assert row["rubric_total"] == 2 * len(RUBRIC_COLUMNS)
+    assert (row["strobe_total"], row["strobe_pct"]) == (0, 0.0)
+    assert not row["gates_pass"] and row["decision"] == TRACKS[0]
+
+def test_decision_codes_follow_thresholds():
+    thresholds = core.Thresholds(manuscript_rubric=10, brief_rubric=8, abstract_rubric=6)
+    rubric = np.array([24, 10, 9, 6, 5, 24])
+    pct = np.array([100.0, 80.0, 75.0, 0.0, 100.0, 100.0])
+    gates = np.array([True, True, True, True, True, False])
+    codes = decision_codes(rubric, pct, gates, thresholds)
+    assert codes.tolist() == [1, 1, 2, 3, 4, 0]
+    assert codes.tolist() == [core.DECISIONS.index(core.triage_decision(r, p, g, thresholds))
+                              for r, p, g in zip(rubric, pct, gates)]
@@ -0,0 +1,79 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from trinetx_triage import core
+from trinetx_triage.store import ProjectStore
+from trinetx_triage.whatif import RUBRIC_MAX, PortfolioWhatIf, decision_table, lookup, main, region_map
+
+THRESHOLDS = [
+    core.DEFAULT_THRESHOLDS,
+    core.Thresholds(manuscript_rubric=18, brief_strobe=60.0),
+    core.Thresholds(manuscript_strobe=70.0, brief_strobe=70.0),   # one shared STROBE cut
+    core.Thresholds(manuscript_strobe=50.0, brief_strobe=90.0),   # cuts out of order
+]
+
+def reference(rubric, pct, gates, thresholds):
+    return [core.DECISIONS.index(core.triage_decision(int(r), float(p), bool(g), thresholds))
+            for r, p, g in zip(rubric, pct, gates)]
+
+def random_inputs(n, seed=0):
+    rng = random.Random(seed)
+    pcts = [0.0, 69.999, 70.0, 80.0, 100.0, 50.0, 90.0]
+    rubric = [rng.randint(0, RUBRIC_MAX) for _ in range(n)]
+    pct = [rng.choice(pcts) if i % 2 else rng.uniform(0, 100) for i in range(n)]
+    gates = [rng.random() < 0.8 for _ in range(n)]
+    return rubric, pct, gates
+
+@pytest.mark.parametrize("thresholds", THRESHOLDS)
+def test_lookup_matches_triage_decision(thresholds):
+    rubric, pct, gates = random_inputs(2000)
+    codes = lookup(decision_table(thresholds), rubric, pct, gates)
+    assert codes.tolist() == reference(rubric, pct, gates, thresholds)
+
+def test_tables_are_cached_and_read_only():
+    table = decision_table(THRESHOLDS[1])
+    assert decision_table(core.Thresholds(manuscript_rubric=18, brief_strobe=60.0)) is table
+    assert table.codes.shape == (2, RUBRIC_MAX + 1, len(table.cuts) + 1)
+    with pytest.raises(ValueError):
+        table.codes[0, 0, 0] = 1
+
+@pytest.mark.parametrize("step", [1.0, 2.5])
+def test_region_map_assumes_gates_pass(step):
+    grid, codes = region_map(core.DEFAULT_THRESHOLDS, step)
+    assert grid[0] == 0.0 and grid[-1] == 100.0 and len(grid) == round(100 / step) + 1
+    for r in range(RUBRIC_MAX + 1):
+        assert codes[r].tolist() == reference([r] * len(grid), grid, [True] * len(grid), core.DEFAULT_THRESHOLDS)
+
+def test_shift_transitions():
+    rubric, pct, gates = random_inputs(500, seed=1)
+    whatif = PortfolioWhatIf(np.array(rubric), np.array(pct), np.array(gates))
+    assert whatif.shift(core.DEFAULT_THRESHOLDS)["changed"] == 0
+    alt = THRESHOLDS[1]
+    result = whatif.shift(alt)
+    assert whatif.shift(alt) is result
+    before = reference(rubric, pct, gates, core.DEFAULT_THRESHOLDS)
+    after = reference(rubric, pct, gates, alt)
+    assert result["changed"] == sum(b != a for b, a in zip(before, after))
+    tracks = [t for t, _ in core.DECISIONS]
+    assert result["tracks"] == {t: after.count(i) for i, t in enumerate(tracks)}
+    assert result["baseline_tracks"] == {t: before.count(i) for i, t in enumerate(tracks)}
+    assert sum(map(sum, result["transitions"])) == result["projects"] == 500
+
+def test_from_store_and_cli(tmp_path, states, capsys):
+    db = str(tmp_path / "p.db")
+    store = ProjectStore(db)
+    assert len(PortfolioWhatIf.from_store(store)) == 0
+    store.import_states((f"s{i}", s) for i, s in enumerate(states))
+    whatif = PortfolioWhatIf.from_store(store, design="Cohort")
+    assert len(whatif) == sum(s["design"] == "Cohort" for s in states)
+    store.close()
+    assert main(["--db", db, "--manuscript-rubric", "18"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["projects"] == len(states) and out["thresholds"]["manuscript_rubric"] == 18
+    scored = [core.score_state(s) for s in states]
+    expected = [core.triage_decision(s["rubric_total"], r["strobe_pct"], r["gates_pass"], core.Thresholds(manuscript_rubric=18))[0]
+                for s, r in zip(states, scored)]
+    assert out["tracks"] == {t: expected.count(t) for t, _ in core.DECISIONS}
@@ -0,0 +1,38 @@
+"""Headless scoring core for the TriNetX Triage + STROBE Planner."""
+
+__version__ = "0.1.0"
+
+from .checklists import REGISTRY, Checklist, ChecklistError, ChecklistItem, load_registry
+from .core import (
+    CHECKLIST_BIT,
+    DECISIONS,
+    DEFAULT_THRESHOLDS,
+    DEPTH_UPGRADES,
+    DESIGNS,
+    EXTRA_CHECKLISTS,
+    GATE_A_ITEMS,
+    GATE_B_MIN,
+    PROJECT_FIELDS,
+    STROBE_BASE,
+    STROBE_BIT,
+    STROBE_CASECONTROL,
+    STROBE_COHORT,
+    STROBE_CROSSSECTIONAL,
+    STROBE_ITEMS,
+    STROBE_TEXT,
+    TRIAGE_DOMAINS,
+    Thresholds,
+    checklist_items,
+    checklist_score,
+    compute_strobe_score,
+    decision_gates_pass,
+    make_report_md,
+    normalize_state,
+    pack_gate_b,
+    pack_strobe_checks,
+    score_state,
+    strobe_items_for_design,
+    strobe_score,
+    triage_decision,
+)
+from .statefile import SCHEMA_VERSION, StateFileError, dump_state, iter_archive, load_state, write_archive
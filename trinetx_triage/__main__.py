@@ -0,0 +1,6 @@
+# python -m trinetx_triage [streamlit run options]: start the planner
+import sys
+
+from .launcher import main
+
+sys.exit(main())
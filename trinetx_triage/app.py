@@ -0,0 +1,966 @@
+# TriNetX Study Triage + STROBE Planner
+# Author: ChatGPT (for Daniel Novak)
+# Run with: trinetx-triage  (or: streamlit run trinetx_triage/app.py)
+#
+# Startup is kept light: pandas and numpy are imported inside the views that
+# build frames (STROBE table, export summaries, dashboard, what-if, admin panel)
+# and graphviz only when a flow diagram is first rendered, so a new server
+# process renders the planner without loading any of them.
+# python -m benchmarks.bench_startup checks the budget.
+
+import functools
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+RUN_T0 = time.perf_counter()
+
+# ----------------------------
+# App Config & Styling
+# ----------------------------
+st.set_page_config(
+    page_title="TriNetX Triage + STROBE Planner",
+    page_icon="🧭",
+    layout="wide",
+)
+
+HIDE_FOOTER = """
+<style>
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+header {visibility: visible;}
+/* Make form sections stand out */
+.block-container {padding-top: 1rem; padding-bottom: 4rem;}
+section[data-testid="stSidebar"] {width: 360px !important;}
+</style>
+"""
+st.markdown(HIDE_FOOTER, unsafe_allow_html=True)
+
+# ----------------------------
+# Utility Data & Helper Functions
+# ----------------------------
+# Rubric, checklists, gates and scoring live in the Streamlit-free core so the
+# batch CLI (python -m trinetx_triage.batch) scores exactly what this page shows.
+from trinetx_triage.checklists import REGISTRY
+from trinetx_triage.core import (
+    CHECKLIST_BIT,
+    DEFAULT_THRESHOLDS,
+    DEPTH_UPGRADES,
+    DESIGNS,
+    EXTRA_CHECKLISTS,
+    GATE_A_ITEMS,
+    GATE_B_MIN,
+    PROJECT_FIELDS,
+    TRIAGE_DOMAINS,
+    Thresholds,
+    checklist_items,
+    checklist_score,
+    decision_gates_pass,
+    strobe_score,
+    triage_decision,
+)
+from trinetx_triage.codelists import (
+    CODES_GATE_A,
+    COHORT_FIDELITY_DOMAIN,
+    DEFAULT_VOCAB,
+    VOCAB_ERRORS,
+    get_vocabulary,
+    parse_entries,
+    validate,
+)
+from trinetx_triage.exports import BALANCE_GATE_B, CONFOUNDING_DOMAIN, SMD_THRESHOLD, scan_exports
+from trinetx_triage.flowchart import flow_dot, flow_key, flowchart_cache
+from trinetx_triage.jobs import DONE, FAILED, FINISHED, JobScheduler, QueueFull, export_job, rescore_job
+from trinetx_triage.metrics import METRICS, METRICS_FILE, deep_sizeof
+from trinetx_triage.portfolio import TRACKS, PortfolioIndex
+from trinetx_triage.reports import REPORT_FORMATS, render_report
+from trinetx_triage.statefile import StateFileError, dump_state, load_state
+from trinetx_triage.store import DEFAULT_DB, get_store
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from trinetx_triage.whatif import PortfolioWhatIf
+
+# Every call of these helpers is timed into the process-wide metrics
+strobe_score = METRICS.timed("helper_seconds", "strobe_score")(strobe_score)
+triage_decision = METRICS.timed("helper_seconds", "triage_decision")(triage_decision)
+render_report = METRICS.timed("helper_seconds", "render_report")(render_report)
+
+def init_state():
+    if "initialized" in st.session_state:
+        return
+    st.session_state.initialized = True
+    st.session_state.gate_a = {k: False for k, _ in GATE_A_ITEMS}
+    st.session_state.gate_b_mask = 0
+    st.session_state.rubric = {dom: 0 for dom, _ in TRIAGE_DOMAINS}
+    st.session_state.rubric_total = 0
+    # Checklist text stays in the shared registry; a session only keeps flags + sparse notes
+    st.session_state.strobe_mask = 0
+    st.session_state.strobe_where = {}
+    st.session_state.checklists = []
+    st.session_state.design = "Cohort"
+    st.session_state.title = ""
+    st.session_state.question = ""
+    st.session_state.index = ""
+    st.session_state.period = ""
+    st.session_state.sites = ""
+    st.session_state.irb = ""
+    st.session_state.upgrades = []
+    st.session_state.gates_pass = False
+
+def reset_widget_state():
+    # Drop widget values so every widget re-seeds from the (just loaded) state
+    ss = st.session_state
+    keys = [f"gatea_{k}" for k, _ in GATE_A_ITEMS] + [f"rubric_{dom}" for dom, _ in TRIAGE_DOMAINS]
+    keys += [f"gateb_{i}" for i in range(max(len(v) for v in GATE_B_MIN.values()))]
+    keys += [f"up_{i}" for i in range(len(DEPTH_UPGRADES))]
+    keys += [f"strobe_{k}" for k in CHECKLIST_BIT] + [f"strobe_where_{k}" for k in CHECKLIST_BIT]
+    keys.append("checklist_extra")
+    for k in keys:
+        ss.pop(k, None)
+    ss.strobe_editor_rev = ss.get("strobe_editor_rev", 0) + 1
+
+def apply_loaded_state(loaded: dict, project_id=None):
+    reset_widget_state()
+    for k, v in loaded.items():
+        st.session_state[k] = v
+    st.session_state.project_id = project_id
+
+def save_to_store():
+    st.session_state.project_id = get_store().save(st.session_state, project_id=st.session_state.get("project_id"))
+    st.session_state.store_notice = f"Saved as project #{st.session_state.project_id}."
+
+def load_from_store(project_id: int):
+    apply_loaded_state(get_store().get(project_id), project_id)
+    st.session_state.store_notice = f"Loaded project #{project_id}."
+
+def project_state(ss=None) -> dict:
+    # Plain-data copy of the answers, safe to hand to code running outside this session.
+    # Off the script thread pass the run's session state (get_script_run_ctx().session_state)
+    ss = st.session_state if ss is None else ss
+    state = {f: ss[f] for f in PROJECT_FIELDS}
+    state.update(
+        gate_a=dict(ss.gate_a), gate_b_mask=ss.gate_b_mask, gates_pass=ss.gates_pass,
+        strobe_mask=ss.strobe_mask, strobe_where=dict(ss.strobe_where), checklists=list(ss.checklists),
+        rubric=dict(ss.rubric), rubric_total=ss.rubric_total, upgrades=list(ss.upgrades),
+    )
+    return state
+
+init_state()
+
+# ----------------------------
+# Sidebar
+# ----------------------------
+with st.sidebar:
+    st.title("🧭 Triage + STROBE")
+    st.markdown("Use this tool to **triage** TriNetX study ideas and ensure **STROBE**-aligned reporting for observational designs.")
+    st.divider()
+    st.subheader("Design")
+    design = st.selectbox("Select study design", ["Cohort", "Case–control", "Cross-sectional"], index=["Cohort","Case–control","Cross-sectional"].index(st.session_state.design))
+    if design != st.session_state.design:
+        st.session_state.design = design
+        reset_widget_state()
+        st.session_state.gate_b_mask = 0
+        # Checklist answers are kept: items shared by both designs stay answered, and
+        # another design's addenda only count again if the design is switched back
+
+    st.caption("Note: For quasi-experimental designs (DiD/ITS), use this as a baseline STROBE checklist and add design-specific reporting (parallel trends, event study, autocorrelation, robust SEs).")
+
+    st.divider()
+    st.subheader("Save/Load")
+    col_save, col_load = st.columns(2)
+    with col_save:
+        # Only the answers + schema version are saved, never widget keys or checklist text.
+        # Built on click from the live session state: the sidebar is not redrawn by
+        # fragment reruns, so bytes captured here would miss answers changed since
+        compress = st.checkbox("gzip", value=False, help="Smaller .json.gz file; loads the same way.")
+        live_state = get_script_run_ctx().session_state
+        st.download_button(
+            "💾 Download JSON state",
+            lambda compress=compress: dump_state(project_state(live_state), compress=compress),
+            file_name="triage_strobe_state.json.gz" if compress else "triage_strobe_state.json",
+            mime="application/gzip" if compress else "application/json",
+            on_click="ignore",
+        )
+    with col_load:
+        uploaded = st.file_uploader("Load saved JSON", type=["json", "gz"], accept_multiple_files=False, label_visibility="collapsed")
+        # The uploader keeps its file across reruns; apply each upload once
+        if uploaded and st.session_state.get("loaded_file_id") != uploaded.file_id:
+            st.session_state.loaded_file_id = uploaded.file_id
+            try:
+                loaded = load_state(uploaded.getvalue())
+            except StateFileError as exc:
+                st.error(f"Could not load state: {exc}")
+            else:
+                apply_loaded_state(loaded)
+                st.success("State loaded.")
+
+    # Alternative to the JSON round trip: a shared local SQLite store (env TRINETX_TRIAGE_DB)
+    st.divider()
+    st.subheader("Project store")
+    store = get_store()
+    project_id = st.session_state.get("project_id")
+    st.button("🗄️ Save to store" if project_id is None else f"🗄️ Update project #{project_id}", on_click=save_to_store)
+    recent = store.query(limit=200, order_by="updated_at DESC")
+    if recent:
+        labels = {r["id"]: f"#{r['id']} {r['title'] or '(untitled)'} — {r['design']}, {r['track']}" for r in recent}
+        pick = st.selectbox("Open saved project", list(labels), format_func=labels.get)
+        st.button("📂 Load from store", on_click=load_from_store, args=(pick,))
+    if "store_notice" in st.session_state:
+        st.success(st.session_state.pop("store_notice"))
+
+# ----------------------------
+# Fragment-scoped reruns
+# ----------------------------
+# Each numbered section is an independent fragment: touching a widget reruns
+# only its own section. Inputs that feed the decision (Gate A/B, STROBE
+# "Addressed", rubric) additionally rerun the "decision" fragment via a keyed
+# st.rerun from their on_change callback, so section 7's summary stays current
+# without re-executing the rest of the page. Every answer also reruns "export",
+# whose download buttons render from a snapshot taken when it last ran.
+
+# Target for one interaction (callback -> section + summary fragments redrawn),
+# measured server-side and shown under the decision summary.
+RERUN_TARGET_MS = 50
+
+def set_bit(mask: int, bit: int, on: bool) -> int:
+    return mask | bit if on else mask & ~bit
+
+def set_where(key: str, text: str):
+    # Sparse: only non-empty notes are kept
+    if text:
+        st.session_state.strobe_where[key] = text
+    else:
+        st.session_state.strobe_where.pop(key, None)
+
+def sync_decision_inputs():
+    ss = st.session_state
+    for key, _ in GATE_A_ITEMS:
+        if f"gatea_{key}" in ss:
+            ss.gate_a[key] = ss[f"gatea_{key}"]
+    ss.gates_pass = all(ss.gate_a.values())
+    for i, _ in enumerate(GATE_B_MIN.get(ss.design, [])):
+        if f"gateb_{i}" in ss:
+            ss.gate_b_mask = set_bit(ss.gate_b_mask, 1 << i, ss[f"gateb_{i}"])
+    if ss.get("strobe_view", "Expanders") == "Expanders":
+        for _, (key, _, _) in checklist_items(ss.design, tuple(ss.checklists)):
+            if f"strobe_{key}" in ss:
+                ss.strobe_mask = set_bit(ss.strobe_mask, CHECKLIST_BIT[key], ss[f"strobe_{key}"])
+    for dom, _ in TRIAGE_DOMAINS:
+        if f"rubric_{dom}" in ss:
+            ss.rubric[dom] = ss[f"rubric_{dom}"]
+    ss.rubric_total = sum(ss.rubric.values())
+
+def timed_section(name: str):
+    # Applied under @st.fragment, so a fragment-only rerun of the section is timed too
+    def wrap(fn):
+        @functools.wraps(fn)
+        def run():
+            with METRICS.timer("section_seconds", name) as t:
+                fn()
+            st.session_state.setdefault("perf_sections", {})[name] = t["seconds"] * 1000.0
+            METRICS.maybe_write(METRICS_FILE)
+        return run
+    return wrap
+
+def on_project_input(section: str):
+    # Free text and upgrades: no effect on the decision, only on the export snapshot
+    st.rerun([section, "export"])
+
+def on_decision_input(section: str):
+    st.session_state.interaction_t0 = time.perf_counter()
+    sync_decision_inputs()
+    st.rerun([section, "decision", "export"])
+
+# ----------------------------
+# Main Layout
+# ----------------------------
+
+# Project Basics
+@st.fragment(key="basics")
+@timed_section("basics")
+def section_basics():
+    st.header("1) Project Basics")
+    c1, c2, c3 = st.columns([1.2,1,1])
+    with c1:
+        st.session_state.title = st.text_input("Study title", value=st.session_state.title, on_change=on_project_input, args=("basics",))
+        st.session_state.question = st.text_area("Clinical question (PECO/PECOS)", value=st.session_state.question, height=100, help="Population, Exposure/Comparator, Outcome(s), Setting/Time-window.", on_change=on_project_input, args=("basics",))
+    with c2:
+        st.session_state.index = st.text_input("Index date definition", value=st.session_state.index, help="e.g., first prescription date; diagnosis date with washout; etc.", on_change=on_project_input, args=("basics",))
+        st.session_state.period = st.text_input("Data period", value=st.session_state.period, help="e.g., 2010–2024; pre/post ICD-10; pandemic era considered.", on_change=on_project_input, args=("basics",))
+    with c3:
+        st.session_state.sites = st.text_input("Sites / HCOs", value=st.session_state.sites, help="List included networks/sites or note if multi-network TriNetX.", on_change=on_project_input, args=("basics",))
+        st.session_state.irb = st.text_input("IRB / Privacy", value=st.session_state.irb, help="e.g., IRB exemption, data use agreements, privacy notes.", on_change=on_project_input, args=("basics",))
+
+# Gate A
+@st.fragment(key="gate_a")
+@timed_section("gate_a")
+def section_gate_a():
+    st.header("2) Gate A — Fatal Flaw Screen")
+    gate_cols = st.columns(2)
+    gate_a_flags = []
+    for i, (key, label) in enumerate(GATE_A_ITEMS):
+        with gate_cols[i % 2]:
+            st.session_state.gate_a[key] = st.checkbox(label, value=st.session_state.gate_a[key], key=f"gatea_{key}", on_change=on_decision_input, args=("gate_a",))
+            gate_a_flags.append(st.session_state.gate_a[key])
+
+    gates_pass = all(gate_a_flags)
+    st.session_state.gates_pass = gates_pass
+    st.info("All Gate A items must be checked to proceed to **Manuscript/Brief** tracks.", icon="ℹ️") if gates_pass else st.warning("One or more Gate A items are unchecked. Consider **refactor/downgrade** until resolved.", icon="⚠️")
+    code_list_check()
+
+def on_validate_codes():
+    # Validate against the shared index; the result sets Gate A Q2 and suggests a domain C score
+    ss = st.session_state
+    text = ss.get("codelist_text", "")
+    upload = ss.get("codelist_file")
+    if upload is not None:
+        text += "\n" + upload.getvalue().decode("utf-8-sig", errors="replace")
+    try:
+        vocab = get_vocabulary(ss.get("vocab_path", "").strip())
+    except VOCAB_ERRORS as exc:
+        ss.codelist_report = {"error": f"Could not read the reference vocabulary: {exc}"}
+        st.rerun(["gate_a"])
+    system = ss.get("codelist_system", "Any")
+    report = validate(parse_entries(text), vocab, None if system == "Any" else system)
+    ss.codelist_report = report.to_dict()
+    if report.entries:
+        ss.gate_a[CODES_GATE_A] = report.all_resolved()
+        ss.gates_pass = all(ss.gate_a.values())
+        ss.pop(f"gatea_{CODES_GATE_A}", None)
+    ss.interaction_t0 = time.perf_counter()
+    st.rerun(["gate_a", "decision", "export"])
+
+def code_list_check():
+    with st.expander("🔎 Validate code lists (ICD-10-CM / CPT / RxNorm)", expanded="codelist_report" in st.session_state):
+        vocab_path = st.text_input("Reference vocabulary file", value=DEFAULT_VOCAB, key="vocab_path", help="CSV/TSV with a code (or concept_code) column and optional system (or vocabulary_id) column, e.g. an OMOP CONCEPT.csv; or one code per line. Loaded once per server process.")
+        systems = ["Any"]
+        if vocab_path.strip():
+            try:
+                systems += sorted(get_vocabulary(vocab_path.strip()).systems)
+            except VOCAB_ERRORS as exc:
+                st.warning(f"Could not read the reference vocabulary: {exc}")
+                return
+        c1, c2 = st.columns([3, 1])
+        with c1:
+            st.text_area("Code list", key="codelist_text", height=120, placeholder="E11.*\nI20-I25\nICD10CM:E11.9\nCPT:99201-99215\nRxNorm:6809", help="One code, wildcard (*, %, ?) or range per line or comma-separated; prefix SYSTEM: to pin a coding system.")
+        with c2:
+            st.selectbox("Unprefixed codes are", systems, key="codelist_system")
+            st.file_uploader("…or upload a list", type=["txt", "csv"], key="codelist_file")
+        st.button("Validate codes", on_click=on_validate_codes, disabled=not vocab_path.strip())
+
+        report = st.session_state.get("codelist_report")
+        if not report:
+            return
+        if "error" in report:
+            st.error(report["error"])
+            return
+        msg = f"{report['resolved']}/{report['entries']} entries resolve; the list covers {report['expanded']} distinct codes."
+        (st.success if report["all_resolved"] else st.warning)(msg)
+        for label, key in (("Unknown codes", "unknown"), ("Wildcards/ranges matching nothing", "empty"),
+                           ("Reversed ranges (low end above high end)", "malformed"), ("Unknown coding systems", "unknown_systems")):
+            if report.get(key):
+                st.write(f"**{label}:** " + ", ".join(f"`{c}`" for c in report[key]))
+        if report["entries"]:
+            st.caption(f"Gate A {CODES_GATE_A} was {'checked' if report['all_resolved'] else 'unchecked'} from this check; index date and washout still need to be defined.")
+        score = report["suggested_fidelity_score"]
+        if score is not None:
+            current = st.session_state.rubric.get(COHORT_FIDELITY_DOMAIN, 0)
+            st.write(f"Suggested **{COHORT_FIDELITY_DOMAIN}** score: **{score}** (current: {current})")
+            if score != current:
+                st.button(f"Use suggested score ({score})", on_click=apply_suggested_score, args=(COHORT_FIDELITY_DOMAIN, score, "gate_a"), key="use_fidelity_score")
+
+# Gate B
+@st.fragment(key="gate_b")
+@timed_section("gate_b")
+def section_gate_b():
+    st.header(f"3) Gate B — Minimum Standards ({st.session_state.design})")
+    mask = st.session_state.gate_b_mask
+    for i, item in enumerate(GATE_B_MIN.get(st.session_state.design, [])):
+        checked = st.checkbox(item, value=bool(mask >> i & 1), key=f"gateb_{i}", on_change=on_decision_input, args=("gate_b",))
+        mask = set_bit(mask, 1 << i, checked)
+    st.session_state.gate_b_mask = mask
+    trinetx_exports()
+
+def on_exports_upload():
+    # Parse once per upload change; pre-fill the balance item of Gate B for this design
+    ss = st.session_state
+    files = ss.get("tnx_exports") or []
+    if not files:
+        ss.pop("tnx_summary", None)
+        st.rerun(["gate_b"])
+    summary = scan_exports((f, f.name) for f in files)
+    ss.tnx_summary = summary.to_dict()
+    passed = summary.smd_gate_pass()
+    i = BALANCE_GATE_B.get(ss.design)
+    if passed is not None and i is not None:
+        ss.gate_b_mask = set_bit(ss.gate_b_mask, 1 << i, passed)
+        ss.pop(f"gateb_{i}", None)
+    ss.interaction_t0 = time.perf_counter()
+    st.rerun(["gate_b", "decision", "export"])
+
+def apply_suggested_score(domain: str, score: int, section: str):
+    ss = st.session_state
+    ss.rubric[domain] = score
+    ss.rubric_total = sum(ss.rubric.values())
+    ss.pop(f"rubric_{domain}", None)
+    ss.interaction_t0 = time.perf_counter()
+    st.rerun([section, "rubric", "decision", "export"])
+
+def trinetx_exports():
+    with st.expander("📥 Check balance from TriNetX exports", expanded="tnx_summary" in st.session_state):
+        st.file_uploader(
+            "Propensity matching, baseline characteristics and outcome CSV exports",
+            type=["csv"], accept_multiple_files=True, key="tnx_exports", on_change=on_exports_upload,
+            help=f"Files are streamed row by row; any table with a Std diff. column is checked against SMD < {SMD_THRESHOLD:.2f}.",
+        )
+        summary = st.session_state.get("tnx_summary")
+        if not summary:
+            return
+        import pandas as pd
+        after = summary["balance"].get("after")
+        before = summary["balance"].get("before")
+        if after:
+            msg = f"After matching: {after['covariates']} covariates, max |SMD| {after['max_smd']:.3f}, {after['imbalanced']} ≥ {SMD_THRESHOLD:.2f}."
+            (st.success if summary["smd_gate_pass"] else st.warning)(msg)
+            if after["worst"]:
+                st.dataframe(pd.DataFrame(after["worst"]), hide_index=True)
+            i = BALANCE_GATE_B.get(st.session_state.design)
+            if i is not None:
+                st.caption(f"Gate B item {i + 1} was {'checked' if summary['smd_gate_pass'] else 'unchecked'} from this table.")
+        if before:
+            st.caption(f"Before matching: {before['covariates']} covariates, max |SMD| {before['max_smd']:.3f}, {before['imbalanced']} ≥ {SMD_THRESHOLD:.2f}.")
+        if summary["outcomes"]:
+            st.dataframe(pd.DataFrame(summary["outcomes"]), hide_index=True)
+        for note in summary["notes"]:
+            st.info(note)
+        score = summary["suggested_confounding_score"]
+        if score is not None:
+            current = st.session_state.rubric.get(CONFOUNDING_DOMAIN, 0)
+            st.write(f"Suggested **{CONFOUNDING_DOMAIN}** score: **{score}** (current: {current})")
+            if score != current:
+                st.button(f"Use suggested score ({score})", on_click=apply_suggested_score, args=(CONFOUNDING_DOMAIN, score, "gate_b"))
+
+# STROBE Checklist
+STROBE_VIEWS = ["Expanders", "Table"]
+STROBE_COLUMNS = ["Item", "Section", "Prompt", "Addressed", "Where/How"]
+
+def clear_strobe_widgets():
+    # The per-item widgets re-seed from strobe_mask/strobe_where the next time they render
+    for key in CHECKLIST_BIT:
+        st.session_state.pop(f"strobe_{key}", None)
+        st.session_state.pop(f"strobe_where_{key}", None)
+
+def on_strobe_view_change():
+    clear_strobe_widgets()
+    st.rerun(["strobe"])
+
+def on_strobe_table_edit(editor_key: str, items: list):
+    # One batch: apply every edited cell to the session flags, then rerun the checklist + summary
+    edits = st.session_state[editor_key].get("edited_rows", {})
+    for i, change in edits.items():
+        key = items[int(i)][0]
+        if "Addressed" in change:
+            st.session_state.strobe_mask = set_bit(st.session_state.strobe_mask, CHECKLIST_BIT[key], bool(change["Addressed"]))
+        if "Where/How" in change:
+            set_where(key, change["Where/How"] or "")
+    st.session_state.interaction_t0 = time.perf_counter()
+    st.rerun(["strobe", "decision", "export"])
+
+def on_strobe_bulk(section: str, addressed: bool, items: list):
+    for key, sec, _ in items:
+        if section == "All" or sec == section:
+            st.session_state.strobe_mask = set_bit(st.session_state.strobe_mask, CHECKLIST_BIT[key], addressed)
+    st.session_state.strobe_editor_rev = st.session_state.get("strobe_editor_rev", 0) + 1
+    st.session_state.interaction_t0 = time.perf_counter()
+    st.rerun(["strobe", "decision", "export"])
+
+def on_checklists_change():
+    st.session_state.checklists = [c for c in EXTRA_CHECKLISTS if c in st.session_state.checklist_extra]
+    st.session_state.strobe_editor_rev = st.session_state.get("strobe_editor_rev", 0) + 1
+    st.rerun(["strobe", "export"])
+
+def checklist_label(cid: str, section: str) -> str:
+    return section if cid == "STROBE" else f"{REGISTRY[cid].name} · {section}"
+
+def strobe_table(strobe_items: list, strobe_df_rows: list):
+    import pandas as pd
+    sections = ["All"] + list(dict.fromkeys(sec for _, sec, _ in strobe_items))
+    b1, b2, b3 = st.columns([1.2, 1, 1])
+    with b1:
+        bulk_section = st.selectbox("Bulk action on section", sections, key="strobe_bulk_section")
+    with b2:
+        st.button(f"Mark all {bulk_section} addressed", on_click=on_strobe_bulk, args=(bulk_section, True, strobe_items))
+    with b3:
+        st.button(f"Clear all {bulk_section}", on_click=on_strobe_bulk, args=(bulk_section, False, strobe_items))
+
+    editor_key = f"strobe_editor_{st.session_state.get('strobe_editor_rev', 0)}"
+    st.data_editor(
+        pd.DataFrame(strobe_df_rows, columns=STROBE_COLUMNS),
+        key=editor_key,
+        hide_index=True,
+        disabled=["Item", "Section", "Prompt"],
+        column_config={
+            "Prompt": st.column_config.TextColumn(width="large"),
+            "Addressed": st.column_config.CheckboxColumn(),
+            "Where/How": st.column_config.TextColumn("Where/How (section/figure/table)"),
+        },
+        on_change=on_strobe_table_edit,
+        args=(editor_key, strobe_items),
+    )
+
+@st.fragment(key="strobe")
+@timed_section("strobe")
+def section_strobe():
+    st.header("4) STROBE Checklist (reporting)")
+    st.caption("Mark each item as addressed and note where/how it will appear in the manuscript (section/figure/table).")
+    st.multiselect(
+        "Additional reporting guidelines", EXTRA_CHECKLISTS, default=st.session_state.checklists,
+        key="checklist_extra", format_func=lambda cid: REGISTRY[cid].name, on_change=on_checklists_change,
+        help=" · ".join(f"{REGISTRY[cid].name}: {REGISTRY[cid].title}" for cid in EXTRA_CHECKLISTS),
+    )
+    # Items come precomputed per (design, guidelines) from the shared registry
+    strobe_items = [(key, checklist_label(cid, sec), prompt)
+                    for cid, (key, sec, prompt) in checklist_items(st.session_state.design, tuple(st.session_state.checklists))]
+
+    view = st.radio("Checklist view", STROBE_VIEWS, horizontal=True, key="strobe_view", on_change=on_strobe_view_change, help="Table renders the whole checklist as one editable grid (one widget instead of two per item).")
+
+    # Render checklist
+    strobe_df_rows = []
+    for key, sec, prompt in strobe_items:
+        bit = CHECKLIST_BIT[key]
+        addressed = bool(st.session_state.strobe_mask & bit)
+        where = st.session_state.strobe_where.get(key, "")
+        if view == "Expanders":
+            with st.expander(f"{key} • {sec}: {prompt}", expanded=False):
+                addressed = st.checkbox("Addressed", value=addressed, key=f"strobe_{key}", on_change=on_decision_input, args=("strobe",))
+                where = st.text_input("Where/How (section/figure/table)", value=where, key=f"strobe_where_{key}", on_change=on_project_input, args=("strobe",))
+            st.session_state.strobe_mask = set_bit(st.session_state.strobe_mask, bit, addressed)
+            set_where(key, where)
+        strobe_df_rows.append({"Item": key, "Section": sec, "Prompt": prompt, "Addressed": addressed, "Where/How": where})
+
+    if view == "Table":
+        strobe_table(strobe_items, strobe_df_rows)
+
+    strobe_yes, strobe_total, strobe_pct = strobe_score(st.session_state)
+    st.progress(strobe_pct/100.0, text=f"STROBE completeness: {strobe_yes}/{strobe_total} ({strobe_pct:.1f}%)")
+    for cid in st.session_state.checklists:
+        yes, total, pct = checklist_score(st.session_state, cid)
+        st.progress(pct/100.0, text=f"{REGISTRY[cid].name} completeness: {yes}/{total} ({pct:.1f}%)")
+
+# Rubric
+@st.fragment(key="rubric")
+@timed_section("rubric")
+def section_rubric():
+    st.header("5) Scored Triage Rubric (0–2 each; max 24)")
+    rubric_cols = st.columns(3)
+    total_score = 0
+    for i, (dom, desc) in enumerate(TRIAGE_DOMAINS):
+        with rubric_cols[i % 3]:
+            score = st.radio(
+                dom,
+                options=[0,1,2],
+                index=[0,1,2].index(st.session_state.rubric.get(dom, 0)),
+                horizontal=True,
+                help=desc,
+                key=f"rubric_{dom}",
+                on_change=on_decision_input,
+                args=("rubric",),
+            )
+            st.session_state.rubric[dom] = score
+            total_score += score
+    st.session_state.rubric_total = total_score
+    st.metric("Rubric Total", f"{total_score} / 24")
+
+# Depth Upgrades
+@st.fragment(key="upgrades")
+@timed_section("upgrades")
+def section_upgrades():
+    st.header("6) Depth-Upgrade Menu")
+    sel = []
+    upgrade_cols = st.columns(2)
+    for i, u in enumerate(DEPTH_UPGRADES):
+        with upgrade_cols[i % 2]:
+            checked = st.checkbox(u, value=(u in st.session_state.get("upgrades", [])), key=f"up_{i}", on_change=on_project_input, args=("upgrades",))
+            if checked:
+                sel.append(u)
+    st.session_state.upgrades = sel
+
+# Decision
+@st.fragment(key="decision")
+@timed_section("decision")
+def section_decision():
+    st.header("7) Decision & Rationale")
+    _, _, strobe_pct = strobe_score(st.session_state)
+    dec, why = triage_decision(st.session_state.rubric_total, strobe_pct, decision_gates_pass(st.session_state))
+    cA, cB, cC = st.columns([1.3,1,1])
+    with cA:
+        st.subheader(f"Recommended Track: {dec}")
+        st.write(why)
+    with cB:
+        st.metric("STROBE %", f"{strobe_pct:.1f}%")
+    with cC:
+        st.metric("Rubric", f"{st.session_state.rubric_total}/24")
+
+    t0 = st.session_state.pop("interaction_t0", None)
+    if t0 is not None:
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        st.caption(f"Last interaction rerun: {elapsed_ms:.0f} ms (target ≤ {RERUN_TARGET_MS} ms)")
+    flowchart()
+
+def flowchart():
+    # Per-project flow; the SVG for each (design, stop stage, track) is rendered once per process
+    key = flow_key(st.session_state)
+    rendered, hit = flowchart_cache.get(key)
+    st.subheader("Flow")
+    if rendered.svg is not None:
+        st.image(rendered.svg)
+    else:
+        # No server-side Graphviz: let the browser lay out the same DOT source
+        st.graphviz_chart(flow_dot(key))
+    stats = flowchart_cache.stats()
+    source = "served from cache" if hit else f"rendered in {rendered.render_ms:.0f} ms"
+    st.caption(f"Flow diagram: {source}; {stats['entries']} cached, hit rate {stats['hit_rate']:.0%}.")
+    if rendered.error:
+        st.caption(f"⚠️ Server-side SVG render unavailable, drawn in the browser instead ({rendered.error}).")
+
+# Export
+@st.fragment(key="export")
+@timed_section("export")
+def section_export():
+    st.header("8) Export Report")
+    # Nothing is rendered until a button is clicked; the callable runs off the script
+    # thread, so it gets a plain copy of the answers rather than st.session_state
+    state = project_state()
+    cols = st.columns(len(REPORT_FORMATS))
+    for col, (fmt, spec) in zip(cols, REPORT_FORMATS.items()):
+        with col:
+            st.download_button(
+                f"⬇️ {spec.label}",
+                lambda fmt=fmt: render_report(state, fmt),
+                file_name=f"triage_strobe_report.{spec.extension}",
+                mime=spec.mime,
+                on_click="ignore",
+                key=f"export_{fmt}",
+            )
+
+def planner_page():
+    st.title("TriNetX Study Triage + STROBE Planner")
+    st.write("Raise the analytic bar and route projects to **Manuscript / Brief / Abstract / Poster** with transparent criteria and STROBE-aligned reporting.")
+    section_basics()
+    st.divider()
+    section_gate_a()
+    st.divider()
+    section_gate_b()
+    st.divider()
+    section_strobe()
+    st.divider()
+    section_rubric()
+    st.divider()
+    section_upgrades()
+    st.divider()
+    section_decision()
+    st.divider()
+    section_export()
+
+# ----------------------------
+# Portfolio dashboard
+# ----------------------------
+# One PortfolioIndex per (states folder, store) is shared by every session; each
+# rerun only re-reads saved states whose mtime/hash changed since the last scan.
+# Eviction: at most PORTFOLIO_CACHE_ENTRIES indexes are kept (least recently used
+# goes first) and each is rebuilt from scratch once it is PORTFOLIO_CACHE_TTL old.
+PORTFOLIO_CACHE_ENTRIES = 4
+PORTFOLIO_CACHE_TTL = 6 * 3600
+
+@st.cache_resource(max_entries=PORTFOLIO_CACHE_ENTRIES, ttl=PORTFOLIO_CACHE_TTL, show_spinner=False)
+def portfolio_index(states_dir: str, db_path: str) -> PortfolioIndex:
+    return PortfolioIndex(states_dir or None, get_store(db_path) if db_path else None)
+
+def dashboard_page():
+    st.title("Portfolio Dashboard")
+    st.write("Aggregates every saved triage: recommended tracks, rubric scores, STROBE gaps and Depth Upgrades.")
+    c1, c2, c3 = st.columns([3, 1, 1], vertical_alignment="bottom")
+    with c1:
+        states_dir = st.text_input("Folder of saved states (*.json, *.json.gz)", value=os.environ.get("TRINETX_TRIAGE_STATES_DIR", ""), key="portfolio_dir")
+    with c2:
+        use_store = st.checkbox("Include project store", value=True, key="portfolio_store")
+    with c3:
+        force = st.button("🔄 Rescan now")
+    index = portfolio_index(states_dir.strip(), DEFAULT_DB if use_store else "")
+    stats = index.refresh(force=force)
+    summary = index.summary()
+    st.caption(f"Scanned {stats['scanned']} saved state(s) in {stats['ms']:.0f} ms; re-read {stats['reread']}, re-scored {stats['decoded']}, removed {stats['removed']}.")
+    if summary["unreadable"]:
+        with st.expander(f"⚠️ {len(summary['unreadable'])} state(s) could not be read"):
+            for key, msg in summary["unreadable"].items():
+                st.write(f"`{key}`: {msg}")
+    background_jobs(states_dir.strip(), use_store)
+    if not summary["projects"]:
+        st.info("No saved projects found yet.")
+        return
+
+    import pandas as pd
+    st.metric("Projects", summary["projects"])
+    left, right = st.columns(2)
+    with left:
+        st.subheader("Recommended tracks")
+        st.bar_chart(pd.Series(summary["tracks"], name="projects"), horizontal=True)
+    with right:
+        st.subheader("Mean score per domain (0–2)")
+        st.bar_chart(pd.Series(summary["domain_means"], name="mean score"), horizontal=True)
+    left, right = st.columns(2)
+    with left:
+        st.subheader("Most-missed STROBE items")
+        st.dataframe(
+            pd.DataFrame(summary["most_missed_strobe"], columns=["item", "section", "prompt", "missed", "applicable", "missed_pct"]),
+            hide_index=True,
+            column_config={"missed_pct": st.column_config.ProgressColumn("Missed", format="%.0f%%", min_value=0, max_value=100)},
+        )
+    with right:
+        st.subheader("Most-selected Depth Upgrades")
+        st.dataframe(
+            pd.DataFrame(summary["most_selected_upgrades"], columns=["upgrade", "selected", "selected_pct"]),
+            hide_index=True,
+            column_config={"selected_pct": st.column_config.ProgressColumn("Share", format="%.0f%%", min_value=0, max_value=100)},
+        )
+
+# ----------------------------
+# Background jobs
+# ----------------------------
+# Exports and re-scoring run on one JobScheduler per server process
+# (trinetx_triage.jobs). The page only submits; the session's jobs are drawn by a
+# fragment that reruns itself every JOB_POLL_SECONDS while any of them is active,
+# so the rest of the page keeps responding. Each session may have at most
+# JOB_PER_SESSION jobs queued or running.
+JOB_WORKERS = 2
+JOB_PER_SESSION = 2
+JOB_POLL_SECONDS = 1.0
+
+@st.cache_resource(show_spinner=False)
+def job_scheduler() -> JobScheduler:
+    return JobScheduler(max_workers=JOB_WORKERS, max_per_owner=JOB_PER_SESSION)
+
+def job_owner() -> str:
+    if "job_owner" not in st.session_state:
+        st.session_state.job_owner = uuid.uuid4().hex
+    return st.session_state.job_owner
+
+def submit_job(label: str, fn, *args):
+    try:
+        job_scheduler().submit(job_owner(), label, fn, *args)
+    except QueueFull as exc:
+        st.session_state.job_notice = str(exc)
+
+def cancel_job(job_id: int):
+    job_scheduler().cancel(job_id, job_owner())
+
+def discard_job(job_id: int):
+    job_scheduler().discard(job_id, job_owner())
+
+def background_jobs(states_dir: str, use_store: bool):
+    st.subheader("Background jobs")
+    left, right = st.columns(2)
+    with left:
+        rescore_form(states_dir)
+    with right:
+        if use_store:
+            export_form()
+    if "job_notice" in st.session_state:
+        st.warning(st.session_state.pop("job_notice"))
+    jobs = job_scheduler().jobs(job_owner())
+    if jobs:
+        active = any(j.status not in FINISHED for j in jobs)
+        st.fragment(run_every=JOB_POLL_SECONDS if active else None)(job_list)(active)
+
+def rescore_form(states_dir: str):
+    with st.expander("🔁 Re-score saved states"):
+        text = st.text_area("Folders, state files or .jsonl(.gz) archives, one per line", value=states_dir, key="rescore_sources")
+        paths = [p.strip() for p in text.splitlines() if p.strip()]
+        missing = [p for p in paths if not os.path.exists(p)]
+        if missing:
+            st.warning("Not found: " + ", ".join(f"`{p}`" for p in missing))
+        st.button("▶️ Start re-scoring", on_click=submit_job, args=(f"Re-score {', '.join(paths)}", rescore_job, paths),
+                  disabled=not paths or bool(missing), key="rescore_start")
+
+def export_form():
+    with st.expander("📦 Export reports for stored projects (ZIP)"):
+        c1, c2 = st.columns(2)
+        with c1:
+            design = st.selectbox("Design", ["All"] + DESIGNS, key="bulk_design")
+        with c2:
+            track = st.selectbox("Recommended track", ["All"] + TRACKS, key="bulk_track")
+        formats = st.multiselect("Formats", list(REPORT_FORMATS), default=["md"], format_func=lambda f: REPORT_FORMATS[f].label, key="bulk_formats")
+        filters = {k: v for k, v in (("design", design), ("track", track)) if v != "All"}
+        n = get_store().count(**filters)
+        st.caption(f"{n} project(s) match; one report per project and format, plus an index.csv.")
+        st.button("▶️ Start export", on_click=submit_job, args=(f"Export {n} project(s) as {', '.join(formats)}", export_job, DEFAULT_DB, formats, filters),
+                  disabled=not (n and formats), key="bulk_zip")
+
+def job_list(polling: bool):
+    jobs = job_scheduler().jobs(job_owner())
+    for job in jobs:
+        with st.container(border=True):
+            c1, c2 = st.columns([6, 1], vertical_alignment="center")
+            with c1:
+                fraction = job.fraction
+                done = f"{job.done}/{job.total if job.total is not None else '…'}"
+                st.progress(fraction or 0.0, text=f"**{job.label}** — {job.status}, {done} {job.message} ({job.elapsed:.0f} s)")
+            with c2:
+                if job.status in FINISHED:
+                    st.button("Dismiss", key=f"job_discard_{job.id}", on_click=discard_job, args=(job.id,))
+                else:
+                    st.button("Cancel", key=f"job_cancel_{job.id}", on_click=cancel_job, args=(job.id,))
+            if job.status == FAILED:
+                st.error(job.error)
+            elif job.status == DONE:
+                result = job.result
+                st.caption(", ".join(f"{k}: {v}" for k, v in result.items() if k != "path"))
+                path = result["path"]
+                st.download_button("⬇️ Download result", lambda path=path: Path(path).read_bytes(),
+                                   file_name=f"triage_job{job.id}{os.path.splitext(path)[1]}", on_click="ignore", key=f"job_download_{job.id}")
+    if polling and all(j.status in FINISHED for j in jobs):
+        # Last job finished: one full rerun redraws the page without the polling timer
+        st.rerun()
+
+# ----------------------------
+# Threshold what-if
+# ----------------------------
+# Region maps and portfolio shifts come from a per-threshold-set decision table
+# (trinetx_triage.whatif), cached in-process; the portfolio's decision inputs are
+# read once per store revision.
+TRACK_COLORS = ["#9e9e9e", "#1b7837", "#5aae61", "#f1a340", "#d6604d"]
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def region_frame(thresholds: Thresholds) -> "pd.DataFrame":
+    import numpy as np
+    import pandas as pd
+    from trinetx_triage.whatif import region_map
+    grid, codes = region_map(thresholds)
+    rubric, pct = np.meshgrid(np.arange(codes.shape[0]), grid, indexing="ij")
+    return pd.DataFrame({"rubric_total": rubric.ravel(), "strobe_pct": pct.ravel(),
+                         "track": np.asarray(TRACKS, dtype=object)[codes.ravel()]})
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def portfolio_whatif(db_path: str, revision: tuple) -> "PortfolioWhatIf":
+    from trinetx_triage.whatif import PortfolioWhatIf
+    return PortfolioWhatIf.from_store(get_store(db_path))
+
+def region_chart(df: "pd.DataFrame", title: str) -> dict:
+    return {
+        "title": title,
+        "mark": {"type": "rect"},
+        "encoding": {
+            "x": {"field": "strobe_pct", "type": "quantitative", "bin": {"step": 1}, "title": "STROBE %"},
+            "y": {"field": "rubric_total", "type": "ordinal", "sort": "descending", "title": "Rubric total"},
+            "color": {"field": "track", "type": "nominal", "title": "Track (gates passed)",
+                      "scale": {"domain": TRACKS, "range": TRACK_COLORS}},
+            "tooltip": [{"field": "rubric_total"}, {"field": "strobe_pct"}, {"field": "track"}],
+        },
+    }
+
+def whatif_page():
+    import pandas as pd
+    from trinetx_triage.whatif import RUBRIC_MAX, region_map
+    st.title("Threshold What-if")
+    st.write("Try alternative decision cut-offs and see which rubric × STROBE cells, and which stored projects, change track.")
+    cols = st.columns(len(Thresholds._fields))
+    labels = {
+        "manuscript_rubric": "Manuscript: rubric ≥", "manuscript_strobe": "Manuscript: STROBE % ≥",
+        "brief_rubric": "Brief report: rubric ≥", "brief_strobe": "Brief report: STROBE % ≥",
+        "abstract_rubric": "Abstract/Poster: rubric ≥",
+    }
+    values = {}
+    for col, (field, default) in zip(cols, DEFAULT_THRESHOLDS._asdict().items()):
+        with col:
+            if isinstance(default, int):
+                values[field] = st.number_input(labels[field], 0, RUBRIC_MAX, default, key=f"whatif_{field}")
+            else:
+                values[field] = st.number_input(labels[field], 0.0, 100.0, default, step=5.0, key=f"whatif_{field}")
+    proposed = Thresholds(**values)
+
+    _, base_codes = region_map(DEFAULT_THRESHOLDS)
+    _, new_codes = region_map(proposed)
+    changed_cells = int((base_codes != new_codes).sum())
+    st.metric("Grid cells changing track", f"{changed_cells} / {new_codes.size}", help="Rubric totals 0–24 × STROBE 0–100% in 1% steps, gates passed.")
+    left, right = st.columns(2)
+    with left:
+        st.vega_lite_chart(region_frame(DEFAULT_THRESHOLDS), region_chart(region_frame(DEFAULT_THRESHOLDS), "Current thresholds"))
+    with right:
+        st.vega_lite_chart(region_frame(proposed), region_chart(region_frame(proposed), "Proposed thresholds"))
+
+    st.subheader("Stored portfolio")
+    store = get_store()
+    pf = portfolio_whatif(DEFAULT_DB, store.revision())
+    if not len(pf):
+        st.info("No projects in the store yet.")
+        return
+    shift = pf.shift(proposed)
+    st.metric("Projects changing track", f"{shift['changed']} / {shift['projects']}")
+    st.dataframe(
+        pd.DataFrame(shift["transitions"], index=pd.Index(TRACKS, name="current → proposed"), columns=TRACKS),
+    )
+
+page = st.navigation([
+    st.Page(planner_page, title="Triage + STROBE Planner", icon="🧭", default=True),
+    st.Page(dashboard_page, title="Portfolio Dashboard", icon="📊", url_path="dashboard"),
+    st.Page(whatif_page, title="Threshold What-if", icon="🎚️", url_path="what-if"),
+])
+page.run()
+
+# ----------------------------
+# Instrumentation
+# ----------------------------
+# Only reached by full runs (fragment reruns time themselves in timed_section).
+# Admin panel: set TRINETX_TRIAGE_ADMIN=1 on the server. The numbers are process-wide
+# (every session's timings), so visitors cannot turn it on from the URL.
+ADMIN = os.environ.get("TRINETX_TRIAGE_ADMIN") == "1"
+
+def widget_count():
+    # Widgets registered by this run; Streamlit has no public API for it
+    ctx = get_script_run_ctx()
+    try:
+        return len(ctx.shared.widget_ids_this_run.snapshot())
+    except AttributeError:
+        return None
+
+def record_run():
+    ss = st.session_state
+    run = {"page": page.title, "ms": (time.perf_counter() - RUN_T0) * 1000.0,
+           "state_bytes": deep_sizeof({k: ss[k] for k in ss.keys() if k != "perf_run"}), "widgets": widget_count()}
+    METRICS.observe("rerun_seconds", run["ms"] / 1000.0, page.title)
+    METRICS.observe("session_state_bytes", run["state_bytes"])
+    if run["widgets"] is not None:
+        METRICS.observe("widgets", run["widgets"])
+    ss.perf_run = run
+    METRICS.maybe_write(METRICS_FILE)
+
+def admin_panel():
+    ss = st.session_state
+    run = ss.perf_run
+    import numpy as np
+    import pandas as pd
+    with st.sidebar.expander("⏱️ Performance (admin)", expanded=False):
+        st.caption(f"This session, last full run of {run['page']}: {run['ms']:.0f} ms; "
+                   f"session_state ≈ {run['state_bytes'] / 1024:.1f} KiB; widgets: {run['widgets'] if run['widgets'] is not None else 'n/a'}.")
+        if ss.get("perf_sections"):
+            st.dataframe(pd.DataFrame({"ms": ss.perf_sections}).round(1), width="stretch")
+        rows = METRICS.snapshot()
+        if rows:
+            df = pd.DataFrame(rows)
+            seconds = df["metric"].str.endswith("_seconds")
+            quantile_cols = [c for c in df.columns if c.startswith("p")] + ["max"]
+            df.loc[seconds, quantile_cols] = df.loc[seconds, quantile_cols] * 1000.0
+            df["unit"] = np.where(seconds, "ms", "")
+            st.caption(f"All sessions, last {METRICS.window} observations per row:")
+            st.dataframe(df[["metric", "label", "unit", "count", *quantile_cols]].round(2), hide_index=True, width="stretch")
+        st.caption(f"Prometheus textfile: {METRICS_FILE}" if METRICS_FILE else "Set TRINETX_TRIAGE_METRICS_FILE to export these as a Prometheus textfile.")
+
+record_run()
+if ADMIN:
+    admin_panel()
@@ -0,0 +1,149 @@
+# Headless batch triage
+# Scores saved "triage_strobe_state.json" payloads (any schema, optionally gzipped)
+# across a process pool and streams one JSON line per project as soon as it is scored.
+#
+# Usage:
+#   python -m trinetx_triage.batch states/ more.jsonl -j 8 --reports-dir reports/
+#   cat states.jsonl | python -m trinetx_triage.batch -
+
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .core import make_report_md, score_state
+from .statefile import load_state
+
+# (label, path, text): directory entries carry a path and are read in the worker,
+# JSONL lines carry their text so the parent never re-reads big files
+Task = Tuple[str, Optional[str], Optional[str]]
+
+_reports_dir: Optional[str] = None
+
+# ----------------------------
+# Task discovery
+# ----------------------------
+
+def iter_tasks(sources: Iterable[str]) -> Iterator[Task]:
+    for src in sources:
+        if src == "-":
+            yield from _jsonl_tasks("stdin", sys.stdin)
+            continue
+        path = Path(src)
+        if path.is_dir():
+            for p in sorted([*path.rglob("*.json"), *path.rglob("*.json.gz")]):
+                yield (str(p), str(p), None)
+        elif path.name.endswith((".jsonl", ".jsonl.gz")):
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt", encoding="utf-8") as fh:
+                yield from _jsonl_tasks(str(path), fh)
+        else:
+            yield (str(path), str(path), None)
+
+def count_tasks(sources: Iterable[str]) -> Optional[int]:
+    """Number of tasks from directory listings alone; None when a source is stdin or a
+    JSONL archive, whose lines cannot be counted without reading them."""
+    n = 0
+    for src in sources:
+        path = Path(src)
+        if src == "-" or path.name.endswith((".jsonl", ".jsonl.gz")):
+            return None
+        if path.is_dir():
+            n += sum(1 for _ in path.rglob("*.json")) + sum(1 for _ in path.rglob("*.json.gz"))
+        else:
+            n += 1
+    return n
+
+def _jsonl_tasks(label: str, lines: Iterable[str]) -> Iterator[Task]:
+    for lineno, line in enumerate(lines, start=1):
+        if line.strip():
+            yield (f"{label}:{lineno}", None, line)
+
+# ----------------------------
+# Worker
+# ----------------------------
+
+def _init_worker(reports_dir: Optional[str]) -> None:
+    global _reports_dir
+    _reports_dir = reports_dir
+
+def _report_stem(label: str) -> str:
+    stem = label.lstrip(os.sep).replace(os.sep, "_").replace(":", "-")
+    for suffix in (".json.gz", ".json"):
+        if stem.endswith(suffix):
+            return stem[:-len(suffix)]
+    return stem
+
+def _report_names(tasks: Iterable[Task]) -> Iterator[Tuple[Task, Optional[str]]]:
+    """Pair each task with its report file name, unique within the run."""
+    used = set()
+    for task in tasks:
+        stem = base = _report_stem(task[0])
+        # "a/b_c.json" and "a_b/c.json" flatten alike: the later one gets -2, -3, ...
+        k = 2
+        while stem in used:
+            stem = f"{base}-{k}"
+            k += 1
+        used.add(stem)
+        yield task, f"{stem}.md"
+
+def score_task(item: Tuple[Task, Optional[str]]) -> Dict:
+    (label, path, text), report = item
+    try:
+        state = load_state(Path(path).read_bytes() if text is None else text)
+        result = {"source": label, **score_state(state)}
+        if _reports_dir and report:
+            out = Path(_reports_dir) / report
+            out.write_text(make_report_md(state), encoding="utf-8")
+            result["report"] = str(out)
+        return result
+    except Exception as exc:  # one bad file must not stop the batch
+        return {"source": label, "error": f"{type(exc).__name__}: {exc}"}
+
+# ----------------------------
+# Driver
+# ----------------------------
+
+def run_batch(sources: Iterable[str], jobs: Optional[int] = None, reports_dir: Optional[str] = None,
+              chunksize: int = 64, start_method: Optional[str] = None) -> Iterator[Dict]:
+    """Yield one result dict per project, in completion order.
+
+    ``start_method`` picks the multiprocessing start method; callers running in a
+    thread of a larger process (the job scheduler) pass "spawn", since forking a
+    multi-threaded process can copy locks held by other threads.
+    """
+    if reports_dir:
+        Path(reports_dir).mkdir(parents=True, exist_ok=True)
+    # Report names are assigned here, in task order, so they stay unique across workers
+    tasks = iter_tasks(sources)
+    items = _report_names(tasks) if reports_dir else ((task, None) for task in tasks)
+    if jobs == 1:
+        _init_worker(reports_dir)
+        yield from map(score_task, items)
+        return
+    context = multiprocessing.get_context(start_method)
+    with context.Pool(processes=jobs, initializer=_init_worker, initargs=(reports_dir,)) as pool:
+        yield from pool.imap_unordered(score_task, items, chunksize=chunksize)
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.batch", description="Score saved TriNetX triage states in bulk.")
+    parser.add_argument("sources", nargs="+", help="Directories of *.json / *.json.gz states, .jsonl(.gz) archives, or - for JSONL on stdin.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count; 1 = in-process).")
+    parser.add_argument("--reports-dir", default=None, help="Also write a Markdown report per project into this directory.")
+    parser.add_argument("--chunksize", type=int, default=64, help="States handed to a worker at a time.")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    out = sys.stdout
+    for result in run_batch(args.sources, jobs=args.jobs, reports_dir=args.reports_dir, chunksize=args.chunksize):
+        failures += "error" in result
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
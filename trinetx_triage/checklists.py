@@ -0,0 +1,201 @@
+# Reporting-guideline checklist registry
+# Checklists (STROBE, RECORD-PE, TRIPOD, CONSORT, ...) are data files in
+# trinetx_triage/guidelines/, one JSON object per guideline:
+#   {"id": "STROBE", "name": "STROBE", "title": "...", "order": 0,
+#    "items": [["ST1", "Title/Abstract", "Indicate the study design ..."], ...],
+#    "design_items": {"Cohort": [["STC1", "Methods", "..."]], ...}}
+# Extra directories of the same files can be listed in TRINETX_TRIAGE_CHECKLISTS
+# (os.pathsep-separated); a file there with an existing id replaces the packaged one.
+#
+# Everything is loaded, merged and indexed once per process into REGISTRY, which
+# is read-only (tuples and MappingProxyType) and shared by every session. "Items
+# for this design" and per-design bit masks are precomputed, so a lookup by item
+# id, by (checklist, design) or by (checklist, section) is a single dict access.
+# Item ids are unique across the registry and each gets one bit, in registry
+# order, so one int bitset can hold a project's answers for every checklist;
+# STROBE sorts first and keeps the bits it has always had.
+#
+#   python -m trinetx_triage.checklists [--design Cohort] [extra_dir ...]
+
+import argparse
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+GUIDELINES_DIR = Path(__file__).resolve().parent / "guidelines"
+CHECKLIST_DIRS_ENV = "TRINETX_TRIAGE_CHECKLISTS"
+
+class ChecklistError(ValueError):
+    """A checklist file that cannot be read, or a registry with clashing ids."""
+
+class ChecklistItem(NamedTuple):
+    id: str
+    section: str
+    prompt: str
+
+class Checklist(NamedTuple):
+    id: str
+    name: str
+    title: str
+    order: int
+    base: Tuple[ChecklistItem, ...]
+    design_items: Mapping[str, Tuple[ChecklistItem, ...]]
+    items: Tuple[ChecklistItem, ...]                       # base + every design addendum
+    by_design: Mapping[str, Tuple[ChecklistItem, ...]]     # base + that design's addendum
+    by_section: Mapping[str, Tuple[ChecklistItem, ...]]   # over .items, in section order
+
+    def items_for_design(self, design: str) -> Tuple[ChecklistItem, ...]:
+        return self.by_design.get(design, self.base)
+
+def _items(raw, where: str) -> Tuple[ChecklistItem, ...]:
+    if type(raw) is not list:
+        raise ChecklistError(f"{where} must be a list of [id, section, prompt]")
+    items = []
+    for entry in raw:
+        if type(entry) is not list or len(entry) != 3 or not all(type(v) is str and v for v in entry):
+            raise ChecklistError(f"{where}: bad item {entry!r}, expected [id, section, prompt]")
+        items.append(ChecklistItem(*entry))
+    return tuple(items)
+
+def make_checklist(data: Dict, source: str = "<checklist>") -> Checklist:
+    """Validate one decoded checklist file and build its indexes."""
+    if not isinstance(data, dict) or type(data.get("id")) is not str or not data["id"]:
+        raise ChecklistError(f"{source}: a checklist must be an object with a non-empty string id")
+    cid = data["id"]
+    base = _items(data.get("items", []), f"{source}: items")
+    raw_design = data.get("design_items", {})
+    if type(raw_design) is not dict:
+        raise ChecklistError(f"{source}: design_items must map design names to item lists")
+    design_items = {d: _items(v, f"{source}: design_items[{d!r}]") for d, v in raw_design.items()}
+    items = base + tuple(item for extra in design_items.values() for item in extra)
+    seen = set()
+    for item in items:
+        if item.id in seen:
+            raise ChecklistError(f"{source}: duplicate item id {item.id!r}")
+        seen.add(item.id)
+    by_section: Dict[str, List[ChecklistItem]] = {}
+    for item in items:
+        by_section.setdefault(item.section, []).append(item)
+    order = data.get("order", 100)
+    if type(order) is not int:
+        raise ChecklistError(f"{source}: order must be an integer")
+    return Checklist(
+        id=cid,
+        name=str(data.get("name") or cid),
+        title=str(data.get("title") or ""),
+        order=order,
+        base=base,
+        design_items=MappingProxyType(design_items),
+        items=items,
+        by_design=MappingProxyType({d: base + extra for d, extra in design_items.items()}),
+        by_section=MappingProxyType({sec: tuple(v) for sec, v in by_section.items()}),
+    )
+
+def load_checklist(path: Union[str, Path]) -> Checklist:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError) as exc:
+        raise ChecklistError(f"{path}: {exc}") from exc
+    return make_checklist(data, str(path))
+
+# ----------------------------
+# Registry
+# ----------------------------
+
+class Registry:
+    """Every loaded checklist, merged into one read-only index."""
+
+    def __init__(self, checklists: Iterable[Checklist]):
+        ordered = sorted(checklists, key=lambda c: (c.order, c.id))
+        self.checklists: Mapping[str, Checklist] = MappingProxyType({c.id: c for c in ordered})
+        if len(self.checklists) != len(ordered):
+            raise ChecklistError("duplicate checklist id")
+        items: Dict[str, ChecklistItem] = {}
+        owner: Dict[str, str] = {}
+        for c in ordered:
+            for item in c.items:
+                if item.id in items:
+                    raise ChecklistError(f"item id {item.id!r} is used by both {owner[item.id]} and {c.id}")
+                items[item.id] = item
+                owner[item.id] = c.id
+        self.items: Mapping[str, ChecklistItem] = MappingProxyType(items)
+        self.checklist_of: Mapping[str, str] = MappingProxyType(owner)
+        self.bit: Mapping[str, int] = MappingProxyType({k: 1 << i for i, k in enumerate(items)})
+        self.mask: Mapping[str, int] = MappingProxyType(
+            {c.id: sum(self.bit[item.id] for item in c.items) for c in ordered})
+        # (checklist id, design) -> bits of that design's items; unknown designs fall back to base
+        self._design_mask = {(c.id, d): sum(self.bit[item.id] for item in v)
+                             for c in ordered for d, v in c.by_design.items()}
+        self._base_mask = {c.id: sum(self.bit[item.id] for item in c.base) for c in ordered}
+
+    def __getitem__(self, cid: str) -> Checklist:
+        return self.checklists[cid]
+
+    def __contains__(self, cid: str) -> bool:
+        return cid in self.checklists
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.checklists)
+
+    def __len__(self) -> int:
+        return len(self.checklists)
+
+    def items_for_design(self, cid: str, design: str) -> Tuple[ChecklistItem, ...]:
+        return self.checklists[cid].items_for_design(design)
+
+    def design_mask(self, cid: str, design: str) -> int:
+        return self._design_mask.get((cid, design), self._base_mask[cid])
+
+    @lru_cache(maxsize=256)
+    def combined(self, cids: Tuple[str, ...], design: str) -> Tuple[Tuple[str, ChecklistItem], ...]:
+        """(checklist id, item) for several checklists' design items, in registry order."""
+        wanted = set(cids)
+        return tuple((cid, item) for cid, c in self.checklists.items() if cid in wanted
+                     for item in c.items_for_design(design))
+
+def checklist_dirs(extra: Sequence[Union[str, Path]] = ()) -> List[Path]:
+    dirs = [GUIDELINES_DIR]
+    dirs += [Path(p) for p in os.environ.get(CHECKLIST_DIRS_ENV, "").split(os.pathsep) if p]
+    dirs += [Path(p) for p in extra]
+    return dirs
+
+def load_registry(dirs: Optional[Sequence[Union[str, Path]]] = None) -> Registry:
+    """Load every *.json checklist in ``dirs`` (default: packaged + env); later dirs win on id."""
+    found: Dict[str, Checklist] = {}
+    for d in checklist_dirs() if dirs is None else [Path(p) for p in dirs]:
+        if not d.is_dir():
+            raise ChecklistError(f"checklist directory not found: {d}")
+        for path in sorted(d.glob("*.json")):
+            checklist = load_checklist(path)
+            found[checklist.id] = checklist
+    return Registry(found.values())
+
+REGISTRY = load_registry()
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.checklists", description="Validate and list the loaded reporting checklists.")
+    parser.add_argument("dirs", nargs="*", help="Extra checklist directories to load on top of the packaged ones.")
+    parser.add_argument("--design", help="Show the item count for this design.")
+    args = parser.parse_args(argv)
+    try:
+        registry = load_registry(checklist_dirs(args.dirs)) if args.dirs else REGISTRY
+    except ChecklistError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    for cid, c in registry.checklists.items():
+        count = len(c.items_for_design(args.design)) if args.design else len(c.base)
+        designs = ", ".join(c.design_items) or "-"
+        print(f"{cid:<10} {count:>3} items  sections: {len(c.by_section)}  design addenda: {designs}  {c.title}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+# Code-list validation against a reference vocabulary
+# Checks pasted/uploaded ICD-10-CM, CPT and RxNorm code lists, including wildcards
+# ("E11.*", "I21%", "T36.?X1A") and ranges ("I20-I25", "99201–99215"), against a
+# locally loaded vocabulary file. The results feed Gate A Q2 and rubric domain
+# "C. Cohort fidelity".
+#
+# Index: one sorted array of normalised codes per coding system (dots dropped,
+# upper case). An exact code is one bisect, a wildcard is the bisect range of its
+# literal prefix, and a range is bisect(lo) .. bisect(hi + every descendant), so
+# "I20-I25" includes I25.9. Purely numeric systems (RxNorm) also keep a sorted int
+# array so "100-200" compares numerically. Matches are counted as index intervals,
+# never materialised, and the union over overlapping entries is an interval merge.
+# The one exception: in a numeric system that has both numeric matches (codes,
+# ranges) and wildcard matches (string-prefix intervals), the wildcard matches are
+# mapped onto int-array positions so codes caught by both are counted once.
+#
+# Vocabulary files: CSV/TSV (optionally .gz) with a header naming the code column
+# (code / concept_code) and optionally the system (system / vocabulary_id), e.g. an
+# OMOP CONCEPT.csv; or a plain list, one code per line. get_vocabulary() builds the
+# index once per process per file version and shares it.
+#
+#   python -m trinetx_triage.codelists --vocab CONCEPT.csv my_codes.txt
+
+import argparse
+import csv
+import fnmatch
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_VOCAB = os.environ.get("TRINETX_TRIAGE_VOCAB", "")
+COHORT_FIDELITY_DOMAIN = "C. Cohort fidelity"
+CODES_GATE_A = "Q2"
+# What reading a vocabulary file can raise: missing/unreadable (OSError), not UTF-8
+# (UnicodeDecodeError, a ValueError), truncated .gz (EOFError) or broken CSV quoting
+VOCAB_ERRORS = (OSError, EOFError, ValueError, csv.Error)
+
+_CODE_COLUMNS = ("code", "concept_code", "codes")
+_SYSTEM_COLUMNS = ("system", "vocabulary_id", "vocabulary", "code_system", "coding_system")
+_SYSTEM_ALIASES = {"CPT4": "CPT", "HCPCS": "CPT", "ICD10": "ICD10CM"}
+_WILDCARDS = re.compile(r"[*%?]")
+_RANGE = re.compile(r"^(?P<lo>[^\s\-–]+)\s*[-–]\s*(?P<hi>[^\s\-–]+)$")
+_RANGE_ITEM = re.compile(r"^(?P<lo>[^\s\-–]+)\s*[-–]\s*(?P<hi>[^\s\-–]+)(?:\s|$)")
+_HIGH = "\uffff"
+
+def normalize_code(code: str) -> str:
+    return code.strip().upper().replace(".", "")
+
+def normalize_system(system: str) -> str:
+    key = re.sub(r"[^A-Z0-9]", "", system.upper())
+    return _SYSTEM_ALIASES.get(key, key)
+
+# ----------------------------
+# Index
+# ----------------------------
+
+class SortedCodes:
+    """Sorted-array index over one coding system."""
+
+    def __init__(self, codes: Iterable[str]):
+        self.codes: List[str] = sorted(set(codes))
+        self.numeric: Optional[List[int]] = None
+        # numeric_pos[k]: position of codes[k] in the int array
+        self.numeric_pos: Optional[List[int]] = None
+        if self.codes and all(c.isdigit() for c in self.codes):
+            order = sorted(range(len(self.codes)), key=lambda k: int(self.codes[k]))
+            self.numeric = [int(self.codes[k]) for k in order]
+            self.numeric_pos = [0] * len(order)
+            for p, k in enumerate(order):
+                self.numeric_pos[k] = p
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def exact(self, code: str) -> Optional[Tuple[int, int]]:
+        i = bisect_left(self.codes, code)
+        return (i, i + 1) if i < len(self.codes) and self.codes[i] == code else None
+
+    def prefix(self, prefix: str) -> Tuple[int, int]:
+        return bisect_left(self.codes, prefix), bisect_left(self.codes, prefix + _HIGH)
+
+    def range(self, lo: str, hi: str) -> Tuple[int, int]:
+        if self.numeric is not None and lo.isdigit() and hi.isdigit():
+            # Numeric systems: count in the int array, report positions in that array
+            return bisect_left(self.numeric, int(lo)), bisect_right(self.numeric, int(hi))
+        return bisect_left(self.codes, lo), bisect_left(self.codes, hi + _HIGH)
+
+class Vocabulary:
+    def __init__(self, systems: Dict[str, SortedCodes], source: str = ""):
+        self.systems = systems
+        self.source = source
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self.systems.values())
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str]], source: str = "") -> "Vocabulary":
+        grouped: Dict[str, List[str]] = {}
+        for system, code in rows:
+            code = normalize_code(code)
+            if code:
+                grouped.setdefault(normalize_system(system), []).append(code)
+        return cls({sys_: SortedCodes(codes) for sys_, codes in grouped.items()}, source)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Vocabulary":
+        return cls.from_rows(_vocab_rows(Path(path)), str(path))
+
+def _vocab_rows(path: Path) -> Iterator[Tuple[str, str]]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8-sig", newline="") as fh:
+        first = fh.readline()
+        delimiter = "\t" if "\t" in first else ","
+        header = [c.strip().lower() for c in next(csv.reader([first], delimiter=delimiter), [])]
+        code_col = next((header.index(c) for c in _CODE_COLUMNS if c in header), None)
+        system_col = next((header.index(c) for c in _SYSTEM_COLUMNS if c in header), None)
+        reader: Iterable[List[str]] = csv.reader(fh, delimiter=delimiter)
+        if code_col is None:
+            # No header: the first line is already data and the first column is the code
+            code_col = 0
+            reader = chain(csv.reader([first], delimiter=delimiter), reader)
+        for row in reader:
+            if len(row) > code_col:
+                yield (row[system_col] if system_col is not None and len(row) > system_col else ""), row[code_col]
+
+# ----------------------------
+# Validation
+# ----------------------------
+
+def parse_entries(text: str) -> List[str]:
+    """One entry per line or comma/semicolon-separated item; text after the first token is a description."""
+    entries = []
+    for line in text.splitlines():
+        for item in re.split(r"[,;]", line):
+            item = item.strip()
+            if not item or item.startswith("#"):
+                continue
+            m = _RANGE_ITEM.match(item)
+            entries.append(f"{m['lo']}-{m['hi']}" if m else item.split()[0])
+    return entries
+
+class CodeListReport:
+    def __init__(self):
+        self.entries = 0
+        self.exact = 0
+        self.patterns = 0
+        self.unknown: List[str] = []        # exact codes not in the vocabulary
+        self.empty: List[str] = []          # wildcards/ranges matching nothing
+        self.malformed: List[str] = []      # ranges whose low end is above the high end
+        self.unknown_systems: List[str] = []
+        self.expanded = 0                   # distinct vocabulary codes covered by the list
+
+    @property
+    def resolved(self) -> int:
+        return self.entries - len(self.unknown) - len(self.empty) - len(self.malformed) - len(self.unknown_systems)
+
+    def all_resolved(self) -> bool:
+        return self.entries > 0 and self.resolved == self.entries
+
+    def suggest_fidelity_score(self) -> Optional[int]:
+        """Domain C suggestion: 2 every entry resolves, 1 at least 90%, 0 otherwise."""
+        if not self.entries:
+            return None
+        if self.all_resolved():
+            return 2
+        return 1 if self.resolved >= 0.9 * self.entries else 0
+
+    def to_dict(self, limit: int = 50) -> Dict:
+        return {
+            "entries": self.entries,
+            "exact": self.exact,
+            "patterns": self.patterns,
+            "resolved": self.resolved,
+            "expanded": self.expanded,
+            "unknown": self.unknown[:limit],
+            "unknown_count": len(self.unknown),
+            "empty": self.empty[:limit],
+            "malformed": self.malformed[:limit],
+            "unknown_systems": self.unknown_systems[:limit],
+            "all_resolved": self.all_resolved(),
+            "suggested_fidelity_score": self.suggest_fidelity_score(),
+        }
+
+def validate(entries: Iterable[str], vocab: Vocabulary, default_system: Optional[str] = None) -> CodeListReport:
+    """Resolve every entry against the index; "SYSTEM:code" pins an entry to one system."""
+    report = CodeListReport()
+    default = normalize_system(default_system) if default_system else None
+    intervals: Dict[Tuple[str, bool], List[Tuple[int, int]]] = {}
+    extra: Dict[str, set] = {}
+    for raw in entries:
+        report.entries += 1
+        system, _, body = raw.rpartition(":") if ":" in raw else ("", "", raw)
+        system = normalize_system(system) if system else default
+        if system is not None and system not in vocab.systems:
+            report.unknown_systems.append(raw)
+            continue
+        targets = [system] if system is not None else list(vocab.systems)
+        m = _RANGE.match(body)
+        if m and _reversed(normalize_code(m["lo"]), normalize_code(m["hi"])):
+            # "I25-I20" would be an empty (or negative) span; flag it, never count it as resolved
+            report.malformed.append(raw)
+            continue
+        is_pattern = bool(m) or bool(_WILDCARDS.search(body))
+        report.patterns += is_pattern
+        report.exact += not is_pattern
+        hits = 0
+        for s in targets:
+            idx = vocab.systems[s]
+            if m:
+                lo, hi = normalize_code(m["lo"]), normalize_code(m["hi"])
+                numeric = idx.numeric is not None and lo.isdigit() and hi.isdigit()
+                span = idx.range(lo, hi)
+                intervals.setdefault((s, numeric), []).append(span)
+                hits += max(0, span[1] - span[0])
+            elif is_pattern:
+                code = normalize_code(body)
+                literal = _WILDCARDS.split(code, 1)[0]
+                i, j = idx.prefix(literal)
+                tail = code[len(literal):]
+                if tail.strip("*%"):
+                    # Embedded wildcard: filter the prefix range
+                    pattern = code.replace("%", "*")
+                    found = {k for k in range(i, j) if fnmatch.fnmatchcase(idx.codes[k], pattern)}
+                    extra.setdefault(s, set()).update(found)
+                    hits += len(found)
+                else:
+                    intervals.setdefault((s, False), []).append((i, j))
+                    hits += j - i
+            else:
+                code = normalize_code(body)
+                span = idx.exact(code)
+                if span:
+                    if idx.numeric is not None:
+                        # Same coordinates as numeric ranges so overlaps are counted once
+                        i = idx.numeric_pos[span[0]]
+                        intervals.setdefault((s, True), []).append((i, i + 1))
+                    else:
+                        intervals.setdefault((s, False), []).append(span)
+                    hits += 1
+        if not hits:
+            (report.empty if is_pattern else report.unknown).append(raw)
+    report.expanded = _union_size(intervals, extra, vocab)
+    return report
+
+def _reversed(lo: str, hi: str) -> bool:
+    return int(lo) > int(hi) if lo.isdigit() and hi.isdigit() else lo > hi
+
+def _merge(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for i, j in sorted(s for s in spans if s[1] > s[0]):
+        if merged and i <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], j))
+        else:
+            merged.append((i, j))
+    return merged
+
+def _uncovered(positions: Iterable[int], merged: List[Tuple[int, int]]) -> int:
+    """How many positions fall outside the merged intervals."""
+    starts = [i for i, _ in merged]
+    n = 0
+    for k in positions:
+        p = bisect_right(starts, k) - 1
+        n += p < 0 or k >= merged[p][1]
+    return n
+
+def _union_size(intervals: Dict[Tuple[str, bool], List[Tuple[int, int]]], extra: Dict[str, set], vocab: Vocabulary) -> int:
+    total = 0
+    for system in {s for s, _ in intervals} | set(extra):
+        numeric = _merge(intervals.get((system, True), []))
+        spans = _merge(intervals.get((system, False), []))
+        found = extra.get(system, set())
+        total += sum(j - i for i, j in numeric)
+        if numeric and (spans or found):
+            # Wildcards are string-prefix intervals, codes and ranges int-array ones:
+            # put the wildcard matches on int-array positions before the union
+            pos = vocab.systems[system].numeric_pos
+            loose = {pos[k] for i, j in spans for k in range(i, j)}
+            loose.update(pos[k] for k in found)
+            total += _uncovered(loose, numeric)
+        else:
+            total += sum(j - i for i, j in spans) + _uncovered(found, spans)
+    return total
+
+# ----------------------------
+# One index per process
+# ----------------------------
+
+_vocabularies: Dict[str, Tuple[Tuple[int, int], Vocabulary]] = {}
+_vocab_lock = threading.Lock()
+
+def get_vocabulary(path: str = DEFAULT_VOCAB) -> Vocabulary:
+    """Shared index for this file; rebuilt only when the file's mtime/size change."""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _vocab_lock:
+        cached = _vocabularies.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = _vocabularies[key] = (stamp, Vocabulary.from_file(key))
+        return cached[1]
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.codelists", description="Validate code lists against a reference vocabulary.")
+    parser.add_argument("files", nargs="+", help="Code lists: one code, wildcard or range per line (or comma-separated).")
+    parser.add_argument("--vocab", default=DEFAULT_VOCAB, required=not DEFAULT_VOCAB, help="Reference vocabulary file (env TRINETX_TRIAGE_VOCAB).")
+    parser.add_argument("--system", default=None, help="Coding system for entries without a SYSTEM: prefix (default: any).")
+    args = parser.parse_args(argv)
+
+    vocab = get_vocabulary(args.vocab)
+    entries = [e for f in args.files for e in parse_entries(Path(f).read_text(encoding="utf-8-sig"))]
+    report = validate(entries, vocab, args.system)
+    print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    return 0 if report.all_resolved() else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
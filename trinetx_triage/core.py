@@ -0,0 +1,250 @@
+# TriNetX Study Triage + STROBE Planner — scoring core
+# Pure data + scoring helpers shared by the Streamlit app and the batch CLI.
+# No Streamlit import here: this module must stay importable headless.
+
+from types import MappingProxyType
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from .checklists import REGISTRY, ChecklistItem
+
+# ----------------------------
+# Utility Data
+# ----------------------------
+
+TRIAGE_DOMAINS = [
+    ("A. Novelty & significance", "Is there a clear, non-trivial contribution or gap addressed?"),
+    ("B. Mechanistic/clinical rationale", "Is there a plausible clinical/biological rationale with citations?"),
+    ("C. Cohort fidelity", "Are codes specific, validated/peer-anchored, with appropriate washout/indexing?"),
+    ("D. Exposure definition", "Is there a new-user/active-comparator design, dose/duration captured?"),
+    ("E. Outcome validity", "Is the outcome specific, temporally aligned, and preferably validated/triangulated?"),
+    ("F. Confounding control", "Is there strong adjustment (PSM/IPTW), SMD<0.1, diagnostics shown?"),
+    ("G. Bias handling", "Are immortal time/time-lag/misattribution addressed in design/analysis?"),
+    ("H. Analytic depth", "More than one model; sensitivity/heterogeneity pre-specified?"),
+    ("I. Robustness", "Negative controls/falsification; E-value/tipping-point; alternative specs?"),
+    ("J. Generalizability", "Is scope/population clear; multi-site; equity lens when relevant?"),
+    ("K. Reproducibility", "Provenance: saved queries, code lists, versions, date-stamps?"),
+    ("L. Visuals & reporting", "Cohort diagram, balance plots, survival/cum. incidence, forest figures?"),
+]
+
+DEPTH_UPGRADES = [
+    "Redesign to new-user with active comparator",
+    "Tighten washout/index; add grace periods for exposure gaps",
+    "Full covariate balance plots + overlap histograms",
+    "PH assumption checks or flexible hazards (e.g., Aalen, time-varying covariates)",
+    "Competing risks (Fine–Gray) when appropriate",
+    "Falsification endpoints or negative exposure controls",
+    "E-value or tipping-point for unmeasured confounding",
+    "Pre-specified subgroups/interaction (sex, age, comorbidity)",
+    "Equity moderators (URIM, FirstGen, site access) when justified",
+    "Calendar-time or pandemic-era sensitivity analyses",
+    "Triangulate outcome definitions (strict vs. broad)",
+    "Replicate with alternate adjustment (IPTW vs. PSM)",
+    "Dose–response or time-on-treatment analysis",
+    "Journal-ready figures: flow, balance, KM/CIF, forest",
+]
+
+# STROBE items (base core + design-specific addenda)
+# Each item: (id, section_label, prompt). The text lives in trinetx_triage/guidelines/strobe.json;
+# these lists are kept for callers that predate the checklist registry.
+STROBE = REGISTRY["STROBE"]
+STROBE_BASE = list(STROBE.base)
+
+# Design-specific additions/clarifiers
+STROBE_COHORT = list(STROBE.design_items.get("Cohort", ()))
+STROBE_CASECONTROL = list(STROBE.design_items.get("Case–control", ()))
+STROBE_CROSSSECTIONAL = list(STROBE.design_items.get("Cross-sectional", ()))
+
+# Gate A (fatal flaws)
+GATE_A_ITEMS = [
+    ("Q1", "Clear clinical question with explicit comparison and outcome?"),
+    ("Q2", "Cohort definition unambiguous (codes validated/peer-anchored) with index and washout defined?"),
+    ("Q3", "Credible sample size for outcomes (or provide power/precision justification)?"),
+    ("Q4", "Confounding strategy fit to question (PSM/IPTW/stratification/time-to-event)?"),
+    ("Q5", "Bias traps addressed: immortal time, time-lag, prevalent-user, misclassification, differential follow-up?"),
+    ("Q6", "Outcome ascertainment specific and temporally aligned to index?"),
+]
+
+# Gate B (minimum standards by design)
+GATE_B_MIN = {
+    "Cohort": [
+        "New-user design or explicit rationale for prevalent users.",
+        "Active comparator (if feasible) and index date alignment.",
+        "Pre-specified covariates; balance table with SMD<0.10 post-adjustment.",
+        "Proportional hazards checked if using Cox; censoring rules transparent.",
+    ],
+    "Case–control": [
+        "Clear case definition; control selection free of outcome; matching criteria (if any) described.",
+        "Exposure assessment window defined relative to index; blinding of exposure assessment if feasible.",
+        "Confounding addressed via matching/stratification/regression/PS; diagnostics provided.",
+    ],
+    "Cross-sectional": [
+        "Sampling strategy described; weights if applicable.",
+        "Measurement validity for exposure/outcome; temporality caveats stated.",
+        "Confounding and collinearity considered; appropriate regression/robust SEs.",
+    ],
+}
+
+DESIGNS = ["Cohort", "Case–control", "Cross-sectional"]
+
+# (track, rationale) in the order triage_decision tests them
+DECISIONS = [
+    ("Refactor or Poster", "Gate A failed: fix design fundamentals before proceeding."),
+    ("Full Manuscript", "Strong project with adequate reporting. Proceed to journal targeting."),
+    ("Brief Report / Short Communication", "Solid core; add 1–2 depth upgrades and ensure STROBE polish."),
+    ("Abstract / Poster", "Viable for meeting; consider depth upgrades and STROBE completeness to escalate."),
+    ("Refactor or Educational Poster", "Scope down or re-design. Use as learning vehicle."),
+]
+
+class Thresholds(NamedTuple):
+    """Cut-offs triage_decision applies to the rubric total (0–24) and STROBE %."""
+    manuscript_rubric: int = 20
+    manuscript_strobe: float = 80.0
+    brief_rubric: int = 16
+    brief_strobe: float = 70.0
+    abstract_rubric: int = 12
+
+DEFAULT_THRESHOLDS = Thresholds()
+
+# Free-text project fields, in the order init_state() creates them
+PROJECT_FIELDS = ["title", "question", "design", "index", "period", "sites", "irb"]
+
+# ----------------------------
+# Shared Checklist Registry
+# ----------------------------
+# Checklist text is held once per process and is read-only (trinetx_triage.checklists);
+# a project state only carries an int bitset of addressed items plus a sparse map of
+# non-empty "where" notes. The bitset is over CHECKLIST_BIT, i.e. every loaded
+# checklist, so answers to additional guidelines ride along in the same
+# "strobe_mask"/"strobe_where" fields; STROBE_BIT is its STROBE-only prefix.
+# Gate B answers are a bitset over GATE_B_MIN[design].
+STROBE_ITEMS = STROBE.items
+STROBE_TEXT = MappingProxyType({k: (sec, prompt) for k, sec, prompt in STROBE_ITEMS})
+STROBE_BIT = MappingProxyType({k: REGISTRY.bit[k] for k, _, _ in STROBE_ITEMS})
+CHECKLIST_BIT = REGISTRY.bit
+# Guidelines a reviewer can add on top of STROBE (RECORD-PE, TRIPOD, ...)
+EXTRA_CHECKLISTS = tuple(cid for cid in REGISTRY if cid != "STROBE")
+
+# ----------------------------
+# Helper Functions
+# ----------------------------
+
+def strobe_items_for_design(design: str) -> Tuple[ChecklistItem, ...]:
+    # Precomputed per design in the registry; shared, so callers must not mutate it
+    return STROBE.items_for_design(design)
+
+def compute_strobe_score(checks: Dict[str, Dict]) -> Tuple[int, int, float]:
+    total = len(checks)
+    yes = sum(1 for v in checks.values() if v.get("addressed", False))
+    pct = (yes / total * 100.0) if total else 0.0
+    return yes, total, pct
+
+def bits_for(keys: Iterable[str]) -> int:
+    mask = 0
+    for k in keys:
+        mask |= CHECKLIST_BIT.get(k, 0)
+    return mask
+
+def strobe_design_mask(design: str) -> int:
+    return REGISTRY.design_mask("STROBE", design)
+
+def checklist_score(state: Dict, checklist_id: str) -> Tuple[int, int, float]:
+    """strobe_score() for any registered checklist: addressed / applicable items for the design."""
+    design_mask = REGISTRY.design_mask(checklist_id, state.get("design", ""))
+    total = design_mask.bit_count()
+    yes = (state.get("strobe_mask", 0) & design_mask).bit_count()
+    pct = (yes / total * 100.0) if total else 0.0
+    return yes, total, pct
+
+def checklist_items(design: str, checklists: Sequence[str] = ()) -> Tuple[Tuple[str, ChecklistItem], ...]:
+    """(checklist id, item) for STROBE plus the selected extra checklists, for one design."""
+    return REGISTRY.combined(("STROBE", *checklists), design)
+
+def strobe_score(state: Dict) -> Tuple[int, int, float]:
+    # compute_strobe_score() over the bitset form: popcount of addressed items within the design
+    design_mask = strobe_design_mask(state.get("design", ""))
+    total = design_mask.bit_count()
+    yes = (state.get("strobe_mask", 0) & design_mask).bit_count()
+    pct = (yes / total * 100.0) if total else 0.0
+    return yes, total, pct
+
+def pack_strobe_checks(checks: Dict[str, Dict]) -> Tuple[int, Dict[str, str]]:
+    """Legacy per-item dicts -> (addressed bitset, sparse "where" notes)."""
+    mask = bits_for(k for k, v in checks.items() if v.get("addressed", False))
+    where = {k: v["where"] for k, v in checks.items() if v.get("where") and k in CHECKLIST_BIT}
+    return mask, where
+
+def gate_b_full_mask(design: str) -> int:
+    return (1 << len(GATE_B_MIN.get(design, []))) - 1
+
+def pack_gate_b(gate_b: Dict[str, bool], design: str) -> int:
+    """Legacy {Gate B sentence: bool} -> bitset over GATE_B_MIN[design]."""
+    return sum(1 << i for i, item in enumerate(GATE_B_MIN.get(design, [])) if gate_b.get(item, False))
+
+def triage_decision(rubric_total: int, strobe_pct: float, gates_pass: bool,
+                    thresholds: Thresholds = DEFAULT_THRESHOLDS) -> Tuple[str, str]:
+    t = thresholds
+    if not gates_pass:
+        return DECISIONS[0]
+    if rubric_total >= t.manuscript_rubric and strobe_pct >= t.manuscript_strobe:
+        return DECISIONS[1]
+    if rubric_total >= t.brief_rubric and strobe_pct >= t.brief_strobe:
+        return DECISIONS[2]
+    if rubric_total >= t.abstract_rubric:
+        return DECISIONS[3]
+    return DECISIONS[4]
+
+def decision_gates_pass(state: Dict) -> bool:
+    # Same rule as "7) Decision & Rationale": Gate A, plus every Gate B item when the design has any
+    full_b = gate_b_full_mask(state.get("design", ""))
+    return bool(state.get("gates_pass")) and (state.get("gate_b_mask", 0) & full_b) == full_b
+
+def make_report_md(state: Dict) -> str:
+    # Rendered by the compiled-template pipeline; see trinetx_triage.reports for HTML/CSV/XLSX
+    from .reports import render_report
+    return render_report(state, "md")
+
+def normalize_state(payload: Dict) -> Dict:
+    """Saved sidebar payload (triage_strobe_state.json, compact or legacy) -> compact project state."""
+    design = payload.get("design") or "Cohort"
+    state = {f: payload.get(f, "") or "" for f in PROJECT_FIELDS}
+    state["design"] = design
+
+    saved_a = payload.get("gate_a") or {}
+    state["gate_a"] = {k: bool(saved_a.get(k, False)) for k, _ in GATE_A_ITEMS}
+    state["gates_pass"] = all(state["gate_a"].values())
+
+    if "gate_b_mask" in payload:
+        state["gate_b_mask"] = int(payload["gate_b_mask"]) & gate_b_full_mask(design)
+    else:
+        state["gate_b_mask"] = pack_gate_b(payload.get("gate_b") or {}, design)
+
+    saved_rubric = payload.get("rubric") or {}
+    state["rubric"] = {dom: int(saved_rubric.get(dom, 0) or 0) for dom, _ in TRIAGE_DOMAINS}
+    state["rubric_total"] = sum(state["rubric"].values())
+
+    if "strobe_mask" in payload:
+        state["strobe_mask"] = int(payload["strobe_mask"])
+        state["strobe_where"] = {k: v for k, v in (payload.get("strobe_where") or {}).items() if v and k in CHECKLIST_BIT}
+    else:
+        state["strobe_mask"], state["strobe_where"] = pack_strobe_checks(payload.get("strobe_checks") or {})
+    state["checklists"] = [c for c in EXTRA_CHECKLISTS if c in (payload.get("checklists") or ())]
+
+    state["upgrades"] = [u for u in payload.get("upgrades", []) if u in DEPTH_UPGRADES]
+    return state
+
+def score_state(state: Dict) -> Dict:
+    """Headline numbers for one normalized state, as shown in "7) Decision & Rationale"."""
+    yes, total, pct = strobe_score(state)
+    gates_pass = decision_gates_pass(state)
+    decision, rationale = triage_decision(state["rubric_total"], pct, gates_pass)
+    return {
+        "title": state.get("title", ""),
+        "design": state.get("design", ""),
+        "rubric_total": state["rubric_total"],
+        "strobe_yes": yes,
+        "strobe_total": total,
+        "strobe_pct": pct,
+        "gates_pass": gates_pass,
+        "decision": decision,
+        "rationale": rationale,
+    }
@@ -0,0 +1,248 @@
+# TriNetX CSV exports
+# Reads the CSVs TriNetX produces for propensity score matching, baseline
+# characteristics and outcome measures one row at a time, keeping only running
+# aggregates, so files read from disk (CLI, paths) are never held in memory
+# whatever their size. Streamlit uploads arrive fully in memory; the parser still
+# reads them row by row and adds no second copy. The summary feeds:
+#   - Gate B "balance table with SMD<0.10 post-adjustment" (Cohort item 3)
+#   - a suggested score for rubric domain "F. Confounding control"
+#
+# Layout handling is deliberately loose: a balance table is any header row with a
+# "Std diff." / SMD column; before/after matching comes from section title rows or
+# the file name; outcome measures are rows or header cells (next to CI / estimate
+# columns) naming a risk/odds/hazard ratio or risk difference, kept only when the
+# estimate lies within its confidence interval.
+#
+#   python -m trinetx_triage.exports baseline_after_psm.csv outcomes.csv
+
+import argparse
+import csv
+import heapq
+import io
+import json
+import re
+import sys
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+SMD_THRESHOLD = 0.10
+# Gate B position checked by the balance table, per design
+BALANCE_GATE_B = {"Cohort": 2}
+CONFOUNDING_DOMAIN = "F. Confounding control"
+READ_CHUNK = 1 << 16
+TOP_IMBALANCED = 5
+
+_SMD_HEADER = re.compile(r"std\.?\s*diff|standardi[sz]ed\s+(mean\s+)?diff|^a?smd$", re.I)
+_NAME_HEADER = re.compile(r"characteristic\s*name|^characteristic$|^covariate|^variable", re.I)
+_BEFORE = re.compile(r"before\b.*\b(match|adjust|weight|propensity)|\bunmatched\b|\bunadjusted\b", re.I)
+_AFTER = re.compile(r"after\b.*\b(match|adjust|weight|propensity)|\bpropensity[ _-]score[ _-]matched\b|\bmatched\b|\bpsm\b", re.I)
+_MEASURES = {m.lower(): m for m in ("Risk Difference", "Risk Ratio", "Odds Ratio", "Hazard Ratio")}
+# A measure header row also names its estimate / CI columns; a lone measure name is a title
+_CI_HEADER = re.compile(r"\bc\.?i\.?\b|confidence|lower|upper|estimate|\bvalue\b", re.I)
+
+Source = Union[str, Path, BinaryIO]
+
+def _number(cell: str) -> Optional[float]:
+    cell = cell.strip().replace(",", "").rstrip("%")
+    if not cell:
+        return None
+    try:
+        return float(cell)
+    except ValueError:
+        return None
+
+def _phase(text: str) -> Optional[str]:
+    if _BEFORE.search(text):
+        return "before"
+    if _AFTER.search(text):
+        return "after"
+    return None
+
+# ----------------------------
+# Running aggregates
+# ----------------------------
+
+class BalanceStats:
+    """|SMD| over the covariate rows of one phase (before / after matching)."""
+
+    def __init__(self):
+        self.covariates = 0
+        self.imbalanced = 0
+        self.max_smd = 0.0
+        self._worst: List[Tuple[float, str]] = []
+
+    def add(self, name: str, smd: float) -> None:
+        smd = abs(smd)
+        self.covariates += 1
+        self.max_smd = max(self.max_smd, smd)
+        if smd >= SMD_THRESHOLD:
+            self.imbalanced += 1
+            # Bounded heap: only the TOP_IMBALANCED worst covariates are kept
+            if len(self._worst) < TOP_IMBALANCED:
+                heapq.heappush(self._worst, (smd, name))
+            else:
+                heapq.heappushpop(self._worst, (smd, name))
+
+    def to_dict(self) -> Dict:
+        return {
+            "covariates": self.covariates,
+            "imbalanced": self.imbalanced,
+            "max_smd": round(self.max_smd, 4),
+            "worst": [{"covariate": n, "smd": round(s, 4)} for s, n in sorted(self._worst, reverse=True)],
+        }
+
+class ExportSummary:
+    def __init__(self):
+        self.files: List[str] = []
+        self.rows = 0
+        self.balance = {"before": BalanceStats(), "after": BalanceStats(), "unlabelled": BalanceStats()}
+        self.outcomes: List[Dict] = []
+        self.notes: List[str] = []
+
+    def smd_gate_pass(self) -> Optional[bool]:
+        """True/False once a post-matching balance table was seen; None if there was none."""
+        after = self.balance["after"]
+        if not after.covariates:
+            return None
+        return after.max_smd < SMD_THRESHOLD
+
+    def suggest_confounding_score(self) -> Optional[int]:
+        """Domain F suggestion: 2 all |SMD| < 0.10 after matching, 1 all < 0.20, 0 otherwise or unadjusted only."""
+        after = self.balance["after"]
+        if after.covariates:
+            if after.max_smd < SMD_THRESHOLD:
+                return 2
+            return 1 if after.max_smd < 2 * SMD_THRESHOLD else 0
+        if self.balance["before"].covariates:
+            return 0
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            "files": self.files,
+            "rows": self.rows,
+            "balance": {phase: stats.to_dict() for phase, stats in self.balance.items() if stats.covariates},
+            "outcomes": self.outcomes,
+            "smd_gate_pass": self.smd_gate_pass(),
+            "suggested_confounding_score": self.suggest_confounding_score(),
+            "notes": self.notes,
+        }
+
+# ----------------------------
+# Streaming parser
+# ----------------------------
+
+def iter_rows(fh: BinaryIO) -> Iterator[List[str]]:
+    """CSV rows from a binary stream (open paths with buffering=READ_CHUNK)."""
+    if fh.seekable():
+        fh.seek(0)
+    text = io.TextIOWrapper(fh, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        # Leave the caller's stream open (e.g. a Streamlit UploadedFile)
+        text.detach()
+
+def scan_export(source: Source, name: Optional[str] = None, summary: Optional[ExportSummary] = None) -> ExportSummary:
+    summary = summary if summary is not None else ExportSummary()
+    if isinstance(source, (str, Path)):
+        with open(source, "rb", buffering=READ_CHUNK) as fh:
+            return scan_export(fh, name or Path(source).name, summary)
+    name = name or getattr(source, "name", "export.csv")
+    summary.files.append(name)
+
+    phase = _phase(Path(name).stem.replace("_", " ")) or "unlabelled"
+    unlabelled_before = summary.balance["unlabelled"].covariates
+    smd_col = name_col = None
+    measure_cols: Dict[int, str] = {}
+    for row in iter_rows(source):
+        summary.rows += 1
+        cells = [c.strip() for c in row]
+        filled = [c for c in cells if c]
+        if not filled:
+            # Blank lines separate tables
+            smd_col, measure_cols = None, {}
+            continue
+        # Hot path: a covariate row inside a balance table
+        if smd_col is not None and smd_col < len(cells):
+            smd = _number(cells[smd_col])
+            if smd is not None:
+                label = cells[name_col] if name_col < len(cells) else ""
+                summary.balance[phase].add(label or f"row {summary.rows}", smd)
+                continue
+        numbers = [n for n in map(_number, filled) if n is not None]
+
+        # Section titles ("After propensity score matching", ...) switch phase and end a table
+        if len(filled) <= 2 and not numbers:
+            new_phase = _phase(" ".join(filled))
+            if new_phase:
+                phase, smd_col, measure_cols = new_phase, None, {}
+                continue
+
+        if not numbers:
+            smd_hits = [i for i, c in enumerate(cells) if _SMD_HEADER.search(c)]
+            if smd_hits:
+                smd_col = smd_hits[0]
+                names = [i for i, c in enumerate(cells) if _NAME_HEADER.search(c)]
+                name_col = names[0] if names else 0
+                measure_cols = {}
+                continue
+            heads = {i: _MEASURES[c.lower()] for i, c in enumerate(cells) if c.lower() in _MEASURES}
+            if heads and any(_CI_HEADER.search(c) for c in cells):
+                measure_cols, smd_col = heads, None
+                continue
+
+        if smd_col is not None:
+            continue
+
+        first = filled[0].lower()
+        if first in _MEASURES and numbers:
+            _add_outcome(summary, name, _MEASURES[first], numbers)
+        elif measure_cols and numbers:
+            for i, measure in measure_cols.items():
+                vals = [n for n in map(_number, cells[i:i + 3]) if n is not None]
+                if vals:
+                    _add_outcome(summary, name, measure, vals)
+            measure_cols = {}
+
+    if summary.balance["unlabelled"].covariates > unlabelled_before:
+        summary.notes.append(
+            f"{name}: balance table is not labelled before/after matching; "
+            "it is not used for Gate B. Rename the file (e.g. *_after_psm.csv) or check the box by hand.")
+    return summary
+
+def _add_outcome(summary: ExportSummary, name: str, measure: str, values: List[float]) -> None:
+    out = {"file": name, "measure": measure, "value": values[0]}
+    if len(values) >= 3:
+        low, high = values[1], values[2]
+        # Not an estimate with its CI (e.g. counts from a cohort row); skip rather than guess
+        if not low <= values[0] <= high:
+            summary.notes.append(f"{name}: row {summary.rows}: {measure} {values[0]:g} is not within "
+                                 f"[{low:g}, {high:g}]; not read as an outcome.")
+            return
+        out["ci_low"], out["ci_high"] = low, high
+    summary.outcomes.append(out)
+
+def scan_exports(sources: Iterable[Union[Source, Tuple[BinaryIO, str]]]) -> ExportSummary:
+    """One summary over several exports; items are paths, binary streams, or (stream, name)."""
+    summary = ExportSummary()
+    for src in sources:
+        if isinstance(src, tuple):
+            scan_export(src[0], src[1], summary)
+        else:
+            scan_export(src, summary=summary)
+    return summary
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.exports", description="Summarise covariate balance and outcome measures in TriNetX CSV exports.")
+    parser.add_argument("files", nargs="+", help="TriNetX CSV exports (baseline characteristics, propensity matching, outcomes).")
+    args = parser.parse_args(argv)
+    print(json.dumps(scan_exports(args.files).to_dict(), ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
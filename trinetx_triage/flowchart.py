@@ -0,0 +1,157 @@
+# Per-project flow diagram
+# Idea → Gate A → Gate B (design) → rubric → decision, with the path a project
+# took highlighted and the stage where it stopped marked. A diagram depends only on
+# (design, stop stage, track), so there are a handful of distinct ones per process:
+# the DOT source is plain text built without graphviz, and the SVG is rendered
+# lazily (graphviz imported on first render) at most once per key and then served
+# from FlowchartCache. Renders run outside the cache lock, one at a time per key,
+# so a slow `dot` never blocks sessions asking for other diagrams. Failures are
+# reported, not swallowed, and kept for ERROR_TTL seconds before the next retry.
+# Without a `dot` binary on PATH graphviz is never imported at all.
+
+import shutil
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from .core import DEFAULT_THRESHOLDS, GATE_B_MIN, Thresholds, decision_gates_pass, strobe_score, triage_decision
+
+STOPS = ("gate_a", "gate_b", "decision")
+ERROR_TTL = 30.0   # seconds a failed render is served before it is retried
+
+_PASSED = 'style=filled fillcolor="#d9f0d3" color="#1b7837"'
+_STOPPED = 'style=filled fillcolor="#fddbc7" color="#b2182b" penwidth=2'
+_SKIPPED = 'style=dashed color="#9e9e9e" fontcolor="#9e9e9e"'
+_REACHED = 'style=filled fillcolor="#d1e5f0" color="#2166ac" penwidth=2'
+
+class FlowKey(NamedTuple):
+    design: str
+    stop: str   # one of STOPS
+    track: str
+
+def flow_key(state: Dict, thresholds: Thresholds = DEFAULT_THRESHOLDS) -> FlowKey:
+    design = state.get("design", "")
+    _, _, pct = strobe_score(state)
+    track, _ = triage_decision(state.get("rubric_total", 0), pct, decision_gates_pass(state), thresholds)
+    if not state.get("gates_pass"):
+        stop = "gate_a"
+    elif not decision_gates_pass(state):
+        stop = "gate_b"
+    else:
+        stop = "decision"
+    return FlowKey(design, stop, track)
+
+def _quote(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+@lru_cache(maxsize=None)
+def flow_dot(key: FlowKey) -> str:
+    """DOT source for one flow; pure string building, no graphviz needed."""
+    reached = STOPS.index(key.stop)
+    n_gate_b = len(GATE_B_MIN.get(key.design, []))
+    nodes = [
+        ("idea", "Idea + Clinical Question", _PASSED),
+        ("gate_a", "Gate A: Fatal Flaws", _STOPPED if reached == 0 else _PASSED),
+        ("gate_b", f"Gate B: Minimums ({key.design}, {n_gate_b} items)",
+         _SKIPPED if reached < 1 else _STOPPED if reached == 1 else _PASSED),
+        ("rubric", "Score 12-item Rubric", _SKIPPED if reached < 2 else _PASSED),
+        ("decision", f"Decision: {key.track}", _STOPPED if reached < 2 else _REACHED),
+    ]
+    lines = ["digraph flow {", "  rankdir=LR;", '  node [shape=box fontname="Helvetica" fontsize=11];']
+    lines += [f"  {name} [label={_quote(label)} {style}];" for name, label, style in nodes]
+    taken, not_taken = 'color="#1b7837" penwidth=2', 'color="#9e9e9e" style=dashed'
+    order = [name for name, _, _ in nodes]
+    # Edge i leaves node i; it was taken if the project got past that node
+    stopped_at = order.index(key.stop)
+    for i, (a, b) in enumerate(zip(order, order[1:])):
+        lines.append(f"  {a} -> {b} [{taken if i < stopped_at else not_taken}];")
+    if reached < 2:
+        # Stopped early: a failed gate routes straight to the decision
+        lines.append(f'  {key.stop} -> decision [color="#b2182b" penwidth=2 label="stop"];')
+    lines.append("}")
+    return "\n".join(lines)
+
+# ----------------------------
+# SVG cache
+# ----------------------------
+
+class Rendered(NamedTuple):
+    svg: Optional[str]
+    error: Optional[str]
+    render_ms: float
+
+class FlowchartCache:
+    """SVG per FlowKey, rendered at most once per process; counts hits/misses and render time."""
+
+    def __init__(self, error_ttl: float = ERROR_TTL):
+        self.error_ttl = error_ttl
+        self._items: Dict[FlowKey, Rendered] = {}
+        self._failed_at: Dict[FlowKey, float] = {}
+        self._key_locks: Dict[FlowKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.render_ms_total = 0.0
+
+    def _cached(self, key: FlowKey) -> Optional[Rendered]:
+        # Caller holds self._lock
+        item = self._items.get(key)
+        if item is not None and item.error and time.monotonic() - self._failed_at[key] >= self.error_ttl:
+            return None
+        return item
+
+    def get(self, key: FlowKey) -> Tuple[Rendered, bool]:
+        """(rendered, cache hit?)"""
+        with self._lock:
+            item = self._cached(key)
+            if item is not None:
+                self.hits += 1
+                return item, True
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Render outside the cache lock; the per-key lock makes concurrent
+        # requests for the same diagram wait for one render instead of repeating it
+        with key_lock:
+            with self._lock:
+                item = self._cached(key)
+                if item is not None:
+                    self.hits += 1
+                    return item, True
+            item = _render(flow_dot(key))
+            with self._lock:
+                self.misses += 1
+                self.render_ms_total += item.render_ms
+                self._items[key] = item
+                if item.error:
+                    self._failed_at[key] = time.monotonic()
+            return item, False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "render_ms_total": round(self.render_ms_total, 2),
+                "errors": sum(1 for r in self._items.values() if r.error),
+            }
+
+def _dot_missing() -> Optional[str]:
+    # Checked on every render attempt, so installing Graphviz is picked up after ERROR_TTL
+    return None if shutil.which("dot") else "ExecutableNotFound: Graphviz 'dot' is not on PATH"
+
+def _render(source: str) -> Rendered:
+    t0 = time.perf_counter()
+    missing = _dot_missing()
+    if missing:
+        return Rendered(None, missing, (time.perf_counter() - t0) * 1000)
+    try:
+        import graphviz  # only needed here; the rest of the app never loads it
+        svg = graphviz.Source(source).pipe(format="svg", encoding="utf-8")
+        return Rendered(svg, None, (time.perf_counter() - t0) * 1000)
+    except Exception as exc:  # missing package or dot binary, render failure
+        return Rendered(None, f"{type(exc).__name__}: {exc}", (time.perf_counter() - t0) * 1000)
+
+flowchart_cache = FlowchartCache()
@@ -0,0 +1,322 @@
+# Background jobs
+# Long-running work (re-scoring an archive, exporting a portfolio ZIP) runs on a
+# small shared thread pool instead of the caller's thread, so a Streamlit session
+# keeps serving reruns while it polls the job. A job function receives a JobContext
+# to report progress, check for cancellation between units of work and register
+# output files; its return value is kept on the Job until the job is evicted.
+#
+# Queueing is bounded twice: each owner (one browser session) may have at most
+# ``max_per_owner`` queued or running jobs, and the whole scheduler at most
+# ``max_pending``, so one reviewer cannot starve the others. CPU-heavy jobs fan
+# out further themselves: rescore_job drives batch.run_batch's process pool.
+#
+#   python -m trinetx_triage.jobs rescore states/ archive.jsonl.gz
+#   python -m trinetx_triage.jobs export --db triage_projects.db --format md html -o reports.zip
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .batch import count_tasks, run_batch
+from .reports import REPORT_FORMATS, write_zip
+from .store import DEFAULT_DB, get_store
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = frozenset((DONE, FAILED, CANCELLED))
+
+class JobCancelled(Exception):
+    """Raised inside a job function by JobContext.check() once cancel() was called."""
+
+class QueueFull(RuntimeError):
+    """The owner, or the scheduler as a whole, already has the maximum number of pending jobs."""
+
+class Job:
+    """One submitted unit of work; fields are written by the worker and read by pollers."""
+
+    def __init__(self, job_id: int, owner: str, label: str):
+        self.id = job_id
+        self.owner = owner
+        self.label = label
+        self.status = QUEUED
+        self.done = 0
+        self.total: Optional[int] = None
+        self.message = ""
+        self.result = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.files: List[str] = []
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """0..1 once the total is known; None while indeterminate."""
+        if self.status == DONE:
+            return 1.0
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+class JobContext:
+    """Handed to a job function: progress, cancellation and output files for its Job."""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        job = self.job
+        if total is not None:
+            job.total = total
+        job.done = done
+        if message is not None:
+            job.message = message
+
+    def check(self) -> None:
+        if self.job._cancel.is_set():
+            raise JobCancelled()
+
+    def track(self, items: Iterable, total: Optional[int] = None, every: int = 16) -> Iterator:
+        """Yield ``items``, counting progress and checking for cancellation every ``every`` items."""
+        if total is not None:
+            self.job.total = total
+        n = 0
+        for n, item in enumerate(items, start=1):
+            if n % every == 0:
+                self.job.done = n
+                self.check()
+            yield item
+        self.job.done = n
+
+    def output_path(self, suffix: str) -> str:
+        """A temporary file owned by the job; deleted when the job is evicted, fails or is cancelled."""
+        fd, path = tempfile.mkstemp(prefix=f"trinetx-job{self.job.id}-", suffix=suffix)
+        os.close(fd)
+        self.job.files.append(path)
+        return path
+
+# ----------------------------
+# Scheduler
+# ----------------------------
+
+class JobScheduler:
+    """Thread pool with per-owner limits and bounded retention of finished jobs.
+
+    Finished jobs (with their results and files) are kept for ``ttl`` seconds and at
+    most ``retain`` per owner, newest first; older ones are evicted on the next
+    submit() or jobs() call.
+    """
+
+    def __init__(self, max_workers: int = 2, max_per_owner: int = 2, max_pending: int = 16,
+                 retain: int = 10, ttl: float = 3600.0):
+        self.max_per_owner = max_per_owner
+        self.max_pending = max_pending
+        self.retain = retain
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trinetx-job")
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, owner: str, label: str, fn: Callable, *args, **kwargs) -> Job:
+        """Queue ``fn(ctx, *args, **kwargs)``; raises QueueFull when a limit is reached."""
+        with self._lock:
+            self._evict()
+            pending = [j for j in self._jobs.values() if j.status not in FINISHED]
+            if sum(1 for j in pending if j.owner == owner) >= self.max_per_owner:
+                raise QueueFull(f"at most {self.max_per_owner} background job(s) per session; wait for one to finish or cancel it")
+            if len(pending) >= self.max_pending:
+                raise QueueFull("the server's job queue is full; try again shortly")
+            job = Job(next(self._ids), owner, label)
+            self._jobs[job.id] = job
+            job._future = self._pool.submit(self._run, job, fn, args, kwargs)
+            return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner: Optional[str] = None) -> List[Job]:
+        """Newest first."""
+        with self._lock:
+            self._evict()
+            return sorted((j for j in self._jobs.values() if owner is None or j.owner == owner),
+                          key=lambda j: j.id, reverse=True)
+
+    def cancel(self, job_id: int, owner: Optional[str] = None) -> bool:
+        """Request cancellation; a queued job never starts, a running one stops at its next check()."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (owner is not None and job.owner != owner) or job.status in FINISHED:
+                return False
+            job._cancel.set()
+            if job._future is not None and job._future.cancel():
+                self._finish(job, CANCELLED)
+            return True
+
+    def discard(self, job_id: int, owner: Optional[str] = None) -> bool:
+        """Drop a finished job and its files now instead of waiting for eviction."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (owner is not None and job.owner != owner) or job.status not in FINISHED:
+                return False
+            self._drop(job)
+            return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                job._cancel.set()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable, args: tuple, kwargs: dict) -> None:
+        if job._cancel.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            job.result = fn(JobContext(job), *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as exc:  # reported on the job, never raised into the pool
+            job.error = f"{type(exc).__name__}: {exc}"
+            self._finish(job, FAILED)
+        else:
+            self._finish(job, DONE)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.finished = time.time()
+        if status != DONE:
+            job.result = None
+            _remove_files(job)
+        job.status = status
+
+    def _evict(self) -> None:
+        now = time.time()
+        kept: Counter = Counter()
+        for job in sorted(self._jobs.values(), key=lambda j: j.id, reverse=True):
+            if job.status not in FINISHED:
+                continue
+            kept[job.owner] += 1
+            if now - job.finished > self.ttl or kept[job.owner] > self.retain:
+                self._drop(job)
+
+    def _drop(self, job: Job) -> None:
+        self._jobs.pop(job.id, None)
+        _remove_files(job)
+
+def _remove_files(job: Job) -> None:
+    for path in job.files:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    job.files = []
+
+# ----------------------------
+# Jobs
+# ----------------------------
+
+def rescore_job(ctx: JobContext, sources: Sequence[str], processes: Optional[int] = None) -> Dict:
+    """Score saved states (folders / files / .jsonl(.gz) archives) into a JSONL results file."""
+    # Counted from directory listings only; archives and stdin leave progress
+    # indeterminate rather than being read twice (stdin cannot be)
+    total = count_tasks(sources)
+    ctx.progress(0, total, "Scoring")
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 2) // 2)
+    out = ctx.output_path(".jsonl")
+    tracks: Counter = Counter()
+    errors = 0
+    with open(out, "w", encoding="utf-8") as fh:
+        # Spawned workers: this runs on a scheduler thread, and forking a threaded
+        # process (the Streamlit server) is unsafe
+        for result in ctx.track(run_batch(sources, jobs=processes, start_method="spawn"), total):
+            fh.write(json.dumps(result, ensure_ascii=False) + "\n")
+            if "error" in result:
+                errors += 1
+            else:
+                tracks[result["decision"]] += 1
+    return {"projects": sum(tracks.values()), "errors": errors, "tracks": dict(tracks), "path": out}
+
+def export_job(ctx: JobContext, db_path: str, formats: Sequence[str], filters: Optional[Dict] = None) -> Dict:
+    """ZIP of reports for the matching stored projects, written to a job-owned file."""
+    filters = filters or {}
+    store = get_store(db_path)
+    total = store.count(**filters)
+    ctx.progress(0, total, "Rendering reports")
+    out = ctx.output_path(".zip")
+    with open(out, "wb") as fh:
+        n = write_zip(ctx.track(store.iter_states(**filters), total), fh, formats)
+    return {"projects": n, "path": out, "bytes": os.path.getsize(out)}
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.jobs", description="Run a background job in the foreground with a progress line (Ctrl-C cancels).")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rescore = sub.add_parser("rescore", help="Score saved states; results go to stdout as JSONL.")
+    rescore.add_argument("sources", nargs="+")
+    rescore.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes.")
+    export = sub.add_parser("export", help="ZIP of reports for stored projects.")
+    export.add_argument("--db", default=DEFAULT_DB)
+    export.add_argument("--format", nargs="+", choices=list(REPORT_FORMATS), default=["md"])
+    export.add_argument("--design")
+    export.add_argument("--track")
+    export.add_argument("-o", "--out", required=True)
+    args = parser.parse_args(argv)
+
+    scheduler = JobScheduler(max_workers=1)
+    if args.cmd == "rescore":
+        job = scheduler.submit("cli", "rescore", rescore_job, args.sources, args.jobs)
+    else:
+        filters = {k: getattr(args, k) for k in ("design", "track") if getattr(args, k) is not None}
+        job = scheduler.submit("cli", "export", export_job, args.db, args.format, filters)
+    try:
+        while job.status not in FINISHED:
+            fraction = job.fraction
+            pct = f"{fraction:6.1%}" if fraction is not None else "   ..."
+            print(f"\r{job.label}: {pct} {job.done}/{job.total or '?'} {job.message}", end="", file=sys.stderr)
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        scheduler.cancel(job.id)
+    scheduler.shutdown(wait=True)
+    print(f"\r{job.label}: {job.status} in {job.elapsed:.1f} s{' ' * 30}", file=sys.stderr)
+    if job.status != DONE:
+        if job.error:
+            print(job.error, file=sys.stderr)
+        return 1
+    result = job.result
+    if args.cmd == "rescore":
+        with open(result["path"], encoding="utf-8") as fh:
+            shutil.copyfileobj(fh, sys.stdout)
+    else:
+        shutil.copyfile(result["path"], args.out)
+    print(json.dumps({k: v for k, v in result.items() if k != "path"}), file=sys.stderr)
+    _remove_files(job)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
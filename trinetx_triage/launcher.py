@@ -0,0 +1,23 @@
+# Planner launcher
+# Starts the Streamlit server on the packaged page script (trinetx_triage/app.py),
+# so an installed copy runs without knowing where the package lives. Any extra
+# arguments are passed to ``streamlit run``.
+#
+#   trinetx-triage --server.port 8502 --server.headless true
+#   python -m trinetx_triage --server.port 8502
+
+import os
+import sys
+from typing import Optional
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+def main(argv: Optional[list] = None) -> int:
+    # Imported here so the launcher module itself stays free of Streamlit
+    from streamlit.web import cli as stcli
+
+    args = sys.argv[1:] if argv is None else list(argv)
+    return stcli.main(["run", APP_PATH, *args], prog_name="trinetx-triage")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+# Rerun and section timing
+# The app times every full script run, each numbered section (a fragment, so it
+# is also timed when it reruns on its own) and the scoring/report helpers it
+# calls, and samples session_state size and widget count at the end of each full
+# run. Observations go into one process-wide Metrics object shared by all
+# sessions: per (metric, label) a rolling window of the last ``window`` values for
+# percentiles, plus lifetime count and sum. The scoring service
+# (trinetx_triage.service) adds its request times and micro-batch sizes.
+#
+# The same numbers are written, at most every ``interval`` seconds, to a text file
+# in the Prometheus exposition format (each metric a summary with p50/p90/p99
+# quantiles over the window), e.g. for node_exporter's textfile collector:
+#   TRINETX_TRIAGE_METRICS_FILE=/var/lib/node_exporter/textfile/trinetx_triage.prom
+#
+#   python -m trinetx_triage.metrics /var/lib/node_exporter/textfile/trinetx_triage.prom
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+METRICS_FILE = os.environ.get("TRINETX_TRIAGE_METRICS_FILE", "")
+LOG = logging.getLogger(__name__)
+NAMESPACE = "trinetx_triage"
+QUANTILES = (0.5, 0.9, 0.99)
+
+# name -> (label name, help); a metric without a label has label name ""
+FAMILIES = {
+    "rerun_seconds": ("page", "Wall time of one full script run, by page."),
+    "section_seconds": ("section", "Wall time of one numbered planner section, including fragment-only reruns."),
+    "helper_seconds": ("helper", "Wall time of one call to a scoring or report helper."),
+    "session_state_bytes": ("", "Approximate size of one session's session_state at the end of a full run."),
+    "widgets": ("", "Widgets registered by one full script run."),
+    "request_seconds": ("endpoint", "Wall time of one scoring-service HTTP request, by endpoint."),
+    "batch_states": ("", "States scored together in one scoring-service micro-batch."),
+}
+
+class Window:
+    """Last ``size`` observations of one series, plus lifetime count and sum."""
+
+    __slots__ = ("values", "count", "sum")
+
+    def __init__(self, size: int):
+        self.values: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.values.append(value)
+        self.count += 1
+        self.sum += value
+
+    def quantiles(self, qs: Sequence[float] = QUANTILES) -> List[float]:
+        return quantiles(self.values, qs)
+
+def quantiles(values, qs: Sequence[float] = QUANTILES) -> List[float]:
+    """Nearest-rank quantiles; NaN for an empty series."""
+    ordered = sorted(values)
+    if not ordered:
+        return [float("nan")] * len(qs)
+    last = len(ordered) - 1
+    return [ordered[min(last, int(q * len(ordered)))] for q in qs]
+
+class Metrics:
+    """Thread-safe rolling summaries keyed by (metric, label value)."""
+
+    def __init__(self, window: int = 1024, quantiles: Sequence[float] = QUANTILES, namespace: str = NAMESPACE):
+        self.window = window
+        self.quantiles = tuple(quantiles)
+        self.namespace = namespace
+        self._series: Dict[Tuple[str, str], Window] = {}
+        self._lock = threading.Lock()
+        self._written = 0.0
+        self._writing = False
+        self._write_error: Optional[Tuple[str, Optional[int]]] = None
+
+    def observe(self, name: str, value: float, label: str = "") -> None:
+        if name not in FAMILIES:
+            raise KeyError(f"unknown metric {name!r}")
+        with self._lock:
+            series = self._series.get((name, label))
+            if series is None:
+                series = self._series[(name, label)] = Window(self.window)
+            series.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, label: str = "") -> Iterator[Dict[str, float]]:
+        """Time the block into ``name``; the yielded dict gets the elapsed "seconds"."""
+        out: Dict[str, float] = {}
+        t0 = time.perf_counter()
+        try:
+            yield out
+        finally:
+            out["seconds"] = time.perf_counter() - t0
+            self.observe(name, out["seconds"], label)
+
+    def timed(self, name: str, label: str) -> Callable[[Callable], Callable]:
+        """Decorator: every call of the wrapped function is observed as ``name{label}``."""
+        def wrap(fn: Callable) -> Callable:
+            @wraps(fn)
+            def run(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - t0, label)
+            return run
+        return wrap
+
+    def snapshot(self) -> List[Dict]:
+        """One row per series: metric, label, count, sum and the window's quantiles and max."""
+        with self._lock:
+            series = [(name, label, w.count, w.sum, list(w.values)) for (name, label), w in self._series.items()]
+        rows = []
+        for name, label, count, total, values in sorted(series):
+            row = {"metric": name, "label": label, "count": count, "sum": total}
+            row.update({f"p{round(q * 100)}": v for q, v in zip(self.quantiles, quantiles(values, self.quantiles))})
+            row["max"] = max(values) if values else float("nan")
+            rows.append(row)
+        return rows
+
+    def prometheus_text(self) -> str:
+        rows = self.snapshot()
+        lines = []
+        for name, (label_name, help_text) in FAMILIES.items():
+            family = [r for r in rows if r["metric"] == name]
+            if not family:
+                continue
+            full = f"{self.namespace}_{name}"
+            lines += [f"# HELP {full} {help_text}", f"# TYPE {full} summary"]
+            for r in family:
+                labels = f'{label_name}="{_escape(r["label"])}"' if label_name else ""
+                for q in self.quantiles:
+                    sep = "," if labels else ""
+                    lines.append(f'{full}{{{labels}{sep}quantile="{q:g}"}} {_number(r[f"p{round(q * 100)}"])}')
+                braces = f"{{{labels}}}" if labels else ""
+                lines.append(f"{full}_sum{braces} {_number(r['sum'])}")
+                lines.append(f"{full}_count{braces} {r['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically replace ``path`` so a scraper never reads a half-written file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(prefix=".trinetx-metrics-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(self.prometheus_text())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def maybe_write(self, path: str = METRICS_FILE, interval: float = 5.0) -> bool:
+        """write_textfile() unless ``path`` is empty, another thread is writing, or the last
+        successful write was under ``interval`` s ago. Never raises: this runs after every
+        page section, so a bad path is logged (once per distinct error) and retried later."""
+        if not path:
+            return False
+        with self._lock:
+            if self._writing or time.monotonic() - self._written < interval:
+                return False
+            self._writing = True
+        try:
+            self.write_textfile(path)
+        except OSError as exc:
+            # Keyed on the errno: the message names a random temporary file
+            error = (path, exc.errno)
+            if error != self._write_error:
+                LOG.warning("cannot write metrics file %s: %s", path, exc)
+            self._write_error = error
+            return False
+        else:
+            self._written = time.monotonic()
+            self._write_error = None
+            return True
+        finally:
+            self._writing = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._written = 0.0
+            self._write_error = None
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _number(value: float) -> str:
+    return "NaN" if value != value else repr(float(value))
+
+def deep_sizeof(obj, _seen: Optional[Set[int]] = None) -> int:
+    """sys.getsizeof over containers, counting each object once."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += deep_sizeof(k, seen) + deep_sizeof(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for v in obj:
+            size += deep_sizeof(v, seen)
+    return size
+
+METRICS = Metrics()
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    # Exposition of a synthetic load, to check a scraper or textfile collector setup
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.metrics", description="Write a sample metrics file from timed scoring calls.")
+    parser.add_argument("out", nargs="?", default=METRICS_FILE or "-")
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args(argv)
+    from .core import triage_decision
+    timed = METRICS.timed("helper_seconds", "triage_decision")(triage_decision)
+    for i in range(args.calls):
+        timed(i % 25, i % 101, i % 7 != 0)
+    if args.out == "-":
+        sys.stdout.write(METRICS.prometheus_text())
+    else:
+        METRICS.write_textfile(args.out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+# Incremental portfolio aggregates
+# Every saved project state (files in a folder, rows in the project store) adds its
+# counts to one running total: recommended track, rubric score per domain, STROBE
+# items left unaddressed, and Depth Upgrades selected.
+#
+# PortfolioIndex remembers a cheap version stamp and a content hash per entry:
+#   - files:       (mtime_ns, size)            -> sha1 of the bytes
+#   - store rows:  (updated_at, blob length)   -> sha1 of the blob
+# refresh() only re-reads entries whose stamp moved, only re-decodes those whose
+# hash changed, and subtracts the old contribution before adding the new one, so a
+# refresh over an unchanged archive costs one stat()/one SELECT and no JSON parsing.
+#
+#   python -m trinetx_triage.portfolio states/ --db triage_projects.db
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .core import DECISIONS, DEPTH_UPGRADES, DESIGNS, STROBE_ITEMS, TRIAGE_DOMAINS, score_state, strobe_design_mask
+from .statefile import StateFileError, load_state
+from .store import ProjectStore
+
+TRACKS = [track for track, _ in DECISIONS]
+_TRACK_CODE = {track: i for i, track in enumerate(TRACKS)}
+_DOMAINS = [dom for dom, _ in TRIAGE_DOMAINS]
+_UPGRADE_BIT = {u: 1 << i for i, u in enumerate(DEPTH_UPGRADES)}
+_DESIGN_MASK = {d: strobe_design_mask(d) for d in DESIGNS}
+
+# (track code, rubric scores, applicable STROBE mask, addressed STROBE mask, upgrades mask)
+Contribution = Tuple[int, Tuple[int, ...], int, int, int]
+
+def contribution(state: Dict) -> Contribution:
+    design_mask = _DESIGN_MASK.get(state.get("design", ""), 0)
+    upgrades = 0
+    for u in state.get("upgrades", []):
+        upgrades |= _UPGRADE_BIT.get(u, 0)
+    return (
+        _TRACK_CODE[score_state(state)["decision"]],
+        tuple(int(state["rubric"].get(dom, 0)) for dom in _DOMAINS),
+        design_mask,
+        state.get("strobe_mask", 0) & design_mask,
+        upgrades,
+    )
+
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+# ----------------------------
+# Running totals
+# ----------------------------
+
+class Aggregate:
+    """Sums that can be updated one project at a time, in both directions."""
+
+    def __init__(self):
+        self.projects = 0
+        self.tracks = [0] * len(TRACKS)
+        self.domain_sums = [0] * len(_DOMAINS)
+        self.strobe_applicable = [0] * len(STROBE_ITEMS)
+        self.strobe_missed = [0] * len(STROBE_ITEMS)
+        self.upgrades = [0] * len(DEPTH_UPGRADES)
+
+    def apply(self, c: Contribution, sign: int = 1) -> None:
+        track, rubric, design_mask, addressed, upgrades = c
+        self.projects += sign
+        self.tracks[track] += sign
+        for i, score in enumerate(rubric):
+            self.domain_sums[i] += sign * score
+        for i in _bits(design_mask):
+            self.strobe_applicable[i] += sign
+        for i in _bits(design_mask & ~addressed):
+            self.strobe_missed[i] += sign
+        for i in _bits(upgrades):
+            self.upgrades[i] += sign
+
+    def summary(self, top: int = 10) -> Dict:
+        """Plain-data view for the dashboard and the CLI."""
+        n = self.projects
+        missed = sorted(
+            ((self.strobe_missed[i] / self.strobe_applicable[i], self.strobe_missed[i], i)
+             for i in range(len(STROBE_ITEMS)) if self.strobe_applicable[i]),
+            key=lambda t: (-t[0], -t[1], t[2]),
+        )[:top]
+        upgrades = sorted(range(len(DEPTH_UPGRADES)), key=lambda i: (-self.upgrades[i], i))[:top]
+        return {
+            "projects": n,
+            "tracks": dict(zip(TRACKS, self.tracks)),
+            "domain_means": {dom: (s / n if n else 0.0) for dom, s in zip(_DOMAINS, self.domain_sums)},
+            "most_missed_strobe": [
+                {"item": STROBE_ITEMS[i][0], "section": STROBE_ITEMS[i][1], "prompt": STROBE_ITEMS[i][2],
+                 "missed": m, "applicable": self.strobe_applicable[i], "missed_pct": rate * 100.0}
+                for rate, m, i in missed if m
+            ],
+            "most_selected_upgrades": [
+                {"upgrade": DEPTH_UPGRADES[i], "selected": self.upgrades[i],
+                 "selected_pct": (self.upgrades[i] / n * 100.0 if n else 0.0)}
+                for i in upgrades if self.upgrades[i]
+            ],
+        }
+
+# ----------------------------
+# Incremental index
+# ----------------------------
+
+class PortfolioIndex:
+    """Aggregate over a folder of saved states and/or a project store, refreshed incrementally.
+
+    Safe to share between sessions: refresh() is serialised by a lock and throttled
+    to at most one rescan per ``min_interval`` seconds.
+    """
+
+    def __init__(self, states_dir: Optional[str] = None, store: Optional[ProjectStore] = None,
+                 min_interval: float = 2.0):
+        self.states_dir = Path(states_dir) if states_dir else None
+        self.store = store
+        self.min_interval = min_interval
+        self.aggregate = Aggregate()
+        # key -> (stamp, sha1 digest, contribution or None if the entry did not load)
+        self._entries: Dict[str, Tuple[Tuple, bytes, Optional[Contribution]]] = {}
+        self.errors: Dict[str, str] = {}
+        self.last_refresh = 0.0
+        self.last_stats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> Dict[str, float]:
+        with self._lock:
+            now = time.monotonic()
+            if not force and self.last_refresh and now - self.last_refresh < self.min_interval:
+                return self.last_stats
+            t0 = time.perf_counter()
+            stats = {"scanned": 0, "reread": 0, "decoded": 0, "removed": 0}
+            seen = set()
+            if self.states_dir is not None and self.states_dir.is_dir():
+                self._refresh_files(seen, stats)
+            if self.store is not None:
+                self._refresh_store(seen, stats)
+            for key in [k for k in self._entries if k not in seen]:
+                self._drop(key)
+                stats["removed"] += 1
+            stats["ms"] = (time.perf_counter() - t0) * 1000
+            self.last_refresh = now
+            self.last_stats = stats
+            return stats
+
+    def summary(self, top: int = 10) -> Dict:
+        with self._lock:
+            out = self.aggregate.summary(top)
+            out["unreadable"] = dict(self.errors)
+            return out
+
+    def _refresh_files(self, seen: set, stats: Dict) -> None:
+        for p in [*self.states_dir.rglob("*.json"), *self.states_dir.rglob("*.json.gz")]:
+            key = f"file:{p}"
+            seen.add(key)
+            stats["scanned"] += 1
+            try:
+                st = p.stat()
+            except OSError:
+                seen.discard(key)
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            old = self._entries.get(key)
+            if old is not None and old[0] == stamp:
+                continue
+            try:
+                data = p.read_bytes()
+            except OSError as exc:
+                self._record_error(key, stamp, b"", str(exc))
+                continue
+            stats["reread"] += 1
+            self._update(key, stamp, data, stats)
+
+    def _refresh_store(self, seen: set, stats: Dict) -> None:
+        changed = []
+        for project_id, stamp in self.store.versions().items():
+            key = f"store:{project_id}"
+            seen.add(key)
+            stats["scanned"] += 1
+            old = self._entries.get(key)
+            if old is None or old[0] != stamp:
+                changed.append((project_id, stamp))
+        stamps = dict(changed)
+        for project_id, blob in self.store.raw_states(stamps):
+            stats["reread"] += 1
+            self._update(f"store:{project_id}", stamps[project_id], blob, stats)
+
+    def _update(self, key: str, stamp: Tuple, data: bytes, stats: Dict) -> None:
+        digest = hashlib.sha1(data).digest()
+        old = self._entries.get(key)
+        if old is not None and old[1] == digest:
+            # Touched but identical content: keep the contribution, remember the new stamp
+            self._entries[key] = (stamp, digest, old[2])
+            return
+        try:
+            c = contribution(load_state(data))
+        except StateFileError as exc:
+            self._record_error(key, stamp, digest, str(exc))
+            return
+        stats["decoded"] += 1
+        self._drop(key)
+        self._entries[key] = (stamp, digest, c)
+        self.aggregate.apply(c)
+
+    def _record_error(self, key: str, stamp: Tuple, digest: bytes, message: str) -> None:
+        self._drop(key)
+        self._entries[key] = (stamp, digest, None)
+        self.errors[key] = message
+
+    def _drop(self, key: str) -> None:
+        old = self._entries.pop(key, None)
+        self.errors.pop(key, None)
+        if old is not None and old[2] is not None:
+            self.aggregate.apply(old[2], sign=-1)
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.portfolio", description="Aggregate saved triage states across a portfolio.")
+    parser.add_argument("states_dir", nargs="?", help="Folder of saved *.json / *.json.gz states.")
+    parser.add_argument("--db", default=None, help="Also include every project in this store.")
+    parser.add_argument("--top", type=int, default=10, help="Rows in the most-missed / most-selected lists.")
+    args = parser.parse_args(argv)
+    if not args.states_dir and not args.db:
+        parser.error("give a states folder, --db, or both")
+
+    index = PortfolioIndex(args.states_dir, ProjectStore(args.db) if args.db else None)
+    stats = index.refresh(force=True)
+    summary = index.summary(args.top)
+    summary["refresh"] = stats
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if summary["unreadable"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,598 @@
+# Report pipeline
+# One project state -> Markdown report, standalone HTML report, or the STROBE table
+# as CSV / XLSX. Extra guidelines selected for the project (RECORD-PE, TRIPOD, ...)
+# get their own section after STROBE and their rows appended to the table.
+# report_context() works out every number and row once per project; each format is
+# a handful of Templates parsed once at import (row templates are rewritten to
+# positional "{0} {1}" form for str.format), so rendering is format calls and
+# joins, and several formats of one project share the same context.
+#
+# Bulk mode writes a ZIP with one report per project and format, plus index.csv,
+# pulling states from the project store in batches and compressing each report as
+# soon as it is rendered. Memory stays flat in the number of projects; the archive
+# itself is spooled to a temporary file once it outgrows SPOOL_MAX_BYTES.
+#
+#   python -m trinetx_triage.reports render state.json --format html -o report.html
+#   python -m trinetx_triage.reports bulk --db triage_projects.db --design Cohort --format md xlsx -o reports.zip
+
+import argparse
+import csv
+import html
+import io
+import re
+import sys
+import tempfile
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+from typing import BinaryIO, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .checklists import REGISTRY
+from .core import (
+    CHECKLIST_BIT,
+    GATE_A_ITEMS,
+    GATE_B_MIN,
+    PROJECT_FIELDS,
+    TRIAGE_DOMAINS,
+    checklist_score,
+    decision_gates_pass,
+    strobe_items_for_design,
+    strobe_score,
+    triage_decision,
+)
+from .statefile import StateFileError, load_state
+from .store import DEFAULT_DB, ProjectStore
+
+STROBE_COLUMNS = ["Item", "Section", "Prompt", "Addressed", "Where/How"]
+INDEX_COLUMNS = ["file", "project_id", "title", "design", "track", "rubric_total", "strobe_pct"]
+SPOOL_MAX_BYTES = 8 << 20
+REPORT_TITLE = "TriNetX Triage + STROBE Report"
+
+# ----------------------------
+# Parsed templates
+# ----------------------------
+
+class Template:
+    """A str.format-style template parsed once at import.
+
+    ``fields`` fixes the positional order (for row templates called with tuples);
+    by default it is the order the fields first appear in. Unknown keyword
+    arguments are ignored, so a whole context dict can be passed with ``**``.
+    Only plain field names are allowed: no attribute or index lookups.
+    """
+
+    __slots__ = ("source", "fields", "_parts", "_positional")
+
+    def __init__(self, source: str, fields: Optional[Sequence[str]] = None):
+        parsed = list(Formatter().parse(source))
+        names = [name for _, name, _, _ in parsed if name is not None]
+        bad = [name for name in names if not name.isidentifier()]
+        if bad:
+            raise ValueError(f"template fields must be plain names, got {bad}")
+        if fields is None:
+            fields = list(dict.fromkeys(names))
+        missing = set(names) - set(fields)
+        if missing:
+            raise ValueError(f"template uses fields not in {tuple(fields)}: {sorted(missing)}")
+        self.source = source
+        self.fields = tuple(fields)
+        # (literal, field or None, format spec, conversion): keyword calls join these
+        # instead of re-parsing the text, which format_map would do on every call
+        self._parts = tuple((literal, name, spec or "", _CONVERSIONS[conversion]) for literal, name, spec, conversion in parsed)
+        # Positional form for row tuples, so no dict is built per row: a %-template
+        # when fields are plain and in order (the row templates; printf is the fastest
+        # formatting Python has), else the text with each name replaced by its position
+        position = {name: i for i, name in enumerate(self.fields)}
+        if names == list(self.fields) and not any(spec or conversion for _, _, spec, conversion in parsed):
+            self._positional = "".join(literal.replace("%", "%%") + ("%s" if name is not None else "")
+                                       for literal, name, _, _ in parsed).__mod__
+        else:
+            out = []
+            for literal, name, spec, conversion in parsed:
+                out.append(literal.replace("{", "{{").replace("}", "}}"))
+                if name is not None:
+                    out.append("{%d%s%s}" % (position[name], f"!{conversion}" if conversion else "", f":{spec}" if spec else ""))
+            fmt = "".join(out).format
+            self._positional = lambda values: fmt(*values)
+
+    def __call__(self, *args, **kwargs) -> str:
+        if not kwargs:
+            return self._positional(args)
+        if args:
+            kwargs.update(zip(self.fields, args))
+        out = []
+        for literal, name, spec, convert in self._parts:
+            out.append(literal)
+            if name is not None:
+                value = kwargs[name]
+                out.append(format(value if convert is None else convert(value), spec))
+        return "".join(out)
+
+    def rows(self, rows: Iterable[Sequence]) -> str:
+        return "\n".join(map(self._positional, map(tuple, rows)))
+
+_CONVERSIONS: Dict[Optional[str], Optional[Callable]] = {None: None, "s": str, "r": repr, "a": ascii}
+
+# ----------------------------
+# Shared context
+# ----------------------------
+
+def report_context(state: Dict, generated: Optional[str] = None) -> Dict:
+    """Everything any format shows, computed once per project."""
+    yes, total, pct = strobe_score(state)
+    decision, rationale = triage_decision(state["rubric_total"], pct, decision_gates_pass(state))
+    design = state.get("design", "")
+    gate_a = state["gate_a"]
+    gate_b_mask = state.get("gate_b_mask", 0)
+    strobe_mask = state.get("strobe_mask", 0)
+    strobe_where = state.get("strobe_where", {})
+    ctx = {f: state.get(f, "") for f in PROJECT_FIELDS}
+    ctx.update(
+        generated=generated or datetime.now().isoformat(timespec="seconds"),
+        gate_a=[(bool(gate_a[key]), label) for key, label in GATE_A_ITEMS],
+        gate_b=[(bool(gate_b_mask >> i & 1), item) for i, item in enumerate(GATE_B_MIN.get(design, []))],
+        # (item, section, prompt, addressed, where)
+        strobe=[(k, sec, prompt, bool(strobe_mask & CHECKLIST_BIT[k]), strobe_where.get(k, ""))
+                for k, sec, prompt in strobe_items_for_design(design)],
+        # (name, yes, total, pct, rows like strobe) per selected extra guideline
+        extra=[(REGISTRY[cid].name, *checklist_score(state, cid),
+                [(k, sec, prompt, bool(strobe_mask & CHECKLIST_BIT[k]), strobe_where.get(k, ""))
+                 for k, sec, prompt in REGISTRY.items_for_design(cid, design)])
+               for cid in state.get("checklists", ())],
+        rubric=[(dom, state["rubric"].get(dom, 0), desc) for dom, desc in TRIAGE_DOMAINS],
+        rubric_total=state["rubric_total"],
+        upgrades=list(state.get("upgrades", [])),
+        yes=yes, total=total, pct=pct,
+        decision=decision, rationale=rationale,
+    )
+    return ctx
+
+def _yes_no(flag: bool) -> str:
+    return "Yes" if flag else "No"
+
+# ----------------------------
+# Markdown
+# ----------------------------
+
+_MD_CHECK = Template("- [{mark}] {label}", ("mark", "label"))
+_MD_STROBE_ROW = Template("| {item} | {addressed} | {where} |", ("item", "addressed", "where"))
+_MD_RUBRIC_ROW = Template("| {dom} | {score} | {desc} |", ("dom", "score", "desc"))
+_MD_UPGRADE = Template("- {upgrade}", ("upgrade",))
+_MD_EXTRA = Template("""
+
+## {name} Checklist Completion
+- **Completed:** {yes}/{total} ({pct:.1f}%)
+
+| {name} Item | Addressed | Where/How |
+|---|---|---|
+{rows}""", ("name", "yes", "total", "pct", "rows"))
+_MD_PAGE = Template("""# TriNetX Triage + STROBE Report
+
+**Generated:** {generated}
+
+## Project Basics
+- **Title:** {title}
+- **Clinical Question (PECO/PECOS):** {question}
+- **Design:** {design}
+- **Index Date:** {index}
+- **Data Period:** {period}
+- **Sites:** {sites}
+- **IRB/Privacy:** {irb}
+
+---
+
+## Gate A — Fatal Flaws
+{gate_a_list}
+
+## Gate B — Minimum Standards ({design})
+{gate_b_list}
+
+---
+
+## STROBE Checklist Completion
+- **Completed:** {yes}/{total} ({pct:.1f}%)
+
+| STROBE Item | Addressed | Where/How |
+|---|---|---|
+{strobe_rows}{extra_checklists}
+
+---
+
+## Scored Triage Rubric (max 24)
+**Total:** {rubric_total}/24
+
+| Domain | Score | Notes |
+|---|---:|---|
+{rubric_rows}
+
+---
+
+## Depth Upgrade Selections
+{upgrades_list}
+
+---
+
+## Decision
+- **Recommended Track:** **{decision}**
+- **Rationale:** {rationale}
+
+---
+
+## Next Steps
+- Close any remaining Gate A/B gaps.
+- Improve STROBE items marked "No".
+- Implement selected depth upgrades.
+- Finalize figures: cohort flow, balance, KM/CIF, forest as applicable.
+""")
+
+def render_markdown(ctx: Dict) -> str:
+    upgrades = ctx["upgrades"]
+    return _MD_PAGE(
+        **ctx,
+        gate_a_list=_MD_CHECK.rows(("x" if v else " ", label) for v, label in ctx["gate_a"]),
+        gate_b_list=_MD_CHECK.rows(("x" if v else " ", item) for v, item in ctx["gate_b"]),
+        strobe_rows=_MD_STROBE_ROW.rows((k, _yes_no(a), where) for k, _, _, a, where in ctx["strobe"]),
+        extra_checklists="".join(
+            _MD_EXTRA(name, yes, total, pct, _MD_STROBE_ROW.rows((k, _yes_no(a), where) for k, _, _, a, where in rows))
+            for name, yes, total, pct, rows in ctx["extra"]),
+        rubric_rows=_MD_RUBRIC_ROW.rows(ctx["rubric"]),
+        upgrades_list=_MD_UPGRADE.rows((u,) for u in upgrades) if upgrades else "- (none selected)",
+    )
+
+# ----------------------------
+# Standalone HTML
+# ----------------------------
+
+_HTML_CHECK = Template('<li class="{cls}">{mark} {label}</li>', ("cls", "mark", "label"))
+_HTML_STROBE_ROW = Template(
+    '<tr class="{cls}"><td>{item}</td><td>{section}</td><td>{prompt}</td><td>{addressed}</td><td>{where}</td></tr>',
+    ("item", "section", "prompt", "addressed", "where", "cls"))
+_HTML_RUBRIC_ROW = Template('<tr><td>{dom}</td><td class="num">{score}</td><td>{desc}</td></tr>', ("dom", "score", "desc"))
+_HTML_UPGRADE = Template("<li>{upgrade}</li>", ("upgrade",))
+_HTML_EXTRA = Template("""
+<h2>{name} Checklist Completion</h2>
+<p><strong>Completed:</strong> {yes}/{total} ({pct:.1f}%)</p>
+<table>
+<thead><tr><th>Item</th><th>Section</th><th>Prompt</th><th>Addressed</th><th>Where/How</th></tr></thead>
+<tbody>
+{rows}
+</tbody>
+</table>
+""", ("name", "yes", "total", "pct", "rows"))
+_HTML_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{page_title}</title>
+<style>
+body {{font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; max-width: 60rem; margin: 2rem auto; padding: 0 1rem; color: #222; line-height: 1.45;}}
+h1 {{font-size: 1.6rem; margin-bottom: .2rem;}}
+h2 {{font-size: 1.2rem; border-bottom: 1px solid #ddd; padding-bottom: .2rem; margin-top: 2rem;}}
+table {{border-collapse: collapse; width: 100%; font-size: .9rem;}}
+th, td {{border: 1px solid #ddd; padding: .3rem .5rem; text-align: left; vertical-align: top;}}
+th {{background: #f4f4f4;}}
+td.num {{text-align: right;}}
+ul.checks {{list-style: none; padding-left: 0;}}
+.pass {{color: #1b7837;}} .fail {{color: #b2182b;}}
+tr.fail td:nth-child(4) {{color: #b2182b; font-weight: 600;}}
+.meta {{color: #666; font-size: .85rem;}}
+.decision {{background: #d1e5f0; border-left: 4px solid #2166ac; padding: .6rem 1rem;}}
+dl {{display: grid; grid-template-columns: max-content 1fr; gap: .2rem 1rem;}} dt {{font-weight: 600;}} dd {{margin: 0;}}
+@media print {{body {{margin: 0; max-width: none;}}}}
+</style>
+</head>
+<body>
+<h1>TriNetX Triage + STROBE Report</h1>
+<p class="meta">Generated {generated}</p>
+
+<h2>Project Basics</h2>
+<dl>
+<dt>Title</dt><dd>{title}</dd>
+<dt>Clinical Question (PECO/PECOS)</dt><dd>{question}</dd>
+<dt>Design</dt><dd>{design}</dd>
+<dt>Index Date</dt><dd>{index}</dd>
+<dt>Data Period</dt><dd>{period}</dd>
+<dt>Sites</dt><dd>{sites}</dd>
+<dt>IRB/Privacy</dt><dd>{irb}</dd>
+</dl>
+
+<h2>Gate A — Fatal Flaws</h2>
+<ul class="checks">
+{gate_a_list}
+</ul>
+
+<h2>Gate B — Minimum Standards ({design})</h2>
+<ul class="checks">
+{gate_b_list}
+</ul>
+
+<h2>STROBE Checklist Completion</h2>
+<p><strong>Completed:</strong> {yes}/{total} ({pct:.1f}%)</p>
+<table>
+<thead><tr><th>Item</th><th>Section</th><th>Prompt</th><th>Addressed</th><th>Where/How</th></tr></thead>
+<tbody>
+{strobe_rows}
+</tbody>
+</table>
+{extra_checklists}
+<h2>Scored Triage Rubric (max 24)</h2>
+<p><strong>Total:</strong> {rubric_total}/24</p>
+<table>
+<thead><tr><th>Domain</th><th>Score</th><th>Notes</th></tr></thead>
+<tbody>
+{rubric_rows}
+</tbody>
+</table>
+
+<h2>Depth Upgrade Selections</h2>
+<ul>
+{upgrades_list}
+</ul>
+
+<h2>Decision</h2>
+<div class="decision">
+<p><strong>Recommended Track:</strong> {decision}</p>
+<p><strong>Rationale:</strong> {rationale}</p>
+</div>
+
+<h2>Next Steps</h2>
+<ul>
+<li>Close any remaining Gate A/B gaps.</li>
+<li>Improve STROBE items marked "No".</li>
+<li>Implement selected depth upgrades.</li>
+<li>Finalize figures: cohort flow, balance, KM/CIF, forest as applicable.</li>
+</ul>
+</body>
+</html>
+""")
+
+def _checks_html(items: List[Tuple[bool, str]]) -> str:
+    return _HTML_CHECK.rows(("pass", "&#9745;", html.escape(label)) if v else ("fail", "&#9744;", html.escape(label))
+                            for v, label in items)
+
+def _strobe_rows_html(rows: List[Tuple]) -> str:
+    esc = html.escape
+    # Ids, sections and prompts come from guideline JSON files: escape every cell
+    return _HTML_STROBE_ROW.rows((esc(k), esc(sec), esc(prompt), _yes_no(a), esc(where), "pass" if a else "fail")
+                                 for k, sec, prompt, a, where in rows)
+
+def render_html(ctx: Dict) -> str:
+    esc = html.escape
+    text = {f: esc(str(ctx[f])) for f in PROJECT_FIELDS}
+    upgrades = ctx["upgrades"]
+    return _HTML_PAGE(**{
+        **ctx,
+        **text,
+        "page_title": esc(f"{REPORT_TITLE}: {ctx['title']}" if ctx["title"] else REPORT_TITLE),
+        "decision": esc(ctx["decision"]),
+        "rationale": esc(ctx["rationale"]),
+        "gate_a_list": _checks_html(ctx["gate_a"]),
+        "gate_b_list": _checks_html(ctx["gate_b"]),
+        "strobe_rows": _strobe_rows_html(ctx["strobe"]),
+        "extra_checklists": "".join(_HTML_EXTRA(esc(name), yes, total, pct, _strobe_rows_html(rows))
+                                    for name, yes, total, pct, rows in ctx["extra"]),
+        "rubric_rows": _HTML_RUBRIC_ROW.rows((esc(dom), score, esc(desc)) for dom, score, desc in ctx["rubric"]),
+        "upgrades_list": _HTML_UPGRADE.rows((esc(u),) for u in upgrades) if upgrades else "<li>(none selected)</li>",
+    })
+
+# ----------------------------
+# STROBE table: CSV / XLSX
+# ----------------------------
+
+def strobe_rows(ctx: Dict) -> List[Tuple[str, str, str, str, str]]:
+    # Extra guidelines follow STROBE, their sections prefixed with the guideline name
+    rows = [(k, sec, prompt, _yes_no(a), where) for k, sec, prompt, a, where in ctx["strobe"]]
+    for name, _, _, _, extra in ctx["extra"]:
+        rows += [(k, f"{name} · {sec}", prompt, _yes_no(a), where) for k, sec, prompt, a, where in extra]
+    return rows
+
+def render_csv(ctx: Dict) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(STROBE_COLUMNS)
+    writer.writerows(strobe_rows(ctx))
+    return buf.getvalue()
+
+# Minimal SpreadsheetML: one sheet of inline strings, no shared-strings or styles part
+_XML_BAD_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_XLSX_CELL = Template('<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>', ("ref", "text"))
+_XLSX_ROW = Template('<row r="{r}">{cells}</row>', ("r", "cells"))
+_XLSX_SHEET = Template(
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+    '<cols><col min="1" max="1" width="8" customWidth="1"/><col min="2" max="2" width="16" customWidth="1"/>'
+    '<col min="3" max="3" width="80" customWidth="1"/><col min="4" max="4" width="11" customWidth="1"/>'
+    '<col min="5" max="5" width="40" customWidth="1"/></cols>'
+    '<sheetData>{rows}</sheetData><autoFilter ref="A1:E{last}"/></worksheet>',
+    ("rows", "last"))
+_XLSX_STATIC = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="STROBE" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'),
+}
+
+def _xml_text(value: str) -> str:
+    return html.escape(_XML_BAD_CHARS.sub("", value), quote=False)
+
+@lru_cache(maxsize=4096)
+def _xlsx_cells(r: int, values: Tuple[str, ...]) -> str:
+    # Item / section / prompt / Yes-No repeat across projects; only Where/How is free text
+    return "".join(_XLSX_CELL(f"{col}{r}", _xml_text(v)) for col, v in zip("ABCDE", values))
+
+def render_xlsx(ctx: Dict) -> bytes:
+    rows = [_XLSX_ROW(1, _xlsx_cells(1, tuple(STROBE_COLUMNS)))]
+    for r, (k, sec, prompt, addressed, where) in enumerate(strobe_rows(ctx), start=2):
+        cells = _xlsx_cells(r, (k, sec, prompt, addressed))
+        if where:
+            cells += _XLSX_CELL(f"E{r}", _xml_text(where))
+        rows.append(_XLSX_ROW(r, cells))
+    sheet = _XLSX_SHEET("".join(rows), len(rows))
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        # The boilerplate parts are a few hundred bytes: not worth a deflate stream each
+        for name, part in _XLSX_STATIC.items():
+            zf.writestr(name, part)
+        zf.writestr("xl/worksheets/sheet1.xml", sheet, compress_type=zipfile.ZIP_DEFLATED)
+    return buf.getvalue()
+
+# ----------------------------
+# Formats
+# ----------------------------
+
+class ReportFormat(NamedTuple):
+    label: str
+    extension: str
+    mime: str
+    render: Callable[[Dict], Union[str, bytes]]
+    compressed: bool = False  # already a ZIP container: stored as-is in bulk archives
+
+REPORT_FORMATS: Dict[str, ReportFormat] = {
+    "md": ReportFormat("Markdown report", "md", "text/markdown", render_markdown),
+    "html": ReportFormat("HTML report", "html", "text/html", render_html),
+    "csv": ReportFormat("STROBE table (CSV)", "csv", "text/csv", render_csv),
+    "xlsx": ReportFormat("STROBE table (XLSX)", "xlsx",
+                         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", render_xlsx, True),
+}
+
+def render_report(state: Dict, fmt: str = "md", generated: Optional[str] = None) -> Union[str, bytes]:
+    return REPORT_FORMATS[fmt].render(report_context(state, generated))
+
+def render_reports(state: Dict, formats: Iterable[str], generated: Optional[str] = None) -> Dict[str, Union[str, bytes]]:
+    """Several formats of one project from a single context."""
+    ctx = report_context(state, generated)
+    return {fmt: REPORT_FORMATS[fmt].render(ctx) for fmt in formats}
+
+# ----------------------------
+# Bulk ZIP
+# ----------------------------
+
+def report_stem(project_id: Optional[int], title: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", title).strip("-")[:48] or "untitled"
+    return slug if project_id is None else f"{project_id:05d}-{slug}"
+
+def write_zip(items: Iterable[Tuple[Optional[int], Dict]], fileobj: BinaryIO,
+              formats: Sequence[str] = ("md",), generated: Optional[str] = None) -> int:
+    """Reports for (project id, state) pairs into a ZIP on ``fileobj``; returns projects written.
+
+    Each report is compressed into the archive as soon as it is rendered; only the
+    index.csv rows are kept, and those are spooled to disk past SPOOL_MAX_BYTES.
+    """
+    for fmt in formats:
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"unknown report format {fmt!r}")
+    generated = generated or datetime.now().isoformat(timespec="seconds")
+    n = 0
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+", encoding="utf-8", newline="") as index, \
+            zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zf:
+        index_writer = csv.writer(index, lineterminator="\n")
+        index_writer.writerow(INDEX_COLUMNS)
+        used = {"index"}   # index.csv is written last
+        for project_id, state in items:
+            ctx = report_context(state, generated)
+            stem = base = report_stem(project_id, ctx["title"])
+            # Repeated titles get -2, -3, ...; loop, since "x-2" may itself be a title
+            k = 2
+            while stem in used:
+                stem = f"{base}-{k}"
+                k += 1
+            used.add(stem)
+            for fmt in formats:
+                spec = REPORT_FORMATS[fmt]
+                zf.writestr(f"{stem}.{spec.extension}", spec.render(ctx),
+                            compress_type=zipfile.ZIP_STORED if spec.compressed else zipfile.ZIP_DEFLATED)
+            index_writer.writerow([stem, "" if project_id is None else project_id, ctx["title"], ctx["design"],
+                                   ctx["decision"], ctx["rubric_total"], f"{ctx['pct']:.1f}"])
+            n += 1
+        index.seek(0)
+        with zf.open("index.csv", "w") as out:
+            # Text mode spool -> UTF-8 bytes in the archive, copied in chunks
+            for chunk in iter(lambda: index.read(1 << 16), ""):
+                out.write(chunk.encode("utf-8"))
+    return n
+
+def portfolio_zip(store: ProjectStore, formats: Sequence[str] = ("md",),
+                  max_memory: int = SPOOL_MAX_BYTES, **filters) -> BinaryIO:
+    """ZIP of reports for every stored project matching ``filters`` (see ProjectStore.query).
+
+    Returned positioned at 0; it lives in memory up to ``max_memory`` bytes and in a
+    temporary file beyond that. Close it when done.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    write_zip(store.iter_states(**filters), out, formats)
+    out.seek(0)
+    return out
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.reports", description="Render triage reports for one saved state or a whole project store.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    one = sub.add_parser("render", help="Render one saved state.")
+    one.add_argument("state", help="Saved *.json / *.json.gz state.")
+    one.add_argument("--format", choices=list(REPORT_FORMATS), default="md")
+    one.add_argument("-o", "--out", help="Output file (default: stdout; required for xlsx).")
+
+    bulk = sub.add_parser("bulk", help="ZIP of reports for every matching project in the store.")
+    bulk.add_argument("--db", default=DEFAULT_DB, help=f"Project store (default: {DEFAULT_DB}).")
+    bulk.add_argument("--format", nargs="+", choices=list(REPORT_FORMATS), default=["md"])
+    bulk.add_argument("-o", "--out", required=True, help="ZIP file to write.")
+    bulk.add_argument("--design")
+    bulk.add_argument("--track")
+    bulk.add_argument("--min-rubric", type=int)
+    bulk.add_argument("--min-strobe", type=float)
+    bulk.add_argument("--title-like")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "render":
+        if args.format == "xlsx" and not args.out:
+            parser.error("--out is required for xlsx")
+        try:
+            state = load_state(Path(args.state).read_bytes())
+        except (OSError, StateFileError) as exc:
+            print(f"{args.state}: {exc}", file=sys.stderr)
+            return 1
+        report = render_report(state, args.format)
+        if isinstance(report, bytes):
+            Path(args.out).write_bytes(report)
+        elif args.out:
+            Path(args.out).write_text(report, encoding="utf-8")
+        else:
+            sys.stdout.write(report)
+        return 0
+
+    filters = {k: getattr(args, k) for k in ("design", "track", "min_rubric", "min_strobe", "title_like")
+               if getattr(args, k) is not None}
+    with open(args.out, "wb") as fh:
+        n = write_zip(ProjectStore(args.db).iter_states(**filters), fh, args.format)
+    print(f"{n} project(s) -> {args.out}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+# Scoring service
+# A small HTTP API over the headless core so other tools (the IRB intake form,
+# the project tracker) can score projects and fetch reports without the
+# Streamlit UI. Standard library only: a ThreadingHTTPServer with keep-alive.
+#
+#   POST /v1/score             one state, or {"states": [...]} / a JSON list of states
+#                              -> {"result": {...}} or {"results": [...]}, the numbers of core.score_state()
+#   POST /v1/report?format=md  one state -> the report itself (md, html, csv or xlsx),
+#                              with its content hash as ETag and X-Cache: hit|miss;
+#                              {"states": [...]} -> {"results": [{"hash": ..., "report": ...}]} (text formats)
+#   GET  /v1/stats             micro-batch and report-cache counters
+#   GET  /metrics              Prometheus text (trinetx_triage.metrics)
+#   GET  /healthz
+#
+# A state is anything load_state() accepts (schema-2 record, legacy sidebar dump or
+# compact state) and is validated per request; an invalid one fails the request
+# with 400. Scoring requests from all connections go through one MicroBatcher,
+# which scores whatever arrived within ``max_wait`` of the first request as a
+# single list (vectorized.score_states once it is big enough). Rendered reports
+# are kept in an LRU keyed by (content hash of the schema-2 record, format), so a
+# cached report keeps the "generated" time of its first render.
+#
+#   python -m trinetx_triage.service --host 127.0.0.1 --port 8765
+
+import argparse
+import hashlib
+import json
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from .core import score_state
+from .metrics import METRICS
+from .reports import REPORT_FORMATS, render_report
+from .statefile import StateFileError, dump_state, load_state
+from .vectorized import score_states
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 16 << 20
+MAX_STATES = 10_000
+# Below this many states a plain score_state() loop beats the NumPy call overhead
+VECTOR_MIN = 64
+
+# ----------------------------
+# Micro-batching
+# ----------------------------
+
+class MicroBatcher:
+    """Scores the states of concurrent callers together on one worker thread.
+
+    The worker takes the first queued request, then keeps collecting for at most
+    ``max_wait`` seconds or until ``max_batch`` states, scores them in one call
+    and hands each caller its own slice of the results.
+    """
+
+    def __init__(self, max_batch: int = 1024, max_wait: float = 0.0002):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.states = 0
+        self._queue: "queue.Queue[Optional[Tuple[List[Dict], Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="trinetx-batcher", daemon=True)
+        self._thread.start()
+
+    def score(self, states: List[Dict], timeout: Optional[float] = None) -> List[Dict]:
+        fut: Future = Future()
+        self._queue.put((states, fut))
+        return fut.result(timeout)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            pending = [first]
+            n = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+            while n < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # finish this batch, then stop
+                    break
+                pending.append(item)
+                n += len(item[0])
+            self._score(pending, n)
+
+    def _score(self, pending: List[Tuple[List[Dict], Future]], n: int) -> None:
+        try:
+            results = _score_list([s for batch, _ in pending for s in batch])
+        except Exception as exc:
+            if len(pending) == 1:
+                pending[0][1].set_exception(exc)
+                return
+            # One request's states broke the merged call: score each request on its
+            # own so only that caller gets the error, not everyone batched with it
+            for batch, fut in pending:
+                self._score([(batch, fut)], len(batch))
+            return
+        self.batches += 1
+        self.states += n
+        METRICS.observe("batch_states", n)
+        i = 0
+        for batch, fut in pending:
+            fut.set_result(results[i:i + len(batch)])
+            i += len(batch)
+
+    def stats(self) -> Dict:
+        return {"batches": self.batches, "states": self.states,
+                "mean_batch": round(self.states / self.batches, 2) if self.batches else 0.0,
+                "queued": self._queue.qsize()}
+
+def _score_list(states: List[Dict]) -> List[Dict]:
+    return score_states(states) if len(states) >= VECTOR_MIN else [score_state(s) for s in states]
+
+# ----------------------------
+# Report cache
+# ----------------------------
+
+def content_hash(state: Dict) -> str:
+    """SHA-1 of the state's schema-2 record: equal for any two states with the same answers."""
+    return hashlib.sha1(dump_state(state)).hexdigest()
+
+class ReportCache:
+    """LRU of rendered reports keyed by (content hash, format); counts hits and misses."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[Tuple[str, str], Union[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str], render: Callable[[], Union[str, bytes]]) -> Tuple[Union[str, bytes], bool]:
+        """(report, cache hit?); renders outside the lock, so concurrent misses do not queue."""
+        with self._lock:
+            report = self._items.get(key)
+            if report is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return report, True
+            self.misses += 1
+        report = render()
+        with self._lock:
+            self._items[key] = report
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return report, False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._items), "max_entries": self.max_entries, "hits": self.hits,
+                    "misses": self.misses, "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0}
+
+# ----------------------------
+# Requests
+# ----------------------------
+
+class RequestError(ValueError):
+    """A request the service rejects; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def parse_states(payload) -> Tuple[List[Dict], bool]:
+    """(validated states, batched?) from a request body; raises RequestError."""
+    batched = isinstance(payload, list) or (isinstance(payload, dict) and "states" in payload)
+    if isinstance(payload, dict) and "states" in payload:
+        payload = payload["states"]
+    elif isinstance(payload, dict) and "state" in payload:
+        payload = payload["state"]
+    raw = payload if batched else [payload]
+    if not isinstance(raw, list):
+        raise RequestError(400, "states must be a list")
+    if len(raw) > MAX_STATES:
+        raise RequestError(413, f"at most {MAX_STATES} states per request")
+    states = []
+    for i, item in enumerate(raw):
+        where = f"states[{i}]: " if batched else ""
+        if not isinstance(item, dict):
+            raise RequestError(400, f"{where}a state must be a JSON object")
+        try:
+            states.append(load_state(item))
+        except StateFileError as exc:
+            raise RequestError(400, f"{where}{exc}") from exc
+    return states, batched
+
+class ScoringService:
+    """The batcher and report cache one server shares between its request threads."""
+
+    def __init__(self, max_batch: int = 1024, max_wait: float = 0.0002, cache_entries: int = 1024):
+        self.batcher = MicroBatcher(max_batch, max_wait)
+        self.cache = ReportCache(cache_entries)
+
+    def score(self, payload) -> Dict:
+        states, batched = parse_states(payload)
+        results = self.batcher.score(states) if states else []
+        return {"results": results} if batched else {"result": results[0]}
+
+    def report(self, state: Dict, fmt: str) -> Tuple[Union[str, bytes], str, bool]:
+        """(report, content hash, cache hit?)"""
+        digest = content_hash(state)
+        report, hit = self.cache.get((digest, fmt), lambda: render_report(state, fmt))
+        return report, digest, hit
+
+    def stats(self) -> Dict:
+        return {"batcher": self.batcher.stats(), "report_cache": self.cache.stats()}
+
+    def close(self) -> None:
+        self.batcher.close()
+
+# ----------------------------
+# HTTP
+# ----------------------------
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive; every response carries Content-Length
+    # Headers and body go out in separate writes; with Nagle on, each keep-alive
+    # response would wait for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = "trinetx-triage"
+    quiet = True
+
+    @property
+    def service(self) -> ScoringService:
+        return self.server.service
+
+    def log_message(self, format, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/healthz":
+            self._json(200, {"status": "ok"})
+        elif path == "/v1/stats":
+            self._json(200, self.service.stats())
+        elif path == "/metrics":
+            self._send(200, METRICS.prometheus_text().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._json(404, {"error": f"no such endpoint {path}"})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        t0 = time.perf_counter()
+        try:
+            payload = self._read_json()
+            if url.path == "/v1/score":
+                self._json(200, self.service.score(payload))
+            elif url.path == "/v1/report":
+                self._report(payload, parse_qs(url.query))
+            else:
+                raise RequestError(404, f"no such endpoint {url.path}")
+        except RequestError as exc:
+            self._json(exc.status, {"error": str(exc)})
+        except Exception as exc:  # keep the connection usable; the client sees a 500
+            self._json(500, {"error": f"{type(exc).__name__}: {exc}"})
+        METRICS.observe("request_seconds", time.perf_counter() - t0, url.path)
+
+    def _report(self, payload, query: Dict[str, List[str]]) -> None:
+        fmt = query.get("format", [None])[0] or (payload.get("format") if isinstance(payload, dict) else None) or "md"
+        if fmt not in REPORT_FORMATS:
+            raise RequestError(400, f"unknown report format {fmt!r} (one of {', '.join(REPORT_FORMATS)})")
+        if isinstance(payload, dict):
+            payload = {k: v for k, v in payload.items() if k != "format"}
+        states, batched = parse_states(payload)
+        spec = REPORT_FORMATS[fmt]
+        if not batched:
+            report, digest, hit = self.service.report(states[0], fmt)
+            body = report if isinstance(report, bytes) else report.encode("utf-8")
+            mime = spec.mime if isinstance(report, bytes) else f"{spec.mime}; charset=utf-8"
+            self._send(200, body, mime, {"ETag": f'"{digest}"', "X-Cache": "hit" if hit else "miss"})
+            return
+        if spec.compressed:
+            raise RequestError(400, f"{fmt} is binary; request it one state at a time")
+        results = []
+        for state in states:
+            report, digest, _ = self.service.report(state, fmt)
+            results.append({"hash": digest, "report": report})
+        self._json(200, {"format": fmt, "results": results})
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_BYTES:
+            # The body is left unread, so the connection cannot carry another request
+            self.close_connection = True
+            if length < 0:
+                raise RequestError(411, "Content-Length required")
+            raise RequestError(413, f"request body over {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError as exc:
+            raise RequestError(400, f"not valid JSON: {exc}") from exc
+
+    def _json(self, status: int, obj) -> None:
+        self._send(status, json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), "application/json")
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+def make_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT, service: Optional[ScoringService] = None,
+                quiet: bool = True) -> ThreadingHTTPServer:
+    handler = type("ServiceHandler", (Handler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.service = service or ScoringService()
+    return server
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.service", description="HTTP scoring and report service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Default {DEFAULT_PORT}; 0 picks a free port.")
+    parser.add_argument("--max-batch", type=int, default=1024, help="States per micro-batch (1 turns batching off).")
+    parser.add_argument("--max-wait-ms", type=float, default=0.2, help="How long a micro-batch waits for more requests.")
+    parser.add_argument("--cache-entries", type=int, default=1024, help="Rendered reports kept in the LRU.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request to stderr.")
+    args = parser.parse_args(argv)
+
+    service = ScoringService(args.max_batch, args.max_wait_ms / 1000.0, args.cache_entries)
+    server = make_server(args.host, args.port, service, quiet=not args.verbose)
+    host, port = server.server_address[:2]
+    print(f"listening on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
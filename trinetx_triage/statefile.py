@@ -0,0 +1,227 @@
+# Versioned save/load format for project states
+#
+# Schema 2 stores only the reviewer's answers:
+#   {"schema": 2, "design": "Cohort", "title": "...", ...,     (empty text fields omitted)
+#    "gate_a": ["Q1", "Q3"],          checked Gate A ids
+#    "gate_b": [0, 2],                checked positions in GATE_B_MIN[design]
+#    "rubric": [2, 1, 0, ...],        one score per TRIAGE_DOMAINS entry
+#    "strobe": ["ST1", "STC2"],       addressed checklist item ids (STROBE and any extra guideline)
+#    "where": {"ST5": "Methods"},     non-empty Where/How notes
+#    "upgrades": [0, 6],              positions in DEPTH_UPGRADES
+#    "checklists": ["RECORD-PE"]}     extra guidelines shown with STROBE (omitted when none)
+#
+# Anything without a "schema" key is a schema-1 file: the old sidebar dump of every
+# session_state key. load_state() validates and migrates both in a single pass and
+# always returns the compact state used by core (see core.normalize_state).
+# dump_state(..., compress=True) gzips the same JSON; load_state() sniffs the magic bytes.
+# Archives (write_archive / iter_archive) hold one schema-2 record per line in a
+# single .jsonl.gz file, which is far cheaper to store and scan than thousands of files.
+
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from .core import (
+    CHECKLIST_BIT,
+    DEPTH_UPGRADES,
+    DESIGNS,
+    EXTRA_CHECKLISTS,
+    GATE_A_ITEMS,
+    GATE_B_MIN,
+    PROJECT_FIELDS,
+    TRIAGE_DOMAINS,
+    normalize_state,
+)
+
+SCHEMA_VERSION = 2
+GZIP_MAGIC = b"\x1f\x8b"
+
+_GATE_A_KEYS = [k for k, _ in GATE_A_ITEMS]
+_TEXT_FIELDS = [f for f in PROJECT_FIELDS if f != "design"]
+_DOMAINS = [dom for dom, _ in TRIAGE_DOMAINS]
+_NO_RUBRIC = [0] * len(TRIAGE_DOMAINS)
+
+_GATE_A_IDS = frozenset(_GATE_A_KEYS)
+_GATE_B_POSITIONS = {d: frozenset(range(len(GATE_B_MIN.get(d, [])))) for d in DESIGNS}
+_ITEM_IDS = frozenset(CHECKLIST_BIT)
+_EXTRA_IDS = frozenset(EXTRA_CHECKLISTS)
+_SCORES = frozenset((0, 1, 2))
+_UPGRADE_POSITIONS = frozenset(range(len(DEPTH_UPGRADES)))
+
+class StateFileError(ValueError):
+    """A saved state that cannot be read, or fails schema validation."""
+
+def _listed(value, kind: type, allowed: frozenset) -> bool:
+    # A JSON list of ``kind`` values drawn from ``allowed``. The type check comes
+    # first so nested lists/objects never reach the (hashing) set comparison, and
+    # uses type() so true/false do not pass as positions 1/0.
+    return type(value) is list and all(type(v) is kind for v in value) and allowed.issuperset(value)
+
+# ----------------------------
+# Writing
+# ----------------------------
+
+def to_record(state: Dict) -> Dict:
+    """Compact project state -> schema-2 record (plain JSON types only)."""
+    design = state.get("design", "Cohort")
+    record = {"schema": SCHEMA_VERSION, "design": design}
+    for f in _TEXT_FIELDS:
+        if state.get(f):
+            record[f] = state[f]
+    gate_a = state.get("gate_a", {})
+    gate_b_mask = state.get("gate_b_mask", 0)
+    strobe_mask = state.get("strobe_mask", 0)
+    rubric = state.get("rubric", {})
+    upgrades = set(state.get("upgrades", []))
+    record["gate_a"] = [k for k in _GATE_A_KEYS if gate_a.get(k)]
+    record["gate_b"] = [i for i in range(len(GATE_B_MIN.get(design, []))) if gate_b_mask >> i & 1]
+    record["rubric"] = [int(rubric.get(dom, 0)) for dom, _ in TRIAGE_DOMAINS]
+    record["strobe"] = [k for k, bit in CHECKLIST_BIT.items() if strobe_mask & bit]
+    where = {k: v for k, v in state.get("strobe_where", {}).items() if v}
+    if where:
+        record["where"] = where
+    record["upgrades"] = [i for i, u in enumerate(DEPTH_UPGRADES) if u in upgrades]
+    if state.get("checklists"):
+        record["checklists"] = list(state["checklists"])
+    return record
+
+def dump_state(state: Dict, compress: bool = False) -> bytes:
+    data = json.dumps(to_record(state), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # mtime=0 keeps identical states byte-identical on disk
+    return gzip.compress(data, mtime=0) if compress else data
+
+def write_archive(states: Iterable[Dict], path: Union[str, Path]) -> int:
+    n = 0
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        for state in states:
+            fh.write(json.dumps(to_record(state), ensure_ascii=False, separators=(",", ":")))
+            fh.write("\n")
+            n += 1
+    return n
+
+# ----------------------------
+# Reading
+# ----------------------------
+
+def load_state(data: Union[bytes, str, Dict]) -> Dict:
+    """Decode, validate and migrate one saved state; raises StateFileError."""
+    if isinstance(data, (bytes, bytearray)):
+        if data[:2] == GZIP_MAGIC:
+            try:
+                data = gzip.decompress(data)
+            except (OSError, EOFError) as exc:
+                raise StateFileError(f"corrupt gzip state: {exc}") from exc
+    if not isinstance(data, dict):
+        try:
+            data = json.loads(data)
+        except ValueError as exc:
+            raise StateFileError(f"not valid JSON: {exc}") from exc
+    if not isinstance(data, dict):
+        raise StateFileError("saved state must be a JSON object")
+
+    schema = data.get("schema", 1)
+    if schema == 1:
+        return _migrate_v1(data)
+    if schema == SCHEMA_VERSION:
+        return _from_record(data)
+    raise StateFileError(f"unsupported state schema {schema!r} (this version reads 1–{SCHEMA_VERSION})")
+
+def _migrate_v1(data: Dict) -> Dict:
+    problems = []
+    design = data.get("design", "Cohort")
+    if type(design) is not str or design not in DESIGNS:
+        problems.append(f"unknown design {design!r}")
+    for key in ("gate_a", "gate_b", "rubric", "strobe_checks", "strobe_where"):
+        if key in data and not isinstance(data[key], dict):
+            problems.append(f"{key} must be an object")
+    for key in ("upgrades", "checklists"):
+        if key in data and not isinstance(data[key], list):
+            problems.append(f"{key} must be a list")
+    for key in ("gate_b_mask", "strobe_mask"):
+        if key in data and type(data[key]) is not int:
+            problems.append(f"{key} must be an integer")
+    rubric = data.get("rubric")
+    if isinstance(rubric, dict) and any(type(v) is not int or v not in (0, 1, 2) for v in rubric.values()):
+        problems.append("rubric scores must be 0, 1 or 2")
+    checks = data.get("strobe_checks")
+    if isinstance(checks, dict) and not all(isinstance(v, dict) for v in checks.values()):
+        problems.append("strobe_checks values must be objects")
+    where = data.get("strobe_where")
+    if isinstance(where, dict) and not all(isinstance(v, str) for v in where.values()):
+        problems.append("strobe_where values must be text")
+    if problems:
+        raise StateFileError("invalid schema-1 state: " + "; ".join(problems))
+    try:
+        return normalize_state(data)
+    except (ValueError, TypeError, AttributeError) as exc:
+        # Anything the checks above missed still surfaces as a validation error
+        raise StateFileError(f"invalid schema-1 state: {exc}") from exc
+
+def _from_record(rec: Dict) -> Dict:
+    # Membership checks are set comparisons against precomputed frozensets so a
+    # valid record costs little more than json.loads itself.
+    problems: List[str] = []
+    design = rec.get("design")
+    if type(design) is not str or design not in _GATE_B_POSITIONS:
+        problems.append(f"unknown design {design!r}")
+        design = "Cohort"
+    for f in _TEXT_FIELDS:
+        if f in rec and type(rec[f]) is not str:
+            problems.append(f"{f} must be a string")
+
+    gate_a = rec.get("gate_a", [])
+    if not _listed(gate_a, str, _GATE_A_IDS):
+        problems.append("gate_a must list Gate A ids")
+        gate_a = ()
+    gate_b = rec.get("gate_b", [])
+    if not _listed(gate_b, int, _GATE_B_POSITIONS[design]):
+        problems.append(f"gate_b must list positions 0–{len(_GATE_B_POSITIONS[design]) - 1}")
+        gate_b = ()
+    rubric = rec.get("rubric", _NO_RUBRIC)
+    if not _listed(rubric, int, _SCORES) or len(rubric) != len(TRIAGE_DOMAINS):
+        problems.append(f"rubric must be {len(TRIAGE_DOMAINS)} scores of 0, 1 or 2")
+        rubric = _NO_RUBRIC
+    strobe = rec.get("strobe", [])
+    if not _listed(strobe, str, _ITEM_IDS):
+        problems.append("strobe must list checklist item ids")
+        strobe = ()
+    where = rec.get("where", {})
+    if type(where) is not dict or not _ITEM_IDS.issuperset(where) or not all(type(v) is str for v in where.values()):
+        problems.append("where must map checklist item ids to text")
+        where = {}
+    upgrades = rec.get("upgrades", [])
+    if not _listed(upgrades, int, _UPGRADE_POSITIONS):
+        problems.append(f"upgrades must list positions 0–{len(DEPTH_UPGRADES) - 1}")
+        upgrades = ()
+    checklists = rec.get("checklists", [])
+    if not _listed(checklists, str, _EXTRA_IDS):
+        problems.append(f"checklists must list ids from {', '.join(EXTRA_CHECKLISTS)}")
+        checklists = ()
+    if problems:
+        raise StateFileError("invalid schema-2 state: " + "; ".join(problems))
+
+    state = {f: rec.get(f, "") for f in PROJECT_FIELDS}
+    state["design"] = design
+    state["gate_a"] = {k: k in gate_a for k in _GATE_A_KEYS}
+    state["gates_pass"] = len(set(gate_a)) == len(_GATE_A_KEYS)
+    state["gate_b_mask"] = sum(1 << i for i in set(gate_b))
+    state["rubric"] = dict(zip(_DOMAINS, rubric))
+    state["rubric_total"] = sum(rubric)
+    state["strobe_mask"] = sum(CHECKLIST_BIT[k] for k in set(strobe))
+    state["strobe_where"] = {k: v for k, v in where.items() if v}
+    state["upgrades"] = [DEPTH_UPGRADES[i] for i in sorted(set(upgrades))]
+    state["checklists"] = [c for c in EXTRA_CHECKLISTS if c in checklists]
+    return state
+
+def iter_archive(path: Union[str, Path]) -> Iterator[Tuple[int, Dict]]:
+    """Stream (line number, state) from a .jsonl or .jsonl.gz archive of saved states."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            if line.strip():
+                try:
+                    yield lineno, load_state(line)
+                except StateFileError as exc:
+                    raise StateFileError(f"{path}:{lineno}: {exc}") from exc
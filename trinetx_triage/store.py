@@ -0,0 +1,308 @@
+# SQLite project store
+# One row per saved project state, with the headline numbers from score_state()
+# denormalised into indexed columns so portfolio queries never decode states.
+#
+#   python -m trinetx_triage.store --db triage_projects.db import states/ archive.jsonl.gz
+#   python -m trinetx_triage.store --db triage_projects.db query --design Cohort --min-rubric 16 --gate-a fail
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .core import score_state
+from .statefile import StateFileError, dump_state, iter_archive, load_state
+
+DEFAULT_DB = os.environ.get("TRINETX_TRIAGE_DB", "triage_projects.db")
+STORE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id           INTEGER PRIMARY KEY,
+    title        TEXT    NOT NULL DEFAULT '',
+    design       TEXT    NOT NULL,
+    track        TEXT    NOT NULL,
+    rubric_total INTEGER NOT NULL,
+    strobe_pct   REAL    NOT NULL,
+    gate_a_pass  INTEGER NOT NULL,
+    gates_pass   INTEGER NOT NULL,
+    source       TEXT    UNIQUE,
+    updated_at   TEXT    NOT NULL,
+    state        BLOB    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_projects_design       ON projects (design);
+CREATE INDEX IF NOT EXISTS ix_projects_track        ON projects (track);
+CREATE INDEX IF NOT EXISTS ix_projects_rubric_total ON projects (rubric_total);
+CREATE INDEX IF NOT EXISTS ix_projects_strobe_pct   ON projects (strobe_pct);
+CREATE INDEX IF NOT EXISTS ix_projects_design_gate_rubric ON projects (design, gate_a_pass, rubric_total);
+CREATE INDEX IF NOT EXISTS ix_projects_updated_at   ON projects (updated_at);
+"""
+
+_COLUMNS = "id, title, design, track, rubric_total, strobe_pct, gate_a_pass, gates_pass, source, updated_at"
+_ORDERABLE = {c.strip() for c in _COLUMNS.split(",")}
+
+_UPSERT = """
+INSERT INTO projects (title, design, track, rubric_total, strobe_pct, gate_a_pass, gates_pass, source, updated_at, state)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(source) DO UPDATE SET
+    title=excluded.title, design=excluded.design, track=excluded.track,
+    rubric_total=excluded.rubric_total, strobe_pct=excluded.strobe_pct,
+    gate_a_pass=excluded.gate_a_pass, gates_pass=excluded.gates_pass,
+    updated_at=excluded.updated_at, state=excluded.state
+"""
+
+def _row_values(state: Dict, source: Optional[str]) -> Tuple:
+    scored = score_state(state)
+    return (
+        scored["title"], scored["design"], scored["decision"], scored["rubric_total"], scored["strobe_pct"],
+        int(bool(state.get("gates_pass"))), int(scored["gates_pass"]), source,
+        datetime.now().isoformat(timespec="microseconds"), dump_state(state, compress=True),
+    )
+
+class ProjectStore:
+    """A single WAL-mode connection, serialised by a lock; use get_store() to share it per process."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = str(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={STORE_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ----------------------------
+    # Single projects
+    # ----------------------------
+
+    def save(self, state: Dict, project_id: Optional[int] = None, source: Optional[str] = None) -> int:
+        values = _row_values(state, source)
+        with self._lock:
+            if project_id is not None:
+                cur = self._conn.execute(
+                    "UPDATE projects SET title=?, design=?, track=?, rubric_total=?, strobe_pct=?, gate_a_pass=?, "
+                    "gates_pass=?, source=COALESCE(?, source), updated_at=?, state=? WHERE id=?", values + (project_id,))
+                if cur.rowcount:
+                    return project_id
+            if source is not None:
+                self._conn.execute(_UPSERT, values)
+                return self._conn.execute("SELECT id FROM projects WHERE source=?", (source,)).fetchone()[0]
+            return self._conn.execute(_UPSERT, values).lastrowid
+
+    def get(self, project_id: int) -> Dict:
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM projects WHERE id=?", (project_id,)).fetchone()
+        if row is None:
+            raise KeyError(project_id)
+        return load_state(row["state"])
+
+    def delete(self, project_id: int) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM projects WHERE id=?", (project_id,))
+
+    # ----------------------------
+    # Portfolio queries
+    # ----------------------------
+
+    @staticmethod
+    def _where(design: Optional[str] = None, track: Optional[str] = None, min_rubric: Optional[int] = None,
+               max_rubric: Optional[int] = None, min_strobe: Optional[float] = None, max_strobe: Optional[float] = None,
+               gate_a_pass: Optional[bool] = None, gates_pass: Optional[bool] = None,
+               title_like: Optional[str] = None) -> Tuple[str, List]:
+        clauses, params = [], []
+        for sql, value in (("design = ?", design), ("track = ?", track), ("rubric_total >= ?", min_rubric),
+                           ("rubric_total <= ?", max_rubric), ("strobe_pct >= ?", min_strobe),
+                           ("strobe_pct <= ?", max_strobe), ("title LIKE ?", title_like and f"%{title_like}%")):
+            if value is not None:
+                clauses.append(sql)
+                params.append(value)
+        for col, flag in (("gate_a_pass", gate_a_pass), ("gates_pass", gates_pass)):
+            if flag is not None:
+                clauses.append(f"{col} = ?")
+                params.append(int(flag))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, limit: Optional[int] = None, offset: int = 0, order_by: Optional[str] = None, **filters) -> List[Dict]:
+        """Index-backed filter over the headline columns; returns row dicts without the state blob."""
+        where, params = self._where(**filters)
+        sql = f"SELECT {_COLUMNS} FROM projects{where}"
+        if order_by is not None:
+            # Only order when asked: an ORDER BY can steer SQLite onto that column's index instead of the filter's
+            col, _, direction = order_by.partition(" ")
+            if col not in _ORDERABLE or direction.upper() not in ("", "ASC", "DESC"):
+                raise ValueError(f"cannot order by {order_by!r}")
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, params)]
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM projects{where}", params).fetchone()[0]
+
+    def revision(self) -> Tuple[int, Optional[str]]:
+        """(row count, newest updated_at): changes whenever a project is added, saved or deleted."""
+        with self._lock:
+            return tuple(self._conn.execute("SELECT COUNT(*), MAX(updated_at) FROM projects").fetchone())
+
+    def decision_inputs(self, **filters) -> List[Tuple[int, float, int]]:
+        """(rubric_total, strobe_pct, gates_pass) for every matching row, straight from the indexed columns."""
+        where, params = self._where(**filters)
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.row_factory = None  # plain tuples: this can be the whole table
+            return cur.execute(f"SELECT rubric_total, strobe_pct, gates_pass FROM projects{where}", params).fetchall()
+
+    def iter_states(self, batch_size: int = 500, **filters) -> Iterator[Tuple[int, Dict]]:
+        """Stream (id, state) for matching rows, a batch at a time."""
+        where, params = self._where(**filters)
+        last_id = 0
+        while True:
+            sql = f"SELECT id, state FROM projects{where}{' AND' if where else ' WHERE'} id > ? ORDER BY id LIMIT ?"
+            with self._lock:
+                rows = self._conn.execute(sql, params + [last_id, batch_size]).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["id"], load_state(row["state"])
+            last_id = rows[-1]["id"]
+
+    def versions(self) -> Dict[int, Tuple[str, int]]:
+        """id -> (updated_at, blob length) for every row: a change stamp that never reads the states."""
+        with self._lock:
+            return {r[0]: (r[1], r[2]) for r in self._conn.execute("SELECT id, updated_at, length(state) FROM projects")}
+
+    def raw_states(self, ids: Iterable[int], batch_size: int = 500) -> Iterator[Tuple[int, bytes]]:
+        """Stream (id, gzipped state) for the given ids without decoding them."""
+        ids = list(ids)
+        for i in range(0, len(ids), batch_size):
+            chunk = ids[i:i + batch_size]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, state FROM projects WHERE id IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+            for row in rows:
+                yield row["id"], row["state"]
+
+    # ----------------------------
+    # Bulk import
+    # ----------------------------
+
+    def import_states(self, items: Iterable[Tuple[str, Dict]], batch_size: int = 1000) -> int:
+        """Upsert (source, state) pairs, one transaction per batch."""
+        n = 0
+        batch = []
+        for source, state in items:
+            batch.append(_row_values(state, source))
+            if len(batch) >= batch_size:
+                n += self._write_batch(batch)
+                batch = []
+        if batch:
+            n += self._write_batch(batch)
+        with self._lock:
+            # Refresh planner statistics after a bulk load
+            self._conn.execute("PRAGMA optimize")
+        return n
+
+    def _write_batch(self, batch: List[Tuple]) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_UPSERT, batch)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(batch)
+
+    def import_files(self, sources: Iterable[str], errors: Optional[List[str]] = None) -> int:
+        """Bulk import saved triage_strobe_state.json files, directories of them, or .jsonl(.gz) archives."""
+        return self.import_states(_iter_saved(sources, errors if errors is not None else []))
+
+def _iter_saved(sources: Iterable[str], errors: List[str]) -> Iterator[Tuple[str, Dict]]:
+    for src in sources:
+        path = Path(src)
+        if path.name.endswith((".jsonl", ".jsonl.gz")):
+            try:
+                for lineno, state in iter_archive(path):
+                    yield f"{path.resolve()}:{lineno}", state
+            except StateFileError as exc:
+                errors.append(str(exc))
+            continue
+        files = sorted([*path.rglob("*.json"), *path.rglob("*.json.gz")]) if path.is_dir() else [path]
+        for p in files:
+            try:
+                yield str(p.resolve()), load_state(p.read_bytes())
+            except (OSError, StateFileError) as exc:
+                errors.append(f"{p}: {exc}")
+
+# ----------------------------
+# One connection per process
+# ----------------------------
+
+_stores: Dict[Tuple[int, str], ProjectStore] = {}
+_stores_lock = threading.Lock()
+
+def get_store(path: str = DEFAULT_DB) -> ProjectStore:
+    # Keyed by pid too, so a forked worker opens its own connection
+    key = (os.getpid(), os.path.abspath(path))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ProjectStore(path)
+        return store
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.store", description="Local SQLite store of triage projects.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"Database file (default: {DEFAULT_DB}; env TRINETX_TRIAGE_DB).")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="Bulk import saved state files, directories or .jsonl(.gz) archives.")
+    imp.add_argument("sources", nargs="+")
+    q = sub.add_parser("query", help="List matching projects as JSON lines.")
+    q.add_argument("--design")
+    q.add_argument("--track")
+    q.add_argument("--min-rubric", type=int)
+    q.add_argument("--max-rubric", type=int)
+    q.add_argument("--min-strobe", type=float)
+    q.add_argument("--gate-a", choices=["pass", "fail"])
+    q.add_argument("--limit", type=int)
+    q.add_argument("--count", action="store_true", help="Print only the number of matches.")
+    args = parser.parse_args(argv)
+
+    store = get_store(args.db)
+    if args.cmd == "import":
+        errors: List[str] = []
+        n = store.import_files(args.sources, errors)
+        for e in errors:
+            print(e, file=sys.stderr)
+        print(f"imported {n} project(s) into {args.db}")
+        return 1 if errors else 0
+
+    filters = dict(design=args.design, track=args.track, min_rubric=args.min_rubric, max_rubric=args.max_rubric,
+                   min_strobe=args.min_strobe, gate_a_pass=None if args.gate_a is None else args.gate_a == "pass")
+    if args.count:
+        print(store.count(**filters))
+        return 0
+    for row in store.query(limit=args.limit, **filters):
+        print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
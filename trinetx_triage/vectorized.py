@@ -0,0 +1,116 @@
+# Vectorized portfolio scoring
+# One row per project, one column per rubric domain / STROBE item / gate flag.
+# score_frame() reproduces triage_decision() for every row in a single NumPy pass.
+# score_states() is the same decision pass straight from normalized states, for
+# callers that hold states rather than frames (the scoring service's micro-batches).
+#
+# Column layout (see portfolio_columns()):
+#   - rubric:  the TRIAGE_DOMAINS labels, integer 0–2
+#   - STROBE:  item ids ("ST1", "STC2", ...); NaN = item not part of that project's design
+#   - Gate A:  "Q1".."Q6"
+#   - Gate B:  "GB1".."GBn", positional over GATE_B_MIN[design]; NaN = not applicable
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .core import (
+    DECISIONS,
+    DEFAULT_THRESHOLDS,
+    GATE_A_ITEMS,
+    GATE_B_MIN,
+    STROBE_BIT,
+    STROBE_ITEMS,
+    TRIAGE_DOMAINS,
+    Thresholds,
+    decision_gates_pass,
+    strobe_design_mask,
+    strobe_score,
+)
+
+RUBRIC_COLUMNS = [dom for dom, _ in TRIAGE_DOMAINS]
+STROBE_COLUMNS = [k for k, _, _ in STROBE_ITEMS]
+GATE_A_COLUMNS = [k for k, _ in GATE_A_ITEMS]
+GATE_B_COLUMNS = [f"GB{i + 1}" for i in range(max(len(items) for items in GATE_B_MIN.values()))]
+
+TRACKS = [track for track, _ in DECISIONS]
+RATIONALES = [why for _, why in DECISIONS]
+
+def portfolio_columns() -> List[str]:
+    return RUBRIC_COLUMNS + STROBE_COLUMNS + GATE_A_COLUMNS + GATE_B_COLUMNS
+
+def frame_from_states(states: Iterable[Dict]) -> pd.DataFrame:
+    """Flatten normalized states (core.normalize_state) into the portfolio layout."""
+    records = []
+    for state in states:
+        row = {"title": state.get("title", ""), "design": state.get("design", "")}
+        row.update(state["rubric"])
+        design_mask = strobe_design_mask(row["design"])
+        row.update({k: bool(state["strobe_mask"] & bit) for k, bit in STROBE_BIT.items() if design_mask & bit})
+        row.update(state["gate_a"])
+        for i in range(len(GATE_B_MIN.get(row["design"], []))):
+            row[GATE_B_COLUMNS[i]] = bool(state["gate_b_mask"] >> i & 1)
+        records.append(row)
+    return pd.DataFrame.from_records(records, columns=["title", "design"] + portfolio_columns())
+
+def decision_codes(rubric_total: np.ndarray, strobe_pct: np.ndarray, gates_pass: np.ndarray,
+                   thresholds: Thresholds = DEFAULT_THRESHOLDS) -> np.ndarray:
+    """Index into DECISIONS per row; same branch order as triage_decision."""
+    t = thresholds
+    return np.select(
+        [~gates_pass,
+         (rubric_total >= t.manuscript_rubric) & (strobe_pct >= t.manuscript_strobe),
+         (rubric_total >= t.brief_rubric) & (strobe_pct >= t.brief_strobe),
+         rubric_total >= t.abstract_rubric],
+        [0, 1, 2, 3],
+        default=4,
+    ).astype(np.int8)
+
+def score_frame(df: pd.DataFrame, thresholds: Thresholds = DEFAULT_THRESHOLDS) -> pd.DataFrame:
+    """Rubric total, STROBE %, gate pass and recommended track for every row."""
+    rubric = df.reindex(columns=RUBRIC_COLUMNS).to_numpy(dtype=np.float64)
+    rubric_total = np.nan_to_num(rubric, nan=0.0).sum(axis=1).astype(np.int64)
+
+    strobe = df.reindex(columns=STROBE_COLUMNS).to_numpy(dtype=np.float64)
+    answered = ~np.isnan(strobe)
+    strobe_total = answered.sum(axis=1)
+    strobe_yes = np.where(answered, strobe, 0.0).sum(axis=1).astype(np.int64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        strobe_pct = np.where(strobe_total > 0, strobe_yes / strobe_total * 100.0, 0.0)
+
+    gate_a = df.reindex(columns=GATE_A_COLUMNS).to_numpy(dtype=np.float64)
+    gate_b = df.reindex(columns=GATE_B_COLUMNS).to_numpy(dtype=np.float64)
+    gates_pass = (np.nan_to_num(gate_a, nan=0.0) != 0).all(axis=1) & (np.nan_to_num(gate_b, nan=1.0) != 0).all(axis=1)
+
+    codes = decision_codes(rubric_total, strobe_pct, gates_pass, thresholds)
+    return pd.DataFrame(
+        {
+            "rubric_total": rubric_total,
+            "strobe_yes": strobe_yes,
+            "strobe_total": strobe_total,
+            "strobe_pct": strobe_pct,
+            "gates_pass": gates_pass,
+            "decision": pd.Categorical.from_codes(codes, categories=TRACKS),
+            "rationale": pd.Categorical.from_codes(codes, categories=RATIONALES),
+        },
+        index=df.index,
+    )
+
+def score_states(states: List[Dict], thresholds: Thresholds = DEFAULT_THRESHOLDS) -> List[Dict]:
+    """core.score_state() for every state, with one decision_codes() call for the whole list.
+
+    STROBE counts are bitset popcounts per state, so building a portfolio frame
+    would only add cost here; the NumPy pass replaces the per-state decision branches.
+    """
+    scores = [strobe_score(s) for s in states]
+    gates = [decision_gates_pass(s) for s in states]
+    rubric = [s["rubric_total"] for s in states]
+    codes = decision_codes(np.array(rubric, dtype=np.int64), np.array([pct for _, _, pct in scores], dtype=np.float64),
+                           np.array(gates, dtype=bool), thresholds).tolist()
+    return [
+        {"title": s.get("title", ""), "design": s.get("design", ""), "rubric_total": r,
+         "strobe_yes": yes, "strobe_total": total, "strobe_pct": pct, "gates_pass": g,
+         "decision": TRACKS[c], "rationale": RATIONALES[c]}
+        for s, r, (yes, total, pct), g, c in zip(states, rubric, scores, gates, codes)
+    ]
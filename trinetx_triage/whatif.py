@@ -0,0 +1,115 @@
+# Threshold what-if
+# triage_decision() is piecewise constant: for one set of Thresholds it depends only on
+# gates_pass, the integer rubric total (0–24) and which STROBE band the percentage
+# falls in, the bands being cut at the distinct STROBE thresholds. decision_table()
+# evaluates that small 2 × 25 × bands space once per threshold set; a region map
+# over the whole rubric × STROBE grid or a 100k-project portfolio is then a single
+# NumPy gather instead of one triage_decision() call per cell or per project.
+#
+#   python -m trinetx_triage.whatif --db triage_projects.db --manuscript-rubric 18 --brief-strobe 60
+
+import argparse
+import json
+import sys
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .core import DEFAULT_THRESHOLDS, TRIAGE_DOMAINS, Thresholds
+from .store import DEFAULT_DB, ProjectStore
+from .vectorized import TRACKS, decision_codes
+
+RUBRIC_MAX = 2 * len(TRIAGE_DOMAINS)
+
+class DecisionTable(NamedTuple):
+    thresholds: Thresholds
+    cuts: np.ndarray   # sorted distinct STROBE thresholds; band b is [cuts[b-1], cuts[b])
+    codes: np.ndarray  # int8 DECISIONS index, shape (gates_pass, rubric_total, band)
+
+@lru_cache(maxsize=128)
+def decision_table(thresholds: Thresholds = DEFAULT_THRESHOLDS) -> DecisionTable:
+    cuts = np.unique(np.array([thresholds.manuscript_strobe, thresholds.brief_strobe], dtype=np.float64))
+    # Any percentage in a band decides like the band's lower edge
+    edges = np.concatenate(([-np.inf], cuts))
+    gates, rubric, pct = np.meshgrid([False, True], np.arange(RUBRIC_MAX + 1), edges, indexing="ij")
+    codes = decision_codes(rubric, pct, gates, thresholds)
+    cuts.setflags(write=False)
+    codes.setflags(write=False)
+    return DecisionTable(thresholds, cuts, codes)
+
+def lookup(table: DecisionTable, rubric_total, strobe_pct, gates_pass) -> np.ndarray:
+    """Vectorized triage_decision() as DECISIONS indices, via the precomputed table."""
+    rubric = np.clip(np.asarray(rubric_total, dtype=np.intp), 0, RUBRIC_MAX)
+    band = np.searchsorted(table.cuts, np.asarray(strobe_pct, dtype=np.float64), side="right")
+    return table.codes[np.asarray(gates_pass, dtype=np.intp), rubric, band]
+
+@lru_cache(maxsize=64)
+def region_map(thresholds: Thresholds = DEFAULT_THRESHOLDS, step: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """(STROBE % grid, codes) where codes[r, j] is the track for rubric total r at grid[j], gates passed."""
+    grid = np.linspace(0.0, 100.0, int(round(100.0 / step)) + 1)
+    table = decision_table(thresholds)
+    codes = table.codes[1][:, np.searchsorted(table.cuts, grid, side="right")]
+    grid.setflags(write=False)
+    codes.setflags(write=False)
+    return grid, codes
+
+# ----------------------------
+# Portfolio
+# ----------------------------
+
+class PortfolioWhatIf:
+    """Decision inputs of a whole portfolio, re-evaluated per threshold set (results cached)."""
+
+    def __init__(self, rubric_total: np.ndarray, strobe_pct: np.ndarray, gates_pass: np.ndarray,
+                 baseline: Thresholds = DEFAULT_THRESHOLDS):
+        self.rubric_total = np.asarray(rubric_total, dtype=np.intp)
+        self.strobe_pct = np.asarray(strobe_pct, dtype=np.float64)
+        self.gates_pass = np.asarray(gates_pass, dtype=bool)
+        self.baseline = baseline
+        self.baseline_codes = self.codes(baseline)
+        self.shift = lru_cache(maxsize=64)(self._shift)
+
+    @classmethod
+    def from_store(cls, store: ProjectStore, baseline: Thresholds = DEFAULT_THRESHOLDS, **filters) -> "PortfolioWhatIf":
+        rows = np.array(store.decision_inputs(**filters), dtype=np.float64).reshape(-1, 3)
+        return cls(rows[:, 0], rows[:, 1], rows[:, 2] != 0, baseline)
+
+    def __len__(self) -> int:
+        return len(self.rubric_total)
+
+    def codes(self, thresholds: Thresholds) -> np.ndarray:
+        return lookup(decision_table(thresholds), self.rubric_total, self.strobe_pct, self.gates_pass)
+
+    def _shift(self, thresholds: Thresholds) -> Dict:
+        new = self.codes(thresholds)
+        k = len(TRACKS)
+        transitions = np.bincount(self.baseline_codes.astype(np.intp) * k + new, minlength=k * k).reshape(k, k)
+        return {
+            "projects": len(self),
+            "changed": int(len(self) - np.trace(transitions)),
+            "baseline_tracks": dict(zip(TRACKS, transitions.sum(axis=1).tolist())),
+            "tracks": dict(zip(TRACKS, transitions.sum(axis=0).tolist())),
+            # transitions[i][j]: projects moving from TRACKS[i] (baseline) to TRACKS[j]
+            "transitions": transitions.tolist(),
+        }
+
+# ----------------------------
+# CLI
+# ----------------------------
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m trinetx_triage.whatif", description="Re-evaluate stored projects under alternative decision thresholds.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"Project store (default: {DEFAULT_DB}).")
+    for field, default in DEFAULT_THRESHOLDS._asdict().items():
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field, type=type(default), default=default)
+    args = parser.parse_args(argv)
+
+    thresholds = Thresholds(**{f: getattr(args, f) for f in Thresholds._fields})
+    result = dict(PortfolioWhatIf.from_store(ProjectStore(args.db)).shift(thresholds))
+    result["thresholds"] = thresholds._asdict()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())